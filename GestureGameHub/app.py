@@ -1,9 +1,26 @@
 # app.py
-from flask import Flask, render_template, Response, request, jsonify
+from flask import Flask, render_template, Response, request, jsonify, session
 import cv2
 import importlib
+import os
+import sys
+import uuid
+from engine import camera_service, FramePipeline, metrics, SessionManager, SocketSession, decode_frame, GamePreloader
+from engine.remote import blank_frame, parse_packet, use_remote_detection, restore_local_detection
+from engine.remote import parse_json as parse_landmarks_json
+from games.detector_pool import detector_pool
+
+try:
+    from flask_sock import Sock
+except ImportError:  # 可选依赖：没有 flask-sock 时只提供 MJPEG 视频流
+    Sock = None
 
 app = Flask(__name__)
+# 会话 cookie 需要签名密钥；多进程部署时请通过环境变量设置同一个值
+app.secret_key = os.environ.get('GESTURE_SECRET_KEY') or os.urandom(16)
+sock = Sock(app) if Sock is not None else None
+
+GAME_NAMES = ('maze', 'parkour', 'pacman', 'fruit', 'street_fighter', 'draw_guess', 'gesture_draw', 'fingertip_catch')
 
 # 动态加载游戏模块，方便后续扩展
 def get_game_instance(game_name):
@@ -33,8 +50,32 @@ def get_game_instance(game_name):
         return FingertipCatchAdapter()
     return None
 
-# 当前运行的游戏实例
-current_game = None
+# 后台预加载：启动时预加载 GESTURE_PRELOAD 列出的游戏（逗号分隔），大厅里鼠标悬停时预加载对应游戏
+preloader = GamePreloader(
+    get_game_instance,
+    max_ready=int(os.environ.get('GESTURE_PRELOAD_MAX', 4)),
+    memory_limit_mb=float(os.environ.get('GESTURE_PRELOAD_MEMORY_MB', 2048)),
+)
+for _name in filter(None, os.environ.get('GESTURE_PRELOAD', '').split(',')):
+    preloader.preload(_name.strip())
+
+def create_game(game_name):
+    """优先使用预加载好的实例"""
+    return preloader.take(game_name) or get_game_instance(game_name)
+
+# 每个浏览器会话一份游戏实例：超过上限淘汰最久未用的会话，空闲太久自动回收
+sessions = SessionManager(
+    create_game,
+    max_sessions=int(os.environ.get('GESTURE_MAX_SESSIONS', 8)),
+    idle_timeout=float(os.environ.get('GESTURE_SESSION_IDLE', 300)),
+)
+
+def current_session():
+    """当前请求所属的游戏会话（会话 id 存在 Flask 的签名 cookie 里）"""
+    sid = session.get('sid')
+    if sid is None:
+        sid = session['sid'] = uuid.uuid4().hex
+    return sessions.get(sid)
 
 @app.route('/')
 def index():
@@ -43,17 +84,13 @@ def index():
 
 @app.route('/draw_guess')
 def draw_guess_page():
-    global current_game
     # 动态加载并初始化
-    from games.draw_guess_adapter import DrawGuessAdapter
-    current_game = DrawGuessAdapter()
+    sessions.start_game(current_session().id, 'draw_guess')
     return render_template('draw_guess.html')
 
 @app.route('/gesture_draw')
 def gesture_draw_page():
-    global current_game
-    from games.gesture_draw_adapter import GestureDrawAdapter
-    current_game = GestureDrawAdapter()
+    sessions.start_game(current_session().id, 'gesture_draw')
     return render_template('gesture_draw.html')
 
 # 你画我猜专属视频流 (为了匹配 draw_guess.html 的 img src)
@@ -63,18 +100,12 @@ def video_feed_draw():
 # 接收前端“开始游戏”指令的接口
 @app.route('/api/start_game', methods=['POST'])
 def start_game_api():
-    global current_game
     data = request.get_json(silent=True) or {}
-    game_name = data.get('game_name')
-    # if no current_game, try to create one from provided game_name
-    if current_game is None and game_name:
-        inst = get_game_instance(game_name)
-        if inst:
-            # set as current game
-            globals()['current_game'] = inst
-    if current_game and hasattr(current_game, 'start_game'):
+    # if no game in this session, try to create one from provided game_name
+    game = sessions.ensure_game(current_session().id, data.get('game_name')).game
+    if game and hasattr(game, 'start_game'):
         try:
-            current_game.start_game()
+            game.start_game()
             return jsonify({"status": "started"})
         except Exception as e:
             return jsonify({"status": "error", "message": str(e)}), 500
@@ -82,24 +113,19 @@ def start_game_api():
 
 @app.route('/api/clear_canvas', methods=['POST'])
 def clear_canvas_api():
-    global current_game
     data = request.get_json(silent=True) or {}
-    game_name = data.get('game_name')
-    if current_game is None and game_name:
-        inst = get_game_instance(game_name)
-        if inst:
-            globals()['current_game'] = inst
-    if current_game:
-        if hasattr(current_game, 'canvas'):
+    game = sessions.ensure_game(current_session().id, data.get('game_name')).game
+    if game:
+        if hasattr(game, 'canvas'):
             try:
-                current_game.canvas[:] = 255
-                if hasattr(current_game, 'strokes'):
-                    current_game.strokes = []
-                if hasattr(current_game, 'current_stroke'):
-                    current_game.current_stroke = []
+                game.canvas[:] = 255
+                if hasattr(game, 'strokes'):
+                    game.strokes = []
+                if hasattr(game, 'current_stroke'):
+                    game.current_stroke = []
                 # reset guide flags if any
-                if hasattr(current_game, 'guide_hit_flags'):
-                    current_game.guide_hit_flags = [False] * len(getattr(current_game, 'target', {}).get('guide_points', []))
+                if hasattr(game, 'guide_hit_flags'):
+                    game.guide_hit_flags = [False] * len(getattr(game, 'target', {}).get('guide_points', []))
                 return jsonify({"status": "ok"})
             except Exception as e:
                 return jsonify({"status": "error", "message": str(e)}), 500
@@ -108,11 +134,11 @@ def clear_canvas_api():
 @app.route('/play/<game_name>')
 def play(game_name):
     """游戏页面：根据游戏名加载不同的模板"""
-    global current_game
-    current_game = get_game_instance(game_name)
-    
-    if not current_game:
+    sess = sessions.start_game(current_session().id, game_name)
+    if not sess:
         return "游戏未找到 / Game Not Found", 404
+    if request.args.get('players') and hasattr(sess.game, 'set_players'):
+        sess.game.set_players(request.args.get('players'))
     
     # 针对 maze 游戏，渲染专属的 maze.html
     if game_name == 'maze':
@@ -134,47 +160,121 @@ def play(game_name):
     # 默认回退到通用模板
     return render_template('game.html', game_name=game_name)
 
-def gen_frames():
-    """视频流生成器"""
-    global current_game
-    # If the incoming video feed request specifies a game_name, ensure the generator
-    # creates/attaches the correct game instance in this request context. This
-    # avoids cases where the front-end img src triggers the video feed in a
-    # different worker/process without a current_game set.
+@app.route('/api/upload_frame', methods=['POST'])
+def upload_frame_api():
+    """客户端上传画面（JPEG/PNG，请求体或表单字段 frame），配合 /video_feed?source=upload 使用"""
+    file = request.files.get('frame')
+    frame = decode_frame(file.read() if file is not None else request.get_data())
+    if frame is None:
+        return jsonify({"status": "error", "message": "invalid image"}), 400
+    sess = current_session()
+    restore_local_detection(sess.game)
+    sess.upload.push(frame)
+    return jsonify({"status": "ok"})
+
+@app.route('/api/upload_landmarks', methods=['POST'])
+def upload_landmarks_api():
+    """只传关键点：请求体为二进制关键点包（b'LMK1'...）或 JSON {"hands": [...], "face": [...]}"""
     try:
-        from flask import request as _req
-        game_name_q = _req.args.get('game_name')
-        if current_game is None and game_name_q:
-            inst = get_game_instance(game_name_q)
-            if inst:
-                globals()['current_game'] = inst
-    except Exception:
-        pass
-    # 打开摄像头
-    cap = cv2.VideoCapture(0)
-    
-    while True:
-        success, frame = cap.read()
-        if not success:
-            break
-        
-        # 翻转摄像头，像照镜子一样
-        frame = cv2.flip(frame, 1)
-
-        # 如果有游戏实例，将这一帧画面交给游戏逻辑处理
-        if current_game:
-            # process方法返回处理后的游戏画面（包含了游戏UI和摄像头小窗口）
-            final_frame = current_game.process(frame)
+        if request.is_json:
+            results = parse_landmarks_json(request.get_json())
         else:
-            final_frame = frame
+            results = parse_packet(request.get_data())
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    sess = current_session()
+    use_remote_detection(sess.game)
+    sess.upload.push(blank_frame(), results)
+    return jsonify({"status": "ok"})
+
+def gen_frames():
+    """视频流生成器：处理当前会话的游戏；?source=upload 时用客户端上传的画面"""
+    # If the incoming video feed request specifies a game_name, ensure this
+    # session has that game attached (the img src may be requested before the
+    # page route ran, e.g. after the session was evicted).
+    sess = sessions.ensure_game(current_session().id, request.args.get('game_name'))
+    use_upload = request.args.get('source') == 'upload'
+
+    def stream():
+        # 订阅全局摄像头服务：设备只打开一次，多个页面/标签页共享同一路画面
+        source = sess.upload if use_upload else camera_service.subscribe()
+        # 识别、游戏逻辑/渲染、jpg 编码分别在独立线程里流水线执行；CPU 时间记到本会话
+        pipeline = FramePipeline(source, lambda: sess.game, cpu_meter=sess, game_owner=sess).start()
+        try:
+            while not sess.closed:
+                chunk = pipeline.get(timeout=2.0)
+                if chunk is None:
+                    if pipeline.ended:
+                        break
+                    continue
+                yield chunk
+        finally:
+            # 前端断开时生成器被关闭，最后一个订阅者离开后摄像头才会被释放
+            pipeline.stop()
+            if not use_upload:
+                source.close()
+    return stream()
 
-        # 将图片编码为jpg格式流传输
-        ret, buffer = cv2.imencode('.jpg', final_frame)
-        frame = buffer.tobytes()
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
+def socket_control(sess, msg):
+    """WebSocket 文本指令：切换游戏 / 开始游戏"""
+    kind = msg.get('type')
+    if kind == 'game':
+        ok = sessions.start_game(sess.id, msg.get('game_name')) is not None
+        return {'type': 'game', 'ok': ok, 'game': sess.game_name}
+    if kind == 'start':
+        game = sess.game
+        if game and hasattr(game, 'start_game'):
+            game.start_game()
+            return {'type': 'start', 'ok': True}
+        return {'type': 'start', 'ok': False}
+    return None
 
-    cap.release()
+if sock is not None:
+    @sock.route('/ws/play')
+    def play_socket(ws):
+        """浏览器上传摄像头画面，服务器处理后从同一连接发回渲染结果"""
+        sess = sessions.ensure_game(current_session().id, request.args.get('game_name'))
+        SocketSession(ws, sess, on_control=socket_control).serve()
+
+@app.route('/api/preload', methods=['POST'])
+def preload_api():
+    """大厅里鼠标悬停在游戏卡片上时调用，提前在后台创建游戏"""
+    data = request.get_json(silent=True) or {}
+    game_name = data.get('game_name')
+    if game_name not in GAME_NAMES:
+        return jsonify({"status": "error", "message": "unknown game"}), 400
+    return jsonify({"status": "ok", "scheduled": preloader.preload(game_name)})
+
+@app.route('/api/preload')
+def preload_status_api():
+    return jsonify(preloader.stats())
+
+@app.route('/api/sessions')
+def sessions_api():
+    """各会话的游戏、空闲时间和 CPU 消耗，以及检测器池的复用情况"""
+    return jsonify({**sessions.stats(), 'detectors': detector_pool.stats()})
+
+@app.route('/api/camera')
+def camera_status_api():
+    """摄像头服务状态：订阅者数量、是否打开设备等"""
+    return jsonify(camera_service.stats())
+
+@app.route('/metrics')
+def metrics_api():
+    """各阶段耗时统计：默认 JSON，?format=prometheus 输出 Prometheus 文本格式"""
+    if request.args.get('format') == 'prometheus':
+        return Response(metrics.to_prometheus(), mimetype='text/plain; version=0.0.4')
+    return jsonify({
+        'overlay': metrics.overlay_enabled,
+        'games': metrics.snapshot(request.args.get('game')),
+    })
+
+@app.route('/api/metrics/overlay', methods=['POST'])
+def metrics_overlay_api():
+    """开关画面右下角的耗时叠加层；不传 enabled 时切换当前状态"""
+    data = request.get_json(silent=True) or {}
+    metrics.overlay_enabled = bool(data.get('enabled', not metrics.overlay_enabled))
+    return jsonify({"status": "ok", "overlay": metrics.overlay_enabled})
 
 @app.route('/video_feed')
 def video_feed():
@@ -203,6 +303,7 @@ def cleanup_all_resources(current_game=None):
         # 释放模型
         if hasattr(current_game, 'model'):
             del current_game.model
-            import torch
-            if torch.cuda.is_available():
+            # 你画我猜默认用 NumPy 推理，没加载过 torch 就不用为了清缓存去 import 它
+            torch = sys.modules.get('torch')
+            if torch is not None and torch.cuda.is_available():
                 torch.cuda.empty_cache()
\ No newline at end of file
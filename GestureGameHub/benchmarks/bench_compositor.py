@@ -0,0 +1,108 @@
+# benchmarks/bench_compositor.py
+"""侧边栏合成基准：每帧新建画布重画所有文字 vs games/compositor.py
+
+用水果忍者的布局（游戏画面缩放居中 + 摄像头预览 + 标题 / 状态 / 分数 / 说明文字），
+分数每 10 帧变一次，其余文字不变。
+
+用法: python benchmarks/bench_compositor.py [--frames 300]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+from games.compositor import CanvasCompositor
+
+CANVAS_W, CANVAS_H, SIDEBAR_W = 1280, 720, 380
+SIDEBAR_X = CANVAS_W - SIDEBAR_W
+GAME_RECT = (20, 73, 860, 573)
+CAM_W, CAM_H = SIDEBAR_W - 20, 200
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+INSTRUCTIONS = ['CONTROLS:', '- Use index finger', '- Slice fruits', '- Avoid bombs', '',
+                'RULES:', '- Cut bombs = -1 life', '- Missing fruits is OK']
+
+
+def draw_static(canvas):
+    canvas[:] = (20, 20, 20)
+    x, y, w, h = GAME_RECT
+    cv2.rectangle(canvas, (x - 2, y - 2), (x + w + 2, y + h + 2), (255, 200, 0), 2)
+    cv2.rectangle(canvas, (SIDEBAR_X, 0), (CANVAS_W, CANVAS_H), (40, 40, 40), -1)
+    cv2.line(canvas, (SIDEBAR_X, 0), (SIDEBAR_X, CANVAS_H), (100, 100, 100), 2)
+    cv2.putText(canvas, 'FRUIT NINJA', (SIDEBAR_X + 40, CAM_H + 50), cv2.FONT_HERSHEY_DUPLEX, 1.0, (255, 215, 0), 2)
+    for i, line in enumerate(INSTRUCTIONS):
+        if line:
+            cv2.putText(canvas, line, (SIDEBAR_X + 20, 480 + i * 30), FONT, 0.5, (200, 200, 200), 1)
+
+
+def draw_dynamic(put_text, score):
+    put_text('state', 'State: PLAYING', (SIDEBAR_X + 20, 300), FONT, 0.7, (0, 255, 0), 2)
+    put_text('score', f'Score: {score}', (SIDEBAR_X + 20, 360), FONT, 0.8, (255, 255, 255), 2)
+    put_text('lives', 'Lives: 3', (SIDEBAR_X + 20, 410), FONT, 0.8, (255, 255, 255), 2)
+
+
+def naive_frame(game, cam, score):
+    """原来的写法：新画布 + 全部重画"""
+    canvas = np.zeros((CANVAS_H, CANVAS_W, 3), dtype=np.uint8)
+    draw_static(canvas)
+    x, y, w, h = GAME_RECT
+    canvas[y:y + h, x:x + w] = cv2.resize(game, (w, h))
+    canvas[10:10 + CAM_H, SIDEBAR_X + 10:SIDEBAR_X + 10 + CAM_W] = cv2.resize(cam, (CAM_W, CAM_H))
+    draw_dynamic(lambda name, *args: cv2.putText(canvas, *args), score)
+    return canvas
+
+
+def make_compositor():
+    comp = CanvasCompositor(CANVAS_W, CANVAS_H)
+    comp.add_slot('game', *GAME_RECT)
+    comp.add_slot('camera', SIDEBAR_X + 10, 10, CAM_W, CAM_H)
+    for name, baseline in (('state', 300), ('score', 360), ('lives', 410)):
+        comp.add_slot(name, SIDEBAR_X, baseline - 25, SIDEBAR_W, 32)
+    return comp
+
+
+def compositor_frame(comp, game, cam, score):
+    canvas = comp.begin('fruit', draw_static)
+    comp.paste('game', game)
+    comp.paste('camera', cam)
+    draw_dynamic(lambda name, *args: comp.text(name, *args), score)
+    return canvas
+
+
+def run(name, render, frames, hold):
+    held = []
+    start = time.perf_counter()
+    for i in range(frames):
+        # 模拟编码线程还拿着最近几帧
+        held.append(render(i // 10))
+        if len(held) > hold:
+            held.pop(0)
+    elapsed = (time.perf_counter() - start) / frames * 1000
+    print(f"  {name:<28} {elapsed:7.3f} ms/frame")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--hold', type=int, default=2, help='同时在编码 / 排队的帧数')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    game = rng.integers(0, 255, (400, 600, 3), dtype=np.uint8)
+    cam = rng.integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    comp = make_compositor()
+    assert np.array_equal(naive_frame(game, cam, 5), compositor_frame(comp, game, cam, 5)), '合成结果和原始写法不一致'
+
+    print(f"{CANVAS_W}x{CANVAS_H} sidebar layout, {args.frames} frames")
+    base = run('new canvas + full redraw', lambda s: naive_frame(game, cam, s), args.frames, args.hold)
+    fast = run('CanvasCompositor', lambda s: compositor_frame(comp, game, cam, s), args.frames, args.hold)
+    print(f"  speedup x{base / fast:.1f}, buffers in ring: {len(comp._buffers)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# benchmarks/bench_dataset.py
+"""街霸动作数据集：CSV vs 二进制列式格式（games/street_fighter/dataset.py）
+
+- 采集：每行 open(..., 'a') + csv.writer vs DatasetWriter 整个会话打开一次、攒批写入
+- 训练前准备：pandas.read_csv + 逐行循环拼窗口 vs 内存映射 + strided 窗口
+- 只比拼窗口（数据已在内存里）：逐行循环 vs 滑动窗口视图，多个窗口长度 / 按块产出
+
+用法: python benchmarks/bench_dataset.py [--rows 100000]
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from games.street_fighter.dataset import DatasetWriter, iter_windows, load_dataset, window_datasets
+from games.street_fighter.train_model import create_window_dataset
+
+WINDOW = 5
+
+
+def old_windows(X, y, window=WINDOW):
+    Xs, ys = [], []
+    for i in range(window, len(X)):
+        if y[i] != y[i - window]:
+            continue
+        Xs.append(X[i - window:i].flatten())
+        ys.append(y[i])
+    return np.array(Xs), np.array(ys)
+
+
+def timed(name, fn):
+    start = time.perf_counter()
+    out = fn()
+    print(f"  {name:<44} {(time.perf_counter() - start) * 1e3:9.1f} ms")
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--collect-rows', type=int, default=3000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(0, 0.1, (args.rows, 63))
+    y = np.repeat(rng.integers(0, 8, args.rows // 20 + 1), 20)[:args.rows]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path, data_path = os.path.join(tmp, 'data.csv'), os.path.join(tmp, 'data')
+        n = args.collect_rows
+        print(f"Collection ({n} rows)")
+
+        def collect_csv():
+            with open(csv_path, 'w', newline='') as f:
+                csv.writer(f).writerow([f'v{i}' for i in range(63)] + ['label'])
+            for row, label in zip(X[:n], y[:n]):
+                with open(csv_path, 'a', newline='') as f:
+                    csv.writer(f).writerow(list(row) + [label])
+
+        def collect_binary():
+            with DatasetWriter(data_path) as writer:
+                for row, label in zip(X[:n], y[:n]):
+                    writer.append(row, label)
+
+        timed('open + csv.writer per row', collect_csv)
+        timed('DatasetWriter', collect_binary)
+
+        # 训练用的完整数据集
+        pd.DataFrame(np.column_stack([X, y])).to_csv(csv_path, index=False)
+        os.rename(data_path, data_path + '.small')
+        with DatasetWriter(data_path, buffer_rows=8192) as writer:
+            for row, label in zip(X, y):
+                writer.append(row, label, 0.0)
+        print(f"Loading + windows ({args.rows} rows, {os.path.getsize(csv_path) / 2 ** 20:.0f} MB CSV)")
+
+        def from_csv():
+            df = pd.read_csv(csv_path)
+            return old_windows(df.iloc[:, :-1].values, df.iloc[:, -1].values)
+
+        def from_binary():
+            data = load_dataset(data_path)
+            return create_window_dataset(data.features, data.labels, WINDOW, data.sessions)
+
+        old_X, old_y = timed('read_csv + per-row window loop', from_csv)
+        new_X, new_y = timed('memmap + strided windows', from_binary)
+        assert np.array_equal(old_y, new_y) and np.allclose(old_X, new_X, atol=1e-6)
+        print(f"  {len(new_y)} windows, identical to the CSV path")
+
+    features = X.astype(np.float32)
+    print(f"Window builder only ({args.rows} rows in memory)")
+    timed('per-row loop, window 5', lambda: old_windows(features, y))
+    timed('sliding_window_view, window 5', lambda: create_window_dataset(features, y, WINDOW))
+    timed('per-row loop, windows 3/5/8', lambda: [old_windows(features, y, w) for w in (3, 5, 8)])
+    timed('window_datasets, windows 3/5/8', lambda: window_datasets(features, y, (3, 5, 8)))
+    timed('window_datasets, windows 3/5/8, stride 2', lambda: window_datasets(features, y, (3, 5, 8), stride=2))
+    timed('iter_windows, 16384 per chunk', lambda: sum(len(c[1]) for c in iter_windows(features, y, WINDOW, 16384)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+# benchmarks/bench_draw_cnn.py
+"""你画我猜 DrawCNN 的推理后端对比：torch eager / TorchScript / int8 动态量化 / 纯 NumPy
+
+- 启动：新进程里 import + 加载模型的耗时（numpy 后端不 import torch）
+- 延迟：和游戏里一样每次一张 28x28，另外给出 64 张一批的吞吐
+- 一致性：各后端和 torch eager 的 top-1 一致率；games/draw_guess/ 下有 QuickDraw 的 .npy 时
+  用训练没用到的样本（每类第 MAX_ITEMS_PER_CLASS 张之后）再算准确率，没有时用随机笔画图
+
+用法: python benchmarks/bench_draw_cnn.py [--calls 300] [--samples 1000]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+warnings.filterwarnings('ignore')
+
+import cv2
+import numpy as np
+
+from games.draw_guess.export_model import ARTIFACTS, artifact_path, export_all
+from games.draw_guess_adapter import BACKENDS, load_classifier
+
+MODEL_DIR = os.path.join(ROOT, 'games', 'draw_guess')
+MODEL_PATH = os.path.join(MODEL_DIR, 'draw_model.pth')
+HELD_OUT_START = 2000  # train_lite.MAX_ITEMS_PER_CLASS
+
+STARTUP = """
+import sys, time, warnings
+warnings.filterwarnings('ignore')
+start = time.perf_counter()
+from games.draw_guess_adapter import load_classifier
+name, model = load_classifier({path!r}, {backend!r})
+print(time.perf_counter() - start, 'torch' in sys.modules, name)
+"""
+
+
+def startup(backend):
+    out = subprocess.run([sys.executable, '-c', STARTUP.format(path=MODEL_PATH, backend=backend)],
+                         cwd=ROOT, capture_output=True, text=True).stdout.split()
+    return float(out[0]), out[1] == 'True', out[2]
+
+
+def quickdraw_samples(count):
+    """训练没用到的 QuickDraw 样本；没有下载过数据时返回 None"""
+    with open(os.path.join(MODEL_DIR, 'labels.txt')) as f:
+        labels = [line.strip() for line in f if line.strip()]
+    images, targets = [], []
+    for idx, label in enumerate(labels):
+        path = os.path.join(MODEL_DIR, f'{label}.npy')
+        if not os.path.exists(path):
+            return None
+        data = np.load(path, mmap_mode='r')[HELD_OUT_START:HELD_OUT_START + count // len(labels)]
+        images.append(np.asarray(data, dtype=np.float32).reshape(-1, 28, 28) / 255.0)
+        targets.append(np.full(len(data), idx))
+    return np.concatenate(images), np.concatenate(targets)
+
+
+def stroke_samples(count, seed=0):
+    """随机笔画：在 280x280 上画几笔再缩到 28x28，和游戏里的预处理一样"""
+    rng = np.random.default_rng(seed)
+    images = np.empty((count, 28, 28), dtype=np.float32)
+    for i in range(count):
+        canvas = np.zeros((280, 280), dtype=np.uint8)
+        points = rng.integers(30, 250, (rng.integers(3, 9), 2))
+        cv2.polylines(canvas, [points.astype(np.int32)], bool(rng.integers(2)), 255, 18)
+        images[i] = cv2.resize(canvas, (28, 28), interpolation=cv2.INTER_AREA) / 255.0
+    return images
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=300)
+    parser.add_argument('--samples', type=int, default=1000)
+    args = parser.parse_args()
+
+    if not os.path.exists(MODEL_PATH):
+        print("draw_model.pth not found")
+        return
+    if not all(os.path.exists(artifact_path(MODEL_PATH, b)) for b in ARTIFACTS):
+        export_all(MODEL_PATH)
+
+    print("Startup (new process: import + load)")
+    for backend in BACKENDS:
+        seconds, torch_loaded, name = startup(backend)
+        print(f"  {name:<12} {seconds * 1e3:8.0f} ms   torch imported: {torch_loaded}")
+
+    models = {backend: load_classifier(MODEL_PATH, backend)[1] for backend in BACKENDS}
+    labelled = quickdraw_samples(args.samples)
+    images, targets = labelled if labelled is not None else (stroke_samples(args.samples), None)
+    print(f"Latency and parity ({len(images)} {'QuickDraw held-out' if targets is not None else 'random stroke'} images)")
+    reference = models['torch'].predict_proba(images).argmax(axis=1)
+    for backend, model in models.items():
+        single = images[0]
+        model.predict_proba(single)
+        start = time.perf_counter()
+        for i in range(args.calls):
+            model.predict_proba(images[i % len(images)])
+        single_ms = (time.perf_counter() - start) / args.calls * 1e3
+        start = time.perf_counter()
+        predicted = np.concatenate([model.predict_proba(images[i:i + 64]).argmax(axis=1)
+                                    for i in range(0, len(images), 64)])
+        batch_ms = (time.perf_counter() - start) / len(images) * 1e3
+        line = (f"  {backend:<12} {single_ms:7.3f} ms/image  {batch_ms:7.3f} ms/image (batch 64)  "
+                f"agree with torch {np.mean(predicted == reference):6.1%}")
+        if targets is not None:
+            line += f"  accuracy {np.mean(predicted == targets):6.1%}"
+        size = os.path.getsize(artifact_path(MODEL_PATH, backend) if backend in ARTIFACTS else MODEL_PATH)
+        print(line + f"  {size / 1024:5.0f} KB")
+
+
+if __name__ == '__main__':
+    main()
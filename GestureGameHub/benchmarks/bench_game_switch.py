@@ -0,0 +1,89 @@
+# benchmarks/bench_game_switch.py
+"""切换游戏的首帧耗时 (time-to-first-frame)：冷启动 vs 重新创建 vs 预加载
+
+对 get_game_instance 里的每个游戏测三种情况，都从“请求切换”计到第一帧编码完成：
+- cold:      全新进程，模块、模型、素材都没加载过（每个游戏单独起一个子进程）
+- recreate:  同一进程里第二次创建（模块已导入，检测器从检测器池复用）
+- preloaded: GamePreloader 已在后台建好实例，直接取走
+
+用法: python benchmarks/bench_game_switch.py [maze fruit ...]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+GAMES = ['maze', 'parkour', 'pacman', 'fruit', 'street_fighter', 'draw_guess', 'gesture_draw', 'fingertip_catch']
+
+
+def first_frame(game, frame, encode):
+    from engine import split_stages
+    detect, render = split_stages(game)
+    results = detect(frame) if detect is not None else None
+    return encode(render(frame, results), game)
+
+
+def measure(name):
+    """在当前进程里依次测 cold / recreate / preloaded，返回毫秒数"""
+    from app import get_game_instance
+    from engine import GamePreloader, MjpegStreamEncoder, SyntheticSource, release_game
+
+    frame = SyntheticSource(width=640, height=480, fps=None).read()[1]
+    encode = MjpegStreamEncoder()
+    timings = {}
+
+    def ttff(factory):
+        start = time.perf_counter()
+        game = factory(name)
+        if hasattr(game, 'start_game'):
+            game.start_game()
+        first_frame(game, frame.copy(), encode)
+        elapsed = (time.perf_counter() - start) * 1000
+        release_game(game)
+        return elapsed
+
+    timings['cold'] = ttff(get_game_instance)
+    # 等检测器池的保护期过去，让重新创建的游戏能复用检测器
+    time.sleep(0.6)
+    timings['recreate'] = ttff(get_game_instance)
+
+    preloader = GamePreloader(get_game_instance, memory_limit_mb=0)
+    preloader.preload(name)
+    preloader.wait(name, timeout=120)
+    timings['preloaded'] = ttff(lambda n: preloader.take(n, replenish=False))
+    preloader.shutdown()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('games', nargs='*', default=GAMES)
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print('RESULT ' + json.dumps(measure(args.child)))
+        return
+
+    print(f"{'game':<16} {'cold':>10} {'recreate':>10} {'preloaded':>10}   (ms to first frame)")
+    for name in args.games:
+        # 每个游戏一个新进程，cold 才是真正的冷启动
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', name],
+                             cwd=ROOT, capture_output=True, text=True)
+        line = next((l for l in out.stdout.splitlines() if l.startswith('RESULT ')), None)
+        if line is None:
+            print(f"{name:<16} failed\n{out.stderr[-2000:]}")
+            continue
+        t = json.loads(line[len('RESULT '):])
+        print(f"{name:<16} {t['cold']:10.1f} {t['recreate']:10.1f} {t['preloaded']:10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/bench_gesture_engine.py
+"""街霸 GestureEngine 每帧的开销：滑动窗口 + 随机森林预测
+
+- deque + np.array(history) + sklearn predict（原来的做法）
+- FeatureRing 视图 + sklearn predict
+- FeatureRing 视图 + FlatForest（games/street_fighter/forest.py）
+另外对比模型加载：joblib 反序列化 sklearn vs 加载导出的 gesture_model_seq.npz，
+以及双人模式下两只手分别 predict vs 合在一起 predict 一次。
+
+用的是仓库里的 gesture_model_seq.pkl，输入是随机的 63 维特征行。
+
+用法: python benchmarks/bench_gesture_engine.py [--frames 300]
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import joblib
+import numpy as np
+
+warnings.filterwarnings('ignore')  # 模型是旧版本 sklearn 存的
+
+from games.street_fighter.forest import FlatForest, export_forest, flatten_forest
+from games.street_fighter.gesture_engine import FeatureRing, GestureEngine
+
+
+def run(name, step, rows):
+    start = time.perf_counter()
+    preds = [step(row) for row in rows]
+    ms = (time.perf_counter() - start) / len(rows) * 1e3
+    print(f"  {name:<36} {ms:8.3f} ms/frame  {1000 / ms:8.0f} frames/s")
+    return preds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=300)
+    args = parser.parse_args()
+
+    model_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                              'games', 'street_fighter', 'gesture_model_seq.pkl')
+    if not os.path.exists(model_path):
+        print("gesture_model_seq.pkl not found")
+        return
+    npz_path = os.path.splitext(model_path)[0] + '.npz'
+    if not os.path.exists(npz_path):
+        export_forest(model_path)
+    model = joblib.load(model_path)
+
+    print("Model load")
+    for name, load in (('joblib (sklearn)', lambda: joblib.load(model_path)),
+                       ('npz (FlatForest)', lambda: FlatForest.load(npz_path))):
+        start = time.perf_counter()
+        for _ in range(5):
+            load()
+        print(f"  {name:<36} {(time.perf_counter() - start) / 5 * 1e3:8.1f} ms")
+    print(f"  GestureEngine predictor: {type(GestureEngine().predictor).__name__}")
+    flat = flatten_forest(model)
+    rows = np.random.default_rng(0).normal(0, 0.1, (args.frames, 63))
+
+    def deque_sklearn():
+        history = deque(maxlen=5)
+
+        def step(row):
+            history.append(row)
+            return model.predict(np.array(history).flatten().reshape(1, -1))[0] if len(history) == 5 else None
+        return step
+
+    def ring(predictor):
+        history = FeatureRing(5)
+
+        def step(row):
+            history.push(row)
+            return predictor.predict(history.view().reshape(1, -1))[0] if len(history) == 5 else None
+        return step
+
+    print(f"{len(model.estimators_)} trees, window 5 x 63 features")
+    old = run('deque + np.array + sklearn', deque_sklearn(), rows)
+    run('ring buffer + sklearn', ring(model), rows)
+    new = run('ring buffer + FlatForest', ring(flat), rows)
+    agree = np.mean([a == b for a, b in zip(old[4:], new[4:])])
+    print(f"  predictions agree: {agree:.1%}")
+
+    print("Two hands per frame")
+    windows = np.random.default_rng(1).normal(0, 0.1, (args.frames, 2, 315)).astype(np.float32)
+    for name, predictor in (('sklearn', model), ('FlatForest', flat)):
+        run(f'{name}: one predict per hand', lambda w: [predictor.predict(w[i:i + 1]) for i in range(2)], windows)
+        run(f'{name}: one batched predict', predictor.predict, windows)
+
+
+if __name__ == '__main__':
+    main()
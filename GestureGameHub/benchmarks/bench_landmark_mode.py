@@ -0,0 +1,100 @@
+# benchmarks/bench_landmark_mode.py
+"""每帧服务器 CPU：上传画面（服务器跑 MediaPipe）vs 只传关键点（浏览器跑 MediaPipe）
+
+分开统计“拿到识别结果”（解码上传的 JPEG + cvtColor + MediaPipe，或解析关键点包）
+和游戏逻辑 + 渲染 + 编码两部分；用 process_time，MediaPipe 内部线程的 CPU 也算在内。
+
+用法: python benchmarks/bench_landmark_mode.py [--frames 60] [maze fruit ...]
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+from app import get_game_instance
+from engine import MjpegStreamEncoder, SyntheticSource, split_stages, decode_frame
+from engine.remote import (DETECTOR_ATTRS, blank_frame, encode_packet, parse_packet,
+                           use_remote_detection, restore_local_detection)
+
+GAMES = ['maze', 'parkour', 'pacman', 'fruit', 'street_fighter', 'draw_guess', 'gesture_draw', 'fingertip_catch']
+
+
+def open_hand(cx=0.5, cy=0.5, scale=0.15):
+    """一只张开的手（右手，归一化坐标），手指间留出间隔"""
+    pts = [(0.0, 0.6, 0.0)]
+    for finger, dx in enumerate((-0.5, -0.2, 0.0, 0.2, 0.4)):
+        for joint in range(1, 5):
+            pts.append((dx * (0.6 + joint * 0.1), 0.6 - joint * 0.3, -0.01 * joint))
+    pts = np.array(pts, dtype=np.float32)
+    pts[:, 0] = cx + pts[:, 0] * scale
+    pts[:, 1] = cy + pts[:, 1] * scale
+    return pts
+
+
+def cpu_per_frame(step, frames):
+    step(0)  # 预热
+    start = time.process_time()
+    for i in range(frames):
+        step(i)
+    return (time.process_time() - start) / frames * 1000
+
+
+def bench(name, frames):
+    game = get_game_instance(name)
+    if hasattr(game, 'start_game'):
+        game.start_game()
+    encode = MjpegStreamEncoder()
+    _, render = split_stages(game)
+    detector = next(getattr(game, a) for a in DETECTOR_ATTRS if getattr(game, a, None) is not None)
+    remote = use_remote_detection(game)
+
+    source = SyntheticSource(width=640, height=480, fps=None)
+    uploads = [cv2.imencode('.jpg', source.read()[1])[1].tobytes() for _ in range(8)]
+    hand = open_hand()
+    face = np.tile(np.array([[0.5, 0.45, 0.0]], np.float32), (468, 1))
+    packet = encode_packet([(hand, 'Right', 0.95)], face if name == 'parkour' else None)
+    results = parse_packet(packet)
+
+    # 两种模式的游戏逻辑 / 渲染 / 编码完全相同（同一组关键点），区别只在识别结果从哪来
+    def draw(frame, results):
+        remote.results = results
+        encode(render(frame, results), game)
+
+    def camera_infer(i):
+        frame = decode_frame(uploads[i % len(uploads)])
+        detector.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        return frame
+
+    def landmark_infer(i):
+        parse_packet(packet)
+        return blank_frame()
+
+    camera_infer_ms = cpu_per_frame(camera_infer, frames)
+    landmark_infer_ms = cpu_per_frame(landmark_infer, frames)
+    draw_ms = cpu_per_frame(lambda i: draw(blank_frame(), results), frames)
+    camera_ms, landmark_ms = camera_infer_ms + draw_ms, landmark_infer_ms + draw_ms
+    print(f"  {name:<16} input: frames {camera_infer_ms:6.2f} / landmarks {landmark_infer_ms:5.2f} ms   "
+          f"game+encode {draw_ms:6.2f} ms   total x{camera_ms / max(landmark_ms, 1e-6):.1f}   "
+          f"packet {len(packet)} B vs jpeg {len(uploads[0]) // 1024} KiB")
+    restore_local_detection(game)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=60)
+    parser.add_argument('games', nargs='*', default=GAMES)
+    args = parser.parse_args()
+    print(f"server CPU per frame, {args.frames} frames, 640x480")
+    for name in args.games:
+        bench(name, args.frames)
+
+
+if __name__ == '__main__':
+    main()
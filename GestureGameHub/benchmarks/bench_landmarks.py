@@ -0,0 +1,104 @@
+# benchmarks/bench_landmarks.py
+"""关键点读取：逐个访问 protobuf 属性 vs games/landmarks.py 一次转成数组
+
+- 街霸 GestureEngine 的 63 维特征（原来逐点 row.extend）
+- 五个游戏的手势判断（手指状态 + 方向，原来每处各读一遍属性）
+- 同一帧同一只手的所有读取方（ROI、跟踪器、手势判断、街霸特征）
+- FaceMesh 全部 468 个点 / 跑酷头部姿态用到的 5 个点
+
+用法: python benchmarks/bench_landmarks.py [--repeat 2000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from engine.remote import build_results
+from games import landmarks
+from games.gestures import HandFeatures
+from games.landmarks import LandmarkFrame, to_array
+
+
+def old_engine_row(hand_lms):
+    row = []
+    base_x, base_y, base_z = hand_lms.landmark[0].x, hand_lms.landmark[0].y, hand_lms.landmark[0].z
+    for lm in hand_lms.landmark:
+        row.extend([lm.x - base_x, lm.y - base_y, lm.z - base_z])
+    return row
+
+
+def new_engine_row(results):
+    points = LandmarkFrame(results).hands[0].astype(np.float64)
+    return (points - points[0]).ravel()
+
+
+def old_gestures(lm):
+    pts = lm.landmark
+    fingers = [1 if pts[4].x < pts[3].x else 0] + [1 if pts[i].y < pts[i - 2].y else 0 for i in [8, 12, 16, 20]]
+    dx, dy = pts[8].x - pts[0].x, pts[8].y - pts[0].y
+    # 原来同一帧里方向、手指数、is_up 分别在不同地方各读一遍
+    is_up = (pts[8].y < pts[6].y, pts[12].y < pts[10].y)
+    return fingers, dx, dy, is_up
+
+
+def old_frame(hand):
+    """原来同一帧里各处分别读属性：ROI 外接框、跟踪器、手势判断、街霸特征"""
+    xs = [lm.x for lm in hand.landmark]
+    ys = [lm.y for lm in hand.landmark]
+    box = (min(xs), min(ys), max(xs), max(ys))
+    tracked = np.array([(p.x, p.y, p.z) for p in hand.landmark])
+    return box, tracked, old_gestures(hand), old_engine_row(hand)
+
+
+def new_frame(results):
+    points = to_array(results.multi_hand_landmarks[0])
+    box = points[:, :2].min(axis=0), points[:, :2].max(axis=0)
+    tracked = points.astype(np.float64)
+    return box, tracked, HandFeatures(points), new_engine_row(results)
+
+
+def run(name, fn, items, repeat):
+    """每次调用换一个新的 results（和实际每帧一样），缓存只在同一帧内部起作用"""
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn(items[i % len(items)])
+    us = (time.perf_counter() - start) / repeat * 1e6
+    print(f"  {name:<40} {us:8.1f} us")
+    return us
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # 比转换缓存大得多的一批结果，保证每次都是第一次转换
+    items = [build_results([(rng.random((21, 3)), 'Right', 0.9)], rng.random((468, 3))) for _ in range(200)]
+    hand = lambda r: r.multi_hand_landmarks[0]
+    face = lambda r: r.multi_face_landmarks[0]
+    assert np.array_equal(np.array(old_engine_row(hand(items[0]))), new_engine_row(items[0]))
+
+    print(f"protobuf backend fast path: {landmarks._FAST_PATH}")
+    print("GestureEngine features")
+    run('attribute access + row.extend', lambda r: old_engine_row(hand(r)), items, args.repeat)
+    run('LandmarkFrame + numpy', new_engine_row, items, args.repeat)
+    print("Gesture state")
+    run('attribute access', lambda r: old_gestures(hand(r)), items, args.repeat)
+    run('to_array + HandFeatures', lambda r: HandFeatures(to_array(hand(r))), items, args.repeat)
+    print("All consumers of one hand in a frame (ROI + tracker + gestures + GestureEngine)")
+    run('attribute access in each consumer', lambda r: old_frame(hand(r)), items, args.repeat)
+    run('one to_array shared by all', new_frame, items, args.repeat)
+    print("FaceMesh")
+    run('468 points, list of tuples', lambda r: np.array([(p.x, p.y, p.z) for p in face(r).landmark]),
+        items, args.repeat // 10)
+    run('468 points, to_array', lambda r: to_array(face(r)), items, args.repeat // 10)
+    run('5 head-pose points, to_array', lambda r: to_array(face(r), [1, 33, 263, 152, 10]), items, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
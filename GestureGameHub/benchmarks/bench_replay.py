@@ -0,0 +1,57 @@
+# benchmarks/bench_replay.py
+"""性能回归：把同一段录制回放给所有游戏（不用摄像头、不 sleep），输出帧率、各阶段耗时和内存
+
+录制用 python -m engine.replay record out.npz 生成；不给录制文件时用合成的关键点（两只手 + 人脸）。
+--detect 在录下的画面上重新跑 MediaPipe（录制里要有画面），否则直接用录下的识别结果。
+
+用法: python benchmarks/bench_replay.py [recording.npz] [--games maze,pacman] [--detect] [--json out.json]
+"""
+import argparse
+import json
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import GAME_NAMES, get_game_instance
+from engine.replay import Recording, replay_all, synthetic_recording
+
+TOP_STAGES = 4
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('recording', nargs='?')
+    parser.add_argument('--games', default=','.join(GAME_NAMES))
+    parser.add_argument('--frames', type=int, default=120, help="合成录制的帧数")
+    parser.add_argument('--detect', action='store_true')
+    parser.add_argument('--json', help="把完整报告写到这个文件")
+    args = parser.parse_args()
+
+    recording = Recording.load(args.recording) if args.recording else synthetic_recording(args.frames)
+    if args.detect and not recording.has_frames:
+        parser.error("录制里没有画面，不能 --detect")
+    names = [n.strip() for n in args.games.split(',') if n.strip()]
+    print(f"{len(recording)} frames ({recording.duration:.1f}s), "
+          f"{'MediaPipe on recorded frames' if args.detect else 'recorded landmarks'}")
+
+    reports = replay_all(get_game_instance, names, recording, detect=args.detect)
+    print(f"{'game':<16} {'fps':>8} {'p50 ms':>8} {'p95 ms':>8} {'create s':>9} {'peak MB':>8}  slowest stages (mean ms)")
+    for r in reports:
+        if 'error' in r:
+            print(f"{r['game']:<16} ERROR {r['error']}")
+            continue
+        stages = sorted(((s.get('mean', 0), name) for name, s in r['stages'].items() if name != 'process'),
+                        reverse=True)[:TOP_STAGES]
+        peak = r['memory_mb']['peak']
+        print(f"{r['game']:<16} {r['fps']:8.1f} {r['frame_ms']['p50']:8.2f} {r['frame_ms']['p95']:8.2f} "
+              f"{r['create_s']:9.2f} {peak or 0:8.0f}  " + ', '.join(f"{n} {m:.2f}" for m, n in stages))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(reports, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+# benchmarks/bench_roi.py
+"""手部 ROI 裁剪（games/roi_tracker.py）前后的单帧推理耗时
+
+默认用合成画面，分别测 MediaPipe Hands 处理整幅画面、以及静态模式的 Hands 处理 ROI 大小的裁剪区域
+（手已经找到时 RoiDetector 每帧实际交给裁剪检测器的图）的耗时。合成画面里没有手，只比较输入尺寸带来的差别。
+
+要看真实收益得用有手的画面：--recording 给 engine.replay 录下的 .npz（python -m engine.replay record hands.npz），
+或 --video 给一段录像，端到端比较 Hands 和 RoiDetector，给出 ROI 命中率和关键点偏差（相对整幅画面检测，像素）。
+
+用法: python benchmarks/bench_roi.py [--frames 100] [--recording hands.npz] [--video hands.mp4]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from engine.replay import Recording
+from engine.sources import SyntheticSource, VideoFileSource
+from games.landmarks import to_array
+from games.roi_tracker import RoiDetector
+
+
+def timed(detector, images):
+    detector.process(images[0])
+    start = time.perf_counter()
+    for image in images:
+        detector.process(image)
+    return (time.perf_counter() - start) / len(images) * 1000
+
+
+def new_hands(static=False):
+    return mp.solutions.hands.Hands(static_image_mode=static, max_num_hands=1,
+                                    min_detection_confidence=0.7, min_tracking_confidence=0.5)
+
+
+def synthetic(frames):
+    for w, h in ((640, 480), (1280, 720)):
+        source = SyntheticSource(w, h, fps=None)
+        images = [cv2.cvtColor(source.read()[1], cv2.COLOR_BGR2RGB) for _ in range(frames)]
+        hands, static = new_hands(), new_hands(static=True)
+        base = timed(hands, images)
+        print(f"  {w}x{h} full frame      {base:7.2f} ms/frame")
+        # 手在画面中等距离时 ROI 约为短边的 35%~50%
+        for ratio in (0.35, 0.5):
+            side = int(min(w, h) * ratio)
+            crops = [image[100:100 + side, 200:200 + side].copy() for image in images]
+            ms = timed(static, crops)
+            print(f"  {w}x{h} ROI {side}x{side}   {ms:7.2f} ms/frame  x{base / ms:.2f}")
+        hands.close()
+        static.close()
+
+
+def end_to_end(images):
+    """同一组画面：Hands 整幅检测 vs RoiDetector；关键点偏差按画面像素算"""
+    hands = new_hands()
+    base = timed(hands, images)
+    reference = [hands.process(image).multi_hand_landmarks for image in images]
+    roi = RoiDetector(new_hands(), new_hands(static=True))
+    ms = timed(roi, images)
+    errors, found = [], [0, 0]
+    for image, expected in zip(images, reference):
+        got = roi.process(image).multi_hand_landmarks
+        found[0] += bool(expected)
+        found[1] += bool(got)
+        if expected and got:
+            scale = np.array(image.shape[1::-1], dtype=np.float32)
+            errors.append(np.abs(to_array(got[0])[:, :2] - to_array(expected[0])[:, :2]).mean() * scale.mean())
+    print(f"  full frame {base:7.2f} ms/frame   ROI {ms:7.2f} ms/frame  x{base / ms:.2f}")
+    print(f"  frames with a hand: full {found[0]}, ROI {found[1]} of {len(images)}")
+    if errors:
+        print(f"  landmark offset vs full frame: mean {np.mean(errors):.1f} px, max {np.max(errors):.1f} px")
+    print(f"  {roi.stats()}")
+
+
+def video(path, frames):
+    source = VideoFileSource(path, loop=False, realtime=False)
+    source.open()
+    images = []
+    while len(images) < frames:
+        ok, frame = source.read()
+        if not ok:
+            break
+        images.append(cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB))
+    source.release()
+    end_to_end(images)
+
+
+def recording(path, frames):
+    rec = Recording.load(path)
+    if not rec.has_frames:
+        print("  recording has no frames (landmarks only)")
+        return
+    # 录制时已经镜像过
+    end_to_end([cv2.cvtColor(rec.frame(i), cv2.COLOR_BGR2RGB) for i in range(min(frames, len(rec)))])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--video', help='有手的录像，端到端比较')
+    parser.add_argument('--recording', help='engine.replay 录下的 .npz（要有画面），端到端比较')
+    args = parser.parse_args()
+
+    print(f"MediaPipe Hands, synthetic frames, {args.frames} frames")
+    synthetic(args.frames)
+    if args.recording:
+        print(f"\n{args.recording}")
+        recording(args.recording, args.frames)
+    if args.video:
+        print(f"\n{args.video}")
+        video(args.video, args.frames)
+
+
+if __name__ == '__main__':
+    main()
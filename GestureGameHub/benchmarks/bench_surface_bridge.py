@@ -0,0 +1,70 @@
+# benchmarks/bench_surface_bridge.py
+"""pygame Surface → OpenCV BGR 转换基准：原来的三次拷贝路径 vs games/surface_bridge.py
+
+用法: python benchmarks/bench_surface_bridge.py [--frames 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+import pygame
+
+from games.surface_bridge import SurfaceBridge, surface_to_bgr
+
+
+def array3d_path(surface):
+    """原来各游戏的写法：array3d（拷贝）→ transpose → cvtColor（拷贝）"""
+    view = pygame.surfarray.array3d(surface)
+    return cv2.cvtColor(view.transpose([1, 0, 2]), cv2.COLOR_RGB2BGR)
+
+
+def make_surface(width, height):
+    surface = pygame.Surface((width, height))
+    surface.fill((30, 40, 50))
+    rng = np.random.default_rng(0)
+    for _ in range(60):
+        pygame.draw.circle(surface, rng.integers(0, 255, 3).tolist(),
+                           (int(rng.integers(0, width)), int(rng.integers(0, height))), int(rng.integers(5, 60)))
+    return surface
+
+
+def run(name, convert, frames, reference):
+    result = convert()
+    assert np.array_equal(result, reference), f'{name} 输出和原始路径不一致'
+    start = time.perf_counter()
+    for _ in range(frames):
+        convert()
+    elapsed = (time.perf_counter() - start) / frames * 1000
+    print(f"  {name:<34} {elapsed:7.3f} ms/frame")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=200)
+    args = parser.parse_args()
+    pygame.init()
+
+    for width, height in [(600, 400), (900, 720), (1280, 720)]:
+        surface = make_surface(width, height)
+        reference = array3d_path(surface)
+        bridge = SurfaceBridge()
+        # 游戏画面写进更宽的画布左侧（迷宫 / 跑酷 / 街霸的用法）
+        canvas = np.zeros((height, width + 380, 3), dtype=np.uint8)
+        print(f"{width}x{height}, {args.frames} frames")
+        base = run('array3d + transpose + cvtColor', lambda: array3d_path(surface), args.frames, reference)
+        run('surface_to_bgr (new array)', lambda: surface_to_bgr(surface), args.frames, reference)
+        run('SurfaceBridge (reused buffer)', lambda: bridge.convert(surface), args.frames, reference)
+        best = run('surface_to_bgr into canvas slice',
+                   lambda: surface_to_bgr(surface, canvas[:, :width]), args.frames, reference)
+        print(f"  speedup x{base / best:.1f}")
+
+
+if __name__ == '__main__':
+    main()
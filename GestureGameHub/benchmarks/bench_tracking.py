@@ -0,0 +1,103 @@
+# benchmarks/bench_tracking.py
+"""隔帧检测 + 关键点预测（games/tracking.py）的开销和质量
+
+- 开销：真实的 MediaPipe Hands 处理合成画面，每帧检测 vs LandmarkTracker（interval=2/3/4）
+- 质量：手指按圆周运动（带检测噪声），比较预测值、沿用上次结果和真实位置的误差（像素，640 宽）
+
+用法: python benchmarks/bench_tracking.py [--frames 150] [--speed 1.0]
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mediapipe as mp
+import numpy as np
+
+from engine.remote import build_results
+from engine.sources import SyntheticSource
+from games.tracking import LandmarkTracker
+
+WIDTH = 640
+BASE = np.random.default_rng(0).random((21, 3)) * 0.1
+
+
+def hand_at(t, speed):
+    """手绕画面中心转圈，speed 为每秒圈数"""
+    angle = 2 * math.pi * speed * t
+    points = BASE.copy()
+    points[:, 0] += 0.5 + 0.25 * math.cos(angle)
+    points[:, 1] += 0.5 + 0.25 * math.sin(angle)
+    return points
+
+
+class ScriptedHands:
+    def __init__(self, speed, noise, rng):
+        self.speed, self.noise, self.rng = speed, noise, rng
+        self.t = 0.0
+
+    def process(self, image):
+        points = hand_at(self.t, self.speed) + self.rng.normal(0, self.noise, BASE.shape)
+        return build_results([(points, 'Right', 0.9)])
+
+
+def cost(frames, interval):
+    hands = mp.solutions.hands.Hands(max_num_hands=1)
+    tracker = LandmarkTracker(hands, interval=interval, motion=None)
+    source = SyntheticSource(640, 480, fps=None)
+    images = [source.read()[1][:, :, ::-1].copy() for _ in range(frames)]
+    hands.process(images[0])
+    start = time.perf_counter()
+    for i, image in enumerate(images):
+        # 时间按 30fps 的摄像头算，和实际跑多快无关
+        tracker.process(image, now=i / 30)
+    elapsed = (time.perf_counter() - start) / frames * 1000
+    hands.close()
+    return elapsed
+
+
+def quality(frames, interval, speed, noise):
+    rng = np.random.default_rng(1)
+    fake = ScriptedHands(speed, noise, rng)
+    tracker = LandmarkTracker(fake, interval=interval, motion=None)
+    predicted, held = [], []
+    last = None
+    for i in range(frames):
+        fake.t = i / 30
+        res = tracker.process(None, now=fake.t)
+        tip = res.multi_hand_landmarks[0].landmark[8]
+        truth = hand_at(fake.t, speed)[8]
+        if tracker._since_detect == 0:
+            last = truth
+        else:
+            predicted.append(math.hypot(tip.x - truth[0], tip.y - truth[1]) * WIDTH)
+            held.append(math.hypot(last[0] - truth[0], last[1] - truth[1]) * WIDTH)
+    return np.mean(predicted), np.percentile(predicted, 95), np.mean(held), tracker.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=150)
+    parser.add_argument('--speed', type=float, default=0.5, help='手转圈的速度（圈/秒）')
+    parser.add_argument('--noise', type=float, default=0.002, help='检测噪声（归一化坐标）')
+    args = parser.parse_args()
+
+    print(f"MediaPipe Hands on synthetic 640x480 frames, {args.frames} frames")
+    base = cost(args.frames, 1)  # interval=1 每帧都检测，等于不跟踪
+    print(f"  {'every frame':<14} {base:7.2f} ms/frame")
+    for interval in (2, 3, 4):
+        ms = cost(args.frames, interval)
+        print(f"  {f'interval={interval}':<14} {ms:7.2f} ms/frame  x{base / ms:.1f}")
+
+    print(f"\nFingertip error at 30 fps, {args.speed} rev/s circle (pixels @ {WIDTH} wide)")
+    for interval in (2, 3, 4):
+        mean, p95, held, stats = quality(args.frames, interval, args.speed, args.noise)
+        print(f"  interval={interval}  predicted mean {mean:5.1f} p95 {p95:5.1f}   hold-last mean {held:5.1f}"
+              f"   max landmark age {stats['max_age_ms']:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,13 @@
+# engine/__init__.py
+from .capture import FrameCapture, CapturedFrame
+from .sources import WebcamSource, VideoFileSource, SyntheticSource, open_source
+from .camera import CameraService, CameraSubscription, camera_service
+from .pipeline import FramePipeline, DropOldestQueue, split_stages
+from .metrics import MetricsRegistry, metrics, timed_method
+from .encoder import FrameEncoder, MjpegStreamEncoder, ENCODER_PROFILES, mjpeg_chunk
+from .sessions import GameSession, SessionManager, UploadSource, release_game
+from .ws_ingest import SocketSession, decode_frame
+from .remote import RemoteDetector, RemoteResults, build_results, parse_packet, encode_packet, use_remote_detection, restore_local_detection
+from .warmup import GamePreloader, process_memory_mb, warm_detectors
+from .pacing import FramePacer, CpuMonitor, cpu_monitor, pacer_for
+from .replay import Recording, ReplayPacer, replay_game, replay_all, synthetic_recording
@@ -0,0 +1,104 @@
+# engine/camera.py
+"""进程级摄像头服务：设备只打开一次，多个视频流共享同一路画面"""
+import threading
+
+from .capture import FrameCapture, CapturedFrame
+from .sources import open_source
+
+
+class CameraSubscription:
+    """单个视频流对摄像头的订阅，用完必须 close()（或使用 with 语句）"""
+
+    def __init__(self, service, capture):
+        self.service = service
+        self.capture = capture
+        self.last_seq = None
+        self.closed = False
+
+    def read(self, timeout=1.0, copy=True):
+        """取一帧比上次更新的画面；超时或画面源结束返回 None
+
+        同一帧会分发给所有订阅者，游戏会在画面上画关键点，
+        所以默认返回副本，避免不同视频流互相污染。
+        """
+        if self.closed:
+            return None
+        item = self.capture.read(self.last_seq, timeout=timeout)
+        if item is None:
+            return None
+        self.last_seq = item.seq
+        if copy:
+            item = CapturedFrame(item.seq, item.timestamp, item.frame.copy())
+        return item
+
+    @property
+    def ended(self):
+        return self.closed or self.capture.ended
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.service._unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CameraService:
+    """引用计数的摄像头代理
+
+    第一个订阅者到来时打开设备并启动采集线程，
+    最后一个订阅者断开时停止线程并释放设备。
+    """
+
+    def __init__(self, source_spec=None, mirror=True):
+        self.source_spec = source_spec
+        self.mirror = mirror
+        self._lock = threading.Lock()
+        self._capture = None
+        self._subscribers = 0
+
+    def configure(self, source_spec=None, mirror=None):
+        """切换画面源（下次打开设备时生效）"""
+        with self._lock:
+            self.source_spec = source_spec
+            if mirror is not None:
+                self.mirror = mirror
+
+    def subscribe(self):
+        with self._lock:
+            if self._capture is None or self._capture.ended:
+                if self._capture is not None:
+                    # 旧的画面源已经结束，挂在上面的订阅者不再计数
+                    self._capture.stop()
+                    self._subscribers = 0
+                self._capture = FrameCapture(open_source(self.source_spec), mirror=self.mirror).start()
+            self._subscribers += 1
+            return CameraSubscription(self, self._capture)
+
+    def _unsubscribe(self, subscription):
+        with self._lock:
+            if subscription.capture is not self._capture:
+                # 旧设备已经被替换掉了，无需处理
+                return
+            self._subscribers = max(0, self._subscribers - 1)
+            if self._subscribers == 0 and self._capture is not None:
+                self._capture.stop()
+                self._capture = None
+
+    def stats(self):
+        with self._lock:
+            capture = self._capture
+            return {
+                'subscribers': self._subscribers,
+                'open': capture is not None and capture.running,
+                'frames_captured': capture.frames_captured if capture else 0,
+                'source': self.source_spec or 'default',
+            }
+
+
+# 全局唯一的摄像头服务
+camera_service = CameraService()
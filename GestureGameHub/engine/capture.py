@@ -0,0 +1,98 @@
+# engine/capture.py
+"""后台采集线程：独占摄像头，只保留最新一帧 (latest-frame-wins)"""
+import threading
+import time
+from collections import namedtuple
+
+import cv2
+
+from .metrics import metrics
+
+# seq: 帧序号（从 1 开始递增）；timestamp: 采集完成时的 time.time()
+# results: 客户端已经算好的识别结果（只传关键点模式），摄像头画面为 None
+CapturedFrame = namedtuple('CapturedFrame', ['seq', 'timestamp', 'frame', 'results'], defaults=(None,))
+
+
+class FrameCapture:
+    """后台线程不停读取画面源，新帧直接覆盖旧帧。
+
+    消费者通过 read(last_seq) 拿到比 last_seq 更新的那一帧；
+    处理慢的时候中间的帧会被跳过，而不是排队等待，从而降低延迟。
+    """
+
+    def __init__(self, source, mirror=True):
+        self.source = source
+        self.mirror = mirror
+
+        self._cond = threading.Condition()
+        self._latest = None
+        self._running = False
+        self._thread = None
+
+        self.frames_captured = 0
+        self.ended = False
+
+    def start(self):
+        if self._running:
+            return self
+        if hasattr(self.source, 'open') and self.source.open() is False:
+            print(">>> [Capture] 画面源打开失败")
+            self.ended = True
+            return self
+        self._running = True
+        self.ended = False
+        self._thread = threading.Thread(target=self._loop, name='FrameCapture', daemon=True)
+        self._thread.start()
+        return self
+
+    def _loop(self):
+        try:
+            while self._running:
+                with metrics.timed('camera.read'):
+                    success, frame = self.source.read()
+                if not success:
+                    break
+                # 翻转摄像头，像照镜子一样（在采集线程里做，不占用推流线程）
+                if self.mirror:
+                    with metrics.timed('cv2.flip'):
+                        frame = cv2.flip(frame, 1)
+                with self._cond:
+                    self.frames_captured += 1
+                    self._latest = CapturedFrame(self.frames_captured, time.time(), frame)
+                    self._cond.notify_all()
+        finally:
+            with self._cond:
+                self.ended = True
+                self._running = False
+                self._cond.notify_all()
+            self.source.release()
+
+    def latest(self):
+        """不等待，直接返回当前最新帧（可能为 None）"""
+        with self._cond:
+            return self._latest
+
+    def read(self, last_seq=None, timeout=1.0):
+        """等待一帧序号大于 last_seq 的画面；超时或采集结束返回 None"""
+        deadline = time.time() + timeout
+        with self._cond:
+            while True:
+                item = self._latest
+                if item is not None and (last_seq is None or item.seq > last_seq):
+                    return item
+                if self.ended:
+                    return None
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._running
@@ -0,0 +1,186 @@
+# engine/encoder.py
+"""MJPEG 编码层：可替换的 JPEG 后端 + 按游戏配置质量 / 色度抽样 / 缩放 + 按字节预算自适应质量"""
+import os
+import threading
+
+import cv2
+
+from .metrics import game_label
+
+try:
+    from turbojpeg import TurboJPEG, TJSAMP_420, TJSAMP_422, TJSAMP_444
+except ImportError:  # 可选依赖：PyTurboJPEG
+    TurboJPEG = None
+
+PART_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+PART_TAIL = b'\r\n'
+
+# 各游戏的编码参数（按适配器类名）；没有列出的游戏用 default
+#   quality: 初始 JPEG 质量；subsampling: 色度抽样 420/422/444；
+#   scale: 编码前缩放比例；max_bytes: 单帧字节预算，设置后自动调整质量
+ENCODER_PROFILES = {
+    'default': {'quality': 80, 'subsampling': '420', 'scale': 1.0, 'max_bytes': None},
+    # 1680x720 的合成画面，缩小后再编码，带宽和编码耗时都明显下降
+    'StreetFighterAdapter': {'quality': 75, 'subsampling': '420', 'scale': 0.75, 'max_bytes': 150_000},
+    'FruitNinjaGame': {'quality': 75, 'subsampling': '420', 'scale': 1.0, 'max_bytes': 120_000},
+    'PacmanGameAdapter': {'quality': 75, 'subsampling': '420', 'scale': 1.0, 'max_bytes': 120_000},
+    # 白底画板，细线条需要完整色度
+    'DrawGuessAdapter': {'quality': 80, 'subsampling': '444', 'scale': 1.0, 'max_bytes': None},
+    'GestureDrawAdapter': {'quality': 80, 'subsampling': '444', 'scale': 1.0, 'max_bytes': None},
+}
+
+_CV2_SAMPLING = {
+    name: getattr(cv2, f'IMWRITE_JPEG_SAMPLING_FACTOR_{name}', None)
+    for name in ('411', '420', '422', '440', '444')
+}
+
+
+def mjpeg_chunk(frame, game=None):
+    """原始编码路径：默认质量 imencode + tobytes + 拼接（作为基准保留）"""
+    ret, buffer = cv2.imencode('.jpg', frame)
+    if not ret:
+        return None
+    return PART_HEADER + buffer.tobytes() + PART_TAIL
+
+
+class OpenCVJpegBackend:
+    name = 'opencv'
+
+    def encode(self, frame, quality, subsampling):
+        params = [cv2.IMWRITE_JPEG_QUALITY, int(quality)]
+        factor = _CV2_SAMPLING.get(subsampling)
+        if factor is not None and hasattr(cv2, 'IMWRITE_JPEG_SAMPLING_FACTOR'):
+            params += [cv2.IMWRITE_JPEG_SAMPLING_FACTOR, factor]
+        ret, buffer = cv2.imencode('.jpg', frame, params)
+        return buffer if ret else None
+
+
+class TurboJpegBackend:
+    name = 'turbojpeg'
+
+    def __init__(self):
+        self.jpeg = TurboJPEG()
+        self.sampling = {'420': TJSAMP_420, '422': TJSAMP_422, '444': TJSAMP_444}
+
+    def encode(self, frame, quality, subsampling):
+        return self.jpeg.encode(frame, quality=int(quality),
+                                jpeg_subsample=self.sampling.get(subsampling, TJSAMP_420))
+
+
+def create_backend(name=None):
+    """按名字创建后端；未指定时读取 GESTURE_JPEG_BACKEND，turbojpeg 不可用时回退到 OpenCV"""
+    name = name or os.environ.get('GESTURE_JPEG_BACKEND') or 'opencv'
+    if name == 'turbojpeg':
+        if TurboJPEG is not None:
+            try:
+                return TurboJpegBackend()
+            except Exception as e:
+                print(f">>> [Encoder] TurboJPEG 初始化失败，使用 OpenCV: {e}")
+        else:
+            print(">>> [Encoder] 未安装 PyTurboJPEG，使用 OpenCV")
+    return OpenCVJpegBackend()
+
+
+class FrameEncoder:
+    """单个游戏的编码器：缩放 → JPEG → MJPEG 分片
+
+    设置 max_bytes 后，每帧根据实际字节数微调质量，使输出尽量落在预算内。
+    """
+
+    def __init__(self, quality=80, subsampling='420', scale=1.0, max_bytes=None,
+                 min_quality=35, max_quality=90, backend=None):
+        self.quality = quality
+        self.subsampling = subsampling
+        self.scale = scale
+        self.max_bytes = max_bytes
+        self.min_quality = min_quality
+        self.max_quality = max_quality
+        self.backend = backend or create_backend()
+
+        self._scaled = None  # 缩放输出缓冲，尺寸不变时复用
+        self.last_bytes = 0
+
+    @classmethod
+    def for_game(cls, game, backend=None):
+        profile = ENCODER_PROFILES.get(game_label(game), ENCODER_PROFILES['default'])
+        return cls(backend=backend, **profile)
+
+    def _downscale(self, frame):
+        if self.scale >= 1.0:
+            return frame
+        h, w = frame.shape[:2]
+        size = (max(1, int(w * self.scale)), max(1, int(h * self.scale)))
+        if self._scaled is None or self._scaled.shape[:2] != (size[1], size[0]) \
+                or self._scaled.shape[2:] != frame.shape[2:]:
+            self._scaled = cv2.resize(frame, size, interpolation=cv2.INTER_LINEAR)
+        else:
+            cv2.resize(frame, size, dst=self._scaled, interpolation=cv2.INTER_LINEAR)
+        return self._scaled
+
+    def _adapt(self, size):
+        if not self.max_bytes:
+            return
+        if size > self.max_bytes:
+            # 超得越多降得越快
+            step = max(1, int((size / self.max_bytes - 1.0) * 20))
+            self.quality = max(self.min_quality, self.quality - step)
+        elif size < self.max_bytes * 0.75:
+            self.quality = min(self.max_quality, self.quality + 1)
+
+    def encode(self, frame):
+        """返回 JPEG 数据（numpy 数组或 bytes，支持 buffer 协议）"""
+        buffer = self.backend.encode(self._downscale(frame), self.quality, self.subsampling)
+        if buffer is None:
+            return None
+        self.last_bytes = len(buffer)
+        self._adapt(self.last_bytes)
+        return buffer
+
+    def chunk(self, frame):
+        """编码成 multipart 分片：直接从编码缓冲区拼接，省掉 tobytes() 的一次拷贝"""
+        buffer = self.encode(frame)
+        if buffer is None:
+            return None
+        return b''.join((PART_HEADER, buffer, PART_TAIL))
+
+    def stats(self):
+        return {
+            'backend': self.backend.name,
+            'quality': self.quality,
+            'subsampling': self.subsampling,
+            'scale': self.scale,
+            'max_bytes': self.max_bytes,
+            'last_bytes': self.last_bytes,
+        }
+
+
+class MjpegStreamEncoder:
+    """视频流用的编码入口：按游戏懒创建并缓存 FrameEncoder，可直接作为流水线的 encode
+
+    multipart=False 时输出单张 JPEG 的 bytes（WebSocket 等不需要分片头的场合）。
+    """
+
+    def __init__(self, backend=None, multipart=True):
+        self.backend = backend or create_backend()
+        self.multipart = multipart
+        self._encoders = {}
+        self._lock = threading.Lock()
+
+    def encoder_for(self, game):
+        label = game_label(game)
+        with self._lock:
+            encoder = self._encoders.get(label)
+            if encoder is None:
+                encoder = self._encoders[label] = FrameEncoder.for_game(label, backend=self.backend)
+            return encoder
+
+    def __call__(self, frame, game=None):
+        encoder = self.encoder_for(game)
+        if self.multipart:
+            return encoder.chunk(frame)
+        buffer = encoder.encode(frame)
+        return None if buffer is None else bytes(buffer)
+
+    def stats(self):
+        with self._lock:
+            return {label: enc.stats() for label, enc in self._encoders.items()}
@@ -0,0 +1,163 @@
+# engine/metrics.py
+"""轻量级耗时统计：按 游戏 × 阶段 维护滚动窗口，输出 p50/p95/p99
+
+用法：
+    with metrics.timed('hands.process', self):
+        results = self.hands.process(img_rgb)
+
+    @timed_method('process')
+    def process(self, frame): ...
+"""
+import functools
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+SERVER_LABEL = 'server'
+QUANTILES = (50, 95, 99)
+
+
+def game_label(game):
+    """统计用的游戏名：直接用适配器类名；字符串原样返回，None 归到 server"""
+    if game is None:
+        return SERVER_LABEL
+    if isinstance(game, str):
+        return game
+    return type(game).__name__
+
+
+class RollingHistogram:
+    """保存最近 window 次耗时（毫秒）"""
+
+    def __init__(self, window=300):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def add(self, ms):
+        self.samples.append(ms)
+        self.count += 1
+        self.total_ms += ms
+
+    def summary(self):
+        if not self.samples:
+            return {'count': self.count}
+        values = np.fromiter(self.samples, dtype=np.float64, count=len(self.samples))
+        p50, p95, p99 = np.percentile(values, QUANTILES)
+        return {
+            'count': self.count,
+            'last': round(values[-1], 3),
+            'mean': round(float(values.mean()), 3),
+            'p50': round(float(p50), 3),
+            'p95': round(float(p95), 3),
+            'p99': round(float(p99), 3),
+        }
+
+
+class _Timer:
+    __slots__ = ('registry', 'stage', 'game', 'start')
+
+    def __init__(self, registry, stage, game):
+        self.registry = registry
+        self.stage = stage
+        self.game = game
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.record(self.stage, time.perf_counter() - self.start, self.game)
+        return False
+
+
+class MetricsRegistry:
+    def __init__(self, window=300):
+        self.window = window
+        self.enabled = True
+        self.overlay_enabled = False
+        self._lock = threading.Lock()
+        self._hists = {}  # (game, stage) -> RollingHistogram
+
+    def record(self, stage, seconds, game=None):
+        if not self.enabled:
+            return
+        key = (game_label(game), stage)
+        with self._lock:
+            hist = self._hists.get(key)
+            if hist is None:
+                hist = self._hists[key] = RollingHistogram(self.window)
+            hist.add(seconds * 1000.0)
+
+    def timed(self, stage, game=None):
+        return _Timer(self, stage, game)
+
+    def reset(self):
+        with self._lock:
+            self._hists.clear()
+
+    def snapshot(self, game=None):
+        """{游戏: {阶段: {count, last, mean, p50, p95, p99}}}，单位毫秒"""
+        label = game_label(game) if game is not None else None
+        with self._lock:
+            items = [(k, h.summary()) for k, h in self._hists.items()
+                     if label is None or k[0] == label]
+        result = {}
+        for (g, stage), summary in sorted(items):
+            result.setdefault(g, {})[stage] = summary
+        return result
+
+    def to_prometheus(self):
+        lines = [
+            '# HELP gesture_stage_latency_ms Per-stage frame latency in milliseconds',
+            '# TYPE gesture_stage_latency_ms summary',
+        ]
+        for g, stages in self.snapshot().items():
+            for stage, s in stages.items():
+                labels = f'game="{g}",stage="{stage}"'
+                for q in QUANTILES:
+                    if f'p{q}' in s:
+                        lines.append(f'gesture_stage_latency_ms{{{labels},quantile="{q / 100}"}} {s[f"p{q}"]}')
+                lines.append(f'gesture_stage_latency_ms_count{{{labels}}} {s["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def draw_overlay(self, img, game=None, width=370):
+        """把当前游戏各阶段的 p50/p95 画到画面右下角（侧边栏区域）"""
+        rows = []
+        for label in (game_label(game), SERVER_LABEL):
+            for stage, s in self.snapshot(label).get(label, {}).items():
+                if 'p50' in s:
+                    rows.append(f"{stage[:18]:<18} {s['p50']:6.1f} {s['p95']:6.1f}")
+        if not rows:
+            return img
+        h, w = img.shape[:2]
+        line_h = 18
+        box_h = line_h * (len(rows) + 1) + 10
+        x0, y0 = max(0, w - width), max(0, h - box_h)
+        roi = img[y0:h, x0:w]
+        # 半透明底色，保证文字看得清
+        roi[:] = (roi * 0.35).astype(roi.dtype)
+        cv2.putText(img, 'stage              p50ms  p95ms', (x0 + 8, y0 + line_h),
+                    cv2.FONT_HERSHEY_PLAIN, 1.0, (0, 255, 255), 1)
+        for i, row in enumerate(rows):
+            cv2.putText(img, row, (x0 + 8, y0 + line_h * (i + 2)),
+                        cv2.FONT_HERSHEY_PLAIN, 1.0, (220, 220, 220), 1)
+        return img
+
+
+# 全局统计实例
+metrics = MetricsRegistry()
+
+
+def timed_method(stage):
+    """方法装饰器：以 self 的类名作为游戏标签统计整个方法的耗时"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with metrics.timed(stage, self):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,159 @@
+# engine/pacing.py
+"""帧节奏控制：每个游戏一个目标帧率 + 真实的帧间隔 dt，CPU 吃紧时给推理抽帧
+
+原来各游戏自己控制节奏：迷宫每帧 sleep 20ms，你画我猜按 SKIP 后 sleep 200ms，
+吃豆人用 pygame Clock.tick 限速（也是 sleep），还按固定 1/FPS 累计计时器。
+sleep 会卡住流水线的渲染线程，固定 1/FPS 则让游戏速度随实际帧率变化。
+
+- FramePacer.due(): 流水线推理阶段调用，超过目标帧率的画面直接丢掉（不 sleep）
+- FramePacer.should_infer(): CPU 使用率超过阈值时逐步加大抽帧间隔，
+  中间的帧复用上一次的识别结果，游戏逻辑和画面照常按帧更新；CPU 降下来后再逐步恢复
+- FramePacer.tick(): 游戏每帧调用一次，返回距上一帧的真实秒数，游戏按它推进计时和运动
+"""
+import os
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:  # 可选依赖：没有 psutil 时按本进程的 CPU 时间估算
+    psutil = None
+
+DEFAULT_FPS = 30
+
+
+class CpuMonitor:
+    """CPU 使用率采样（0~1），两次采样至少间隔 interval 秒，调用很频繁也没关系"""
+
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._last_wall = time.perf_counter()
+        self._last_cpu = time.process_time()
+        self._cores = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1)
+        self.value = 0.0
+        self.samples = 0
+        if psutil is not None:
+            psutil.cpu_percent(interval=None)  # 第一次调用只是建立基准
+
+    def utilization(self):
+        with self._lock:
+            now = time.perf_counter()
+            elapsed = now - self._last_wall
+            if elapsed < self.interval:
+                return self.value
+            if psutil is not None:
+                self.value = psutil.cpu_percent(interval=None) / 100.0
+            else:
+                cpu = time.process_time()
+                self.value = min(1.0, (cpu - self._last_cpu) / (elapsed * self._cores))
+                self._last_cpu = cpu
+            self._last_wall = now
+            self.samples += 1
+            return self.value
+
+
+# 全局实例：所有流水线共用一份 CPU 读数
+cpu_monitor = CpuMonitor()
+
+
+class FramePacer:
+    """单个游戏的帧节奏
+
+    target_fps: 游戏想要的帧率，超过的摄像头帧会被丢掉
+    max_dt: tick() 返回值的上限，卡顿或暂停之后游戏不会一下子跳很远
+    high / low: CPU 使用率高于 high 时抽帧间隔 +1，低于 low 时 -1（最多 max_decimation 帧推理一次）
+    """
+
+    def __init__(self, target_fps=DEFAULT_FPS, max_dt=0.25, high=None, low=0.6, max_decimation=4, monitor=None):
+        self.target_fps = target_fps
+        self.interval = 1.0 / target_fps if target_fps else 0.0
+        self.max_dt = max_dt
+        self.high = high if high is not None else float(os.environ.get('GESTURE_CPU_SATURATION', 0.85))
+        self.low = low
+        self.max_decimation = max_decimation
+        self.monitor = monitor or cpu_monitor
+
+        self.decimation = 1        # 每几帧推理一次
+        self.last_results = None   # 抽帧时复用的上一次识别结果
+        self._since_infer = 0
+        self._samples_seen = 0
+        self._next_due = 0.0
+        self._last_tick = None
+        self._avg_dt = None
+
+        self.paced = 0      # 因超过目标帧率丢掉的帧
+        self.decimated = 0  # 复用上次结果、跳过推理的帧
+
+    def due(self, throttle=False, now=None):
+        """这一帧要不要处理；throttle=True 时 CPU 吃紧也按抽帧间隔放慢（推理和渲染分不开的游戏）"""
+        now = time.perf_counter() if now is None else now
+        interval = self.interval * (self.decimation if throttle else 1)
+        if not interval:
+            return True
+        # 留 1/4 帧的余量，摄像头帧率和目标帧率相同时不会因为抖动误丢帧
+        if now < self._next_due - interval * 0.25:
+            self.paced += 1
+            return False
+        self._next_due = max(self._next_due, now - interval) + interval
+        return True
+
+    def _adjust(self):
+        monitor = self.monitor
+        usage = monitor.utilization()
+        if monitor.samples == self._samples_seen:
+            return
+        self._samples_seen = monitor.samples
+        if usage > self.high and self.decimation < self.max_decimation:
+            self.decimation += 1
+        elif usage < self.low and self.decimation > 1:
+            self.decimation -= 1
+
+    def should_infer(self):
+        """这一帧要不要跑推理；不跑时调用方复用 last_results"""
+        self._adjust()
+        self._since_infer += 1
+        if self.last_results is None or self._since_infer >= self.decimation:
+            self._since_infer = 0
+            return True
+        self.decimated += 1
+        return False
+
+    def tick(self, now=None):
+        """游戏每帧调用一次，返回距上一帧的真实秒数（第一帧按目标帧率算）"""
+        now = time.perf_counter() if now is None else now
+        if self._last_tick is None:
+            dt = self.interval or 1.0 / DEFAULT_FPS
+        else:
+            dt = min(self.max_dt, max(0.0, now - self._last_tick))
+        self._last_tick = now
+        self._avg_dt = dt if self._avg_dt is None else self._avg_dt * 0.9 + dt * 0.1
+        return dt
+
+    @property
+    def fps(self):
+        """游戏实际的帧率（按 tick() 间隔的滑动平均算）"""
+        return 1.0 / self._avg_dt if self._avg_dt else 0.0
+
+    def stats(self):
+        return {
+            'target_fps': self.target_fps,
+            'fps': round(self.fps, 1),
+            'decimation': self.decimation,
+            'paced': self.paced,
+            'decimated': self.decimated,
+        }
+
+
+def pacer_for(game):
+    """游戏的 FramePacer；游戏自己没有时按它的 target_fps（默认 30）建一个挂上去"""
+    if game is None:
+        return None
+    pacer = getattr(game, 'pacer', None)
+    if pacer is None:
+        pacer = FramePacer(getattr(game, 'target_fps', DEFAULT_FPS))
+        try:
+            game.pacer = pacer
+        except AttributeError:
+            return None
+    return pacer
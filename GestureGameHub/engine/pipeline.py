@@ -0,0 +1,300 @@
+# engine/pipeline.py
+"""流水线帧引擎：采集 → 推理 → 游戏逻辑/渲染 → 编码，各阶段独立线程
+
+阶段之间用有界队列连接，满了丢最旧的帧，所以慢的阶段只会跳帧而不会堆积延迟；
+不同帧的不同阶段可以同时进行，吞吐量取决于最慢的那个阶段而不是所有阶段之和。
+"""
+import threading
+import time
+import traceback
+from collections import deque
+
+from .encoder import MjpegStreamEncoder
+from .metrics import metrics
+from .pacing import pacer_for
+
+
+class DropOldestQueue:
+    """有界队列：put 从不阻塞，队列满时丢弃最旧的元素"""
+
+    def __init__(self, maxsize=1):
+        self.maxsize = maxsize
+        self._items = deque()
+        self._cond = threading.Condition()
+        self.closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        """放入元素，返回是否挤掉了旧元素"""
+        with self._cond:
+            dropped = False
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+                dropped = True
+            self._items.append(item)
+            self._cond.notify()
+            return dropped
+
+    def get(self, timeout=None):
+        """取出最旧的元素；超时或队列已关闭且为空时返回 None"""
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            while not self._items:
+                if self.closed:
+                    return None
+                if deadline is None:
+                    self._cond.wait()
+                else:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        return None
+                    self._cond.wait(remaining)
+            return self._items.popleft()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def __len__(self):
+        with self._cond:
+            return len(self._items)
+
+
+def split_stages(game):
+    """兼容层：把游戏适配器拆成 (detect, render) 两步
+
+    提供 detect(frame) + update_and_draw(frame, results) 的适配器（BaseGame 子类、
+    迷宫、跑酷、街霸）推理和渲染可以流水线并行；只有 process(frame) 的适配器
+    整体放在渲染阶段执行，行为和原来完全一样。
+    """
+    if game is None:
+        return None, lambda frame, results: frame
+    detect = getattr(game, 'detect', None)
+    update_and_draw = getattr(game, 'update_and_draw', None)
+    if callable(detect) and callable(update_and_draw):
+        return detect, update_and_draw
+    return None, lambda frame, results: game.process(frame)
+
+
+class FramePipeline:
+    """三段式帧引擎
+
+    source: 画面订阅（CameraSubscription 或任何有 read(timeout) / ended 的对象）
+    game_getter: 每帧调用一次，返回当前的游戏实例（允许中途切换游戏）
+    encode: 编码函数 encode(frame, game)，默认按游戏配置输出 MJPEG 分片
+    cpu_meter: 可选，有 charge(cpu_seconds, frame_done) 方法的对象（如 GameSession），
+               推理 / 渲染 / 编码各阶段用掉的线程 CPU 时间都会记到它名下
+    game_owner: 可选，换游戏时负责释放旧游戏的对象（如 GameSession）：启动时 attach(pipeline)，
+               渲染阶段拿到另一个游戏的帧时 rendered(pipeline, game)，stop() 时 detach(pipeline)。
+               推理阶段按顺序把帧交给渲染阶段，渲染阶段拿到新游戏的帧时旧游戏的帧都已处理完，
+               这时旧游戏才能释放检测器
+
+    推理阶段按游戏的 FramePacer（engine/pacing.py）丢掉超过目标帧率的画面（source.client_paced
+    为真时除外），CPU 吃紧时隔几帧才推理一次，中间的帧复用上一次的识别结果。
+    """
+
+    def __init__(self, source, game_getter, encode=None, queue_size=1, cpu_meter=None, game_owner=None):
+        self.source = source
+        self.game_getter = game_getter
+        self.encode = encode or MjpegStreamEncoder()
+        self.cpu_meter = cpu_meter
+        self.game_owner = game_owner
+        # 客户端自己控制发送节奏的画面源不按目标帧率丢帧
+        self.pace = not getattr(source, 'client_paced', False)
+
+        self.infer_queue = DropOldestQueue(queue_size)
+        self.render_queue = DropOldestQueue(queue_size)
+        self.encode_queue = DropOldestQueue(queue_size)
+        self.output_queue = DropOldestQueue(queue_size)
+
+        self._running = False
+        self._threads = []
+        self._stage_cache = (None, None)
+        self._rendered_game = None
+
+        self.frames_in = 0
+        self.frames_out = 0
+        self.last_latency = 0.0  # 采集完成 → 编码完成，单位秒
+
+    def start(self):
+        self._running = True
+        if self.game_owner is not None:
+            self.game_owner.attach(self)
+        workers = [
+            ('capture', self._capture_loop),
+            ('inference', self._inference_loop),
+            ('render', self._render_loop),
+            ('encode', self._encode_loop),
+        ]
+        for name, target in workers:
+            t = threading.Thread(target=target, name=f'FramePipeline-{name}', daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def _stages_for(self, game):
+        cached_game, stages = self._stage_cache
+        if stages is None or cached_game is not game:
+            stages = split_stages(game)
+            self._stage_cache = (game, stages)
+        return stages
+
+    def _charge(self, start, frame_done=False, clock=time.thread_time):
+        if self.cpu_meter is not None:
+            self.cpu_meter.charge(clock() - start, frame_done)
+
+    # --- 各阶段 ---
+    def _capture_loop(self):
+        try:
+            while self._running:
+                item = self.source.read(timeout=0.5)
+                if item is None:
+                    if self.source.ended:
+                        break
+                    continue
+                self.frames_in += 1
+                self.infer_queue.put(item)
+        finally:
+            self.infer_queue.close()
+
+    def _inference_loop(self):
+        try:
+            while self._running:
+                item = self.infer_queue.get(timeout=0.5)
+                if item is None:
+                    if self.infer_queue.closed:
+                        break
+                    continue
+                game = self.game_getter()
+                detect, _ = self._stages_for(game)
+                pacer = pacer_for(game)
+                # 超过目标帧率的画面直接丢掉；推理和渲染分不开的游戏 CPU 吃紧时也整帧跳过
+                if pacer is not None and self.pace and not pacer.due(throttle=detect is None):
+                    continue
+                results = item.results
+                # 客户端已经给出识别结果时跳过服务器端推理
+                if detect is not None and results is None:
+                    if pacer is not None and not pacer.should_infer():
+                        results = pacer.last_results
+                    else:
+                        # MediaPipe 在自己的线程里计算，本线程只是等待，所以这里按耗时计
+                        start = time.perf_counter()
+                        try:
+                            with metrics.timed('stage.inference', game):
+                                results = detect(item.frame)
+                        except Exception:
+                            traceback.print_exc()
+                            continue
+                        finally:
+                            self._charge(start, clock=time.perf_counter)
+                        if pacer is not None:
+                            pacer.last_results = results
+                self.render_queue.put((item, game, results))
+        finally:
+            self.render_queue.close()
+
+    def _render_loop(self):
+        try:
+            while self._running:
+                job = self.render_queue.get(timeout=0.5)
+                if job is None:
+                    if self.render_queue.closed:
+                        break
+                    continue
+                item, game, results = job
+                if game is not self._rendered_game:
+                    # 之前的游戏不会再有帧进来，交给会话释放
+                    self._rendered_game = game
+                    if self.game_owner is not None:
+                        self.game_owner.rendered(self, game)
+                # 用推理时的同一个游戏实例渲染，中途切换游戏也不会错配
+                detect, render = self._stages_for(game)
+                # 只有 process() 的游戏在内部调用检测器，由 RemoteDetector 交给它客户端的结果
+                remote = getattr(game, 'remote_detector', None)
+                if remote is not None and item.results is not None:
+                    remote.results = item.results
+                # 这类游戏的 MediaPipe 也在渲染阶段里跑，同样按耗时计
+                clock = time.perf_counter if detect is None and item.results is None else time.thread_time
+                cpu_start = clock()
+                try:
+                    with metrics.timed('stage.render', game):
+                        final_frame = render(item.frame, results)
+                    if metrics.overlay_enabled:
+                        metrics.draw_overlay(final_frame, game)
+                except Exception:
+                    traceback.print_exc()
+                    continue
+                finally:
+                    self._charge(cpu_start, clock=clock)
+                self.encode_queue.put((item, game, final_frame))
+        finally:
+            self.encode_queue.close()
+
+    def _encode_loop(self):
+        try:
+            while self._running:
+                job = self.encode_queue.get(timeout=0.5)
+                if job is None:
+                    if self.encode_queue.closed:
+                        break
+                    continue
+                item, game, final_frame = job
+                chunk = None
+                cpu_start = time.thread_time()
+                try:
+                    with metrics.timed('cv2.imencode', game):
+                        chunk = self.encode(final_frame, game)
+                except Exception:
+                    traceback.print_exc()
+                    continue
+                finally:
+                    self._charge(cpu_start, frame_done=chunk is not None)
+                if chunk is None:
+                    continue
+                self.last_latency = time.time() - item.timestamp
+                metrics.record('frame.latency', self.last_latency, game)
+                self.frames_out += 1
+                self.output_queue.put(chunk)
+        finally:
+            self.output_queue.close()
+
+    # --- 对外接口 ---
+    def get(self, timeout=1.0):
+        """取一份编码好的输出；超时或流水线结束返回 None"""
+        return self.output_queue.get(timeout=timeout)
+
+    @property
+    def ended(self):
+        return self.output_queue.closed and len(self.output_queue) == 0
+
+    def stop(self):
+        self._running = False
+        for q in (self.infer_queue, self.render_queue, self.encode_queue, self.output_queue):
+            q.close()
+        for t in self._threads:
+            if t is not threading.current_thread():
+                t.join(timeout=2.0)
+        self._threads = []
+        if self.game_owner is not None:
+            self.game_owner.detach(self)
+
+    def _pacer_stats(self):
+        pacer = getattr(self._stage_cache[0], 'pacer', None)
+        return pacer.stats() if pacer is not None else None
+
+    def stats(self):
+        return {
+            'frames_in': self.frames_in,
+            'frames_out': self.frames_out,
+            'dropped': {
+                'inference': self.infer_queue.dropped,
+                'render': self.render_queue.dropped,
+                'encode': self.encode_queue.dropped,
+                'output': self.output_queue.dropped,
+            },
+            'pacing': self._pacer_stats(),
+            'latency_ms': round(self.last_latency * 1000, 1),
+            'encoder': self.encode.stats() if hasattr(self.encode, 'stats') else None,
+        }
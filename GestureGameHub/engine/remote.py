@@ -0,0 +1,166 @@
+# engine/remote.py
+"""只传关键点模式：客户端在浏览器里跑 MediaPipe，服务器只收 21×3 的关键点
+
+服务器把关键点还原成和 mediapipe 一样的 results 对象（multi_hand_landmarks /
+multi_handedness / multi_face_landmarks，元素都是原生 protobuf），
+所以各游戏的 update_and_draw(frame, results)、GestureEngine.detect(results)
+不用做任何修改，也不再需要服务器端的 cvtColor + hands.process。
+
+二进制关键点包（WebSocket 二进制消息，小端）：
+    b'LMK1'
+    uint8  手的数量 n
+    n × [uint8 左右手(0=Left,1=Right)  float32 置信度  float32×63 (x,y,z)×21]
+    uint16 人脸关键点数量 m（可省略）
+    float32×3m
+坐标是归一化坐标，和服务器摄像头一样以镜像后的画面为准。
+"""
+import struct
+
+import numpy as np
+from mediapipe.framework.formats import classification_pb2, landmark_pb2
+
+MAGIC = b'LMK1'
+HAND_POINTS = 21
+HANDEDNESS = ('Left', 'Right')
+# 没有真实画面时，游戏在这个尺寸的黑色画布上渲染（和服务器摄像头的默认分辨率一致）
+DEFAULT_FRAME_SIZE = (640, 480)
+
+_HAND = struct.Struct('<Bf')
+_HAND_BYTES = _HAND.size + HAND_POINTS * 3 * 4
+
+
+class RemoteResults:
+    """和 mediapipe Hands / FaceMesh 的输出字段一致；没有检测到时字段为 None"""
+    __slots__ = ('multi_hand_landmarks', 'multi_handedness', 'multi_face_landmarks')
+
+    def __init__(self, multi_hand_landmarks=None, multi_handedness=None, multi_face_landmarks=None):
+        self.multi_hand_landmarks = multi_hand_landmarks
+        self.multi_handedness = multi_handedness
+        self.multi_face_landmarks = multi_face_landmarks
+
+
+def _landmark_list(points):
+    lms = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z in points:
+        lms.landmark.add(x=x, y=y, z=z)
+    return lms
+
+
+def build_results(hands=(), face=None):
+    """关键点 → results
+
+    hands: [(points(21×3), handedness 'Left'/'Right', score), ...]
+    face: 人脸关键点 (m×3)，可选
+    """
+    multi_hand_landmarks = multi_handedness = multi_face_landmarks = None
+    if hands:
+        multi_hand_landmarks, multi_handedness = [], []
+        for index, (points, label, score) in enumerate(hands):
+            points = np.asarray(points, dtype=np.float64).reshape(HAND_POINTS, 3).tolist()
+            multi_hand_landmarks.append(_landmark_list(points))
+            cls = classification_pb2.ClassificationList()
+            cls.classification.add(index=index, score=float(score), label=label)
+            multi_handedness.append(cls)
+    if face is not None and len(face):
+        points = np.asarray(face, dtype=np.float64).reshape(-1, 3).tolist()
+        multi_face_landmarks = [_landmark_list(points)]
+    return RemoteResults(multi_hand_landmarks, multi_handedness, multi_face_landmarks)
+
+
+def is_landmark_packet(data):
+    return data[:4] == MAGIC
+
+
+def parse_packet(data):
+    """二进制关键点包 → results；格式不对时抛 ValueError"""
+    data = memoryview(data)
+    if bytes(data[:4]) != MAGIC or len(data) < 5:
+        raise ValueError('not a landmark packet')
+    count = data[4]
+    offset = 5
+    if len(data) < offset + count * _HAND_BYTES:
+        raise ValueError('truncated landmark packet')
+    hands = []
+    for _ in range(count):
+        side, score = _HAND.unpack_from(data, offset)
+        points = np.frombuffer(data, dtype='<f4', count=HAND_POINTS * 3, offset=offset + _HAND.size)
+        hands.append((points, HANDEDNESS[side & 1], score))
+        offset += _HAND_BYTES
+    face = None
+    if len(data) >= offset + 2:
+        (m,) = struct.unpack_from('<H', data, offset)
+        offset += 2
+        if len(data) < offset + m * 12:
+            raise ValueError('truncated landmark packet')
+        face = np.frombuffer(data, dtype='<f4', count=m * 3, offset=offset)
+    return build_results(hands, face)
+
+
+def encode_packet(hands=(), face=None):
+    """results 的反向操作，测试和压测客户端用"""
+    parts = [MAGIC, bytes([len(hands)])]
+    for points, label, score in hands:
+        parts.append(_HAND.pack(HANDEDNESS.index(label), score))
+        parts.append(np.asarray(points, dtype='<f4').reshape(-1).tobytes())
+    if face is not None:
+        face = np.asarray(face, dtype='<f4').reshape(-1)
+        parts.append(struct.pack('<H', len(face) // 3))
+        parts.append(face.tobytes())
+    return b''.join(parts)
+
+
+def parse_json(msg):
+    """JSON 形式：{"hands": [{"landmarks": [[x,y,z]×21], "handedness": "Right", "score": 0.9}], "face": [[x,y,z], ...]}"""
+    hands = [(h['landmarks'], h.get('handedness', 'Right'), h.get('score', 1.0))
+             for h in msg.get('hands') or []]
+    return build_results(hands, msg.get('face'))
+
+
+class RemoteDetector:
+    """代替 mp Hands / FaceMesh：process() 直接返回客户端发来的 results"""
+
+    def __init__(self):
+        self.results = RemoteResults()
+
+    def process(self, image):
+        return self.results
+
+    def reset(self):
+        self.results = RemoteResults()
+
+    def close(self):
+        pass
+
+
+# 各游戏持有检测器的属性名
+DETECTOR_ATTRS = ('hands', 'hands_detector', 'face_mesh')
+
+
+def use_remote_detection(game):
+    """把游戏的检测器换成 RemoteDetector，原来的检测器保存起来以便恢复"""
+    if game is None or getattr(game, 'remote_detector', None) is not None:
+        return getattr(game, 'remote_detector', None)
+    remote = RemoteDetector()
+    saved = {}
+    for attr in DETECTOR_ATTRS:
+        if getattr(game, attr, None) is not None:
+            saved[attr] = getattr(game, attr)
+            setattr(game, attr, remote)
+    game._local_detectors = saved
+    game.remote_detector = remote
+    return remote
+
+
+def restore_local_detection(game):
+    if game is None or getattr(game, 'remote_detector', None) is None:
+        return
+    for attr, detector in game._local_detectors.items():
+        setattr(game, attr, detector)
+    game._local_detectors = {}
+    game.remote_detector = None
+
+
+def blank_frame(frame_size=DEFAULT_FRAME_SIZE):
+    """只传关键点时给游戏用的画布；游戏会直接在上面绘制，所以每帧一张新的"""
+    w, h = frame_size
+    return np.zeros((h, w, 3), dtype=np.uint8)
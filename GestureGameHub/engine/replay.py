@@ -0,0 +1,303 @@
+# engine/replay.py
+"""录制 / 回放：摄像头画面 + MediaPipe 结果录一次，之后不用摄像头、不 sleep，按最快速度喂给任意游戏
+
+录制文件是一个 .npz（np.load 不需要 pickle）：
+    timestamps     (n,) float64   每帧相对第一帧的秒数
+    packets        uint8          每帧识别结果，格式和只传关键点模式的二进制包一致（engine/remote.py）
+    packet_offsets (n+1,) int64
+    frames         uint8          每帧 JPEG（只录关键点时为空，回放用黑色画布）
+    frame_offsets  (n+1,) int64
+    frame_size     (w, h)
+
+回放时游戏的检测器换成 RemoteDetector（和只传关键点模式一样），直接拿到录下的结果；
+detect=True 时保留游戏自己的检测器，在录下的画面上重新跑 MediaPipe。游戏的 FramePacer 换成
+ReplayPacer，按录制时的时间戳推进游戏时间；random / np.random 每个游戏开始前重置种子。
+游戏逻辑直接读 time.time() / pygame 时钟的部分（冷却、倒计时、动画）仍按真实时间走，
+这些游戏两次回放的画面不保证逐帧一致，但输入和耗时统计是可复现的。
+
+录制：python -m engine.replay record out.npz [--source webcam] [--frames 300]
+回放所有游戏：python benchmarks/bench_replay.py [out.npz]
+"""
+import argparse
+import random
+import time
+
+import cv2
+import numpy as np
+
+from .metrics import metrics, game_label
+from .pacing import FramePacer
+from .remote import DEFAULT_FRAME_SIZE, blank_frame, encode_packet, parse_packet, use_remote_detection
+from .warmup import process_memory_mb
+
+FORMAT_VERSION = 1
+
+
+def results_to_packet(results):
+    """results → 二进制关键点包（所有手 + 第一张脸）"""
+    from games.landmarks import LandmarkFrame
+
+    frame = LandmarkFrame(results)
+    hands = [(frame.hands[i], side if side in ('Left', 'Right') else 'Right', float(score))
+             for i, (side, score) in enumerate(zip(frame.handedness, frame.scores))]
+    face = frame.faces[0] if len(frame.faces) else None
+    return encode_packet(hands, face)
+
+
+def _pack(chunks):
+    offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(c) for c in chunks])
+    return np.frombuffer(b''.join(chunks), dtype=np.uint8), offsets
+
+
+class Recording:
+    """内存里的一段录制；append() 录入，save() / load() 读写 .npz"""
+
+    def __init__(self, frame_size=DEFAULT_FRAME_SIZE, jpeg_quality=90):
+        self.frame_size = tuple(frame_size)
+        self.jpeg_quality = jpeg_quality
+        self.timestamps = []
+        self.packets = []
+        self.jpegs = []
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @property
+    def has_frames(self):
+        return any(len(j) for j in self.jpegs)
+
+    @property
+    def duration(self):
+        return self.timestamps[-1] if self.timestamps else 0.0
+
+    def append(self, frame=None, results=None, timestamp=None, packet=None):
+        """录入一帧；frame 为 None 时只录关键点，packet 给定时直接用（不用再从 results 转换）"""
+        if timestamp is None:
+            timestamp = len(self.timestamps) / 30.0
+        self.timestamps.append(float(timestamp))
+        self.packets.append(packet if packet is not None else results_to_packet(results))
+        jpeg = b''
+        if frame is not None:
+            self.frame_size = (frame.shape[1], frame.shape[0])
+            ok, buf = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+            jpeg = buf.tobytes() if ok else b''
+        self.jpegs.append(jpeg)
+
+    def frame(self, i):
+        """第 i 帧画面（每次都是新数组，游戏可以直接在上面画）"""
+        if self.jpegs[i]:
+            return cv2.imdecode(np.frombuffer(self.jpegs[i], dtype=np.uint8), cv2.IMREAD_COLOR)
+        return blank_frame(self.frame_size)
+
+    def results(self, i):
+        return parse_packet(self.packets[i])
+
+    def save(self, path):
+        path = str(path) if str(path).endswith('.npz') else f"{path}.npz"  # 和 np.savez 的命名一致
+        packets, packet_offsets = _pack(self.packets)
+        frames, frame_offsets = _pack(self.jpegs)
+        np.savez(path, version=np.int32(FORMAT_VERSION), timestamps=np.array(self.timestamps, dtype=np.float64),
+                 packets=packets, packet_offsets=packet_offsets, frames=frames, frame_offsets=frame_offsets,
+                 frame_size=np.array(self.frame_size, dtype=np.int32))
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version']) != FORMAT_VERSION:
+                raise ValueError(f"unsupported recording format {int(data['version'])}")
+            rec = cls(tuple(int(v) for v in data['frame_size']))
+            packets, frames = data['packets'].tobytes(), data['frames'].tobytes()
+            po, fo = data['packet_offsets'], data['frame_offsets']
+            rec.timestamps = data['timestamps'].tolist()
+            rec.packets = [packets[po[i]:po[i + 1]] for i in range(len(po) - 1)]
+            rec.jpegs = [frames[fo[i]:fo[i + 1]] for i in range(len(fo) - 1)]
+        return rec
+
+
+def record(source, frames=300, mirror=True, face=True, hands_options=None):
+    """从画面源录制：每帧跑一次 Hands（最多两只手）和 FaceMesh，画面和服务器摄像头一样先镜像"""
+    import mediapipe as mp
+    from .remote import RemoteResults
+
+    hands = mp.solutions.hands.Hands(**(hands_options or {'max_num_hands': 2, 'min_detection_confidence': 0.5}))
+    face_mesh = mp.solutions.face_mesh.FaceMesh(refine_landmarks=True) if face else None
+    rec = Recording()
+    if hasattr(source, 'open') and source.open() is False:
+        raise RuntimeError("画面源打开失败")
+    start = time.perf_counter()
+    try:
+        while len(rec) < frames:
+            ok, frame = source.read()
+            if not ok or frame is None:
+                break
+            if mirror:
+                frame = cv2.flip(frame, 1)
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            hand_results = hands.process(rgb)
+            face_results = face_mesh.process(rgb) if face_mesh is not None else None
+            results = RemoteResults(hand_results.multi_hand_landmarks, hand_results.multi_handedness,
+                                    getattr(face_results, 'multi_face_landmarks', None))
+            rec.append(frame, results, time.perf_counter() - start)
+    finally:
+        source.release()
+        hands.close()
+        if face_mesh is not None:
+            face_mesh.close()
+    return rec
+
+
+def _hand_points(t, phase):
+    """合成的一只手：手腕在画面里绕圈，五根手指轮流伸出 / 弯曲"""
+    cx, cy = 0.5 + 0.2 * np.cos(t * 0.8 + phase), 0.55 + 0.15 * np.sin(t * 1.1 + phase)
+    points = np.zeros((21, 3))
+    points[0] = (cx, cy, 0.0)
+    for finger, dx in enumerate((-0.07, -0.03, 0.0, 0.025, 0.05)):
+        extended = np.sin(t * 2.0 + finger + phase) > -0.2
+        base = np.array([cx + dx, cy - 0.09, -0.01])
+        for joint in range(4):
+            if extended:
+                offset = (dx * 0.3 * joint, -0.035 * joint, -0.005 * joint)
+            else:
+                offset = (dx * 0.1, -0.02 + 0.025 * joint, -0.01 * joint)
+            points[1 + finger * 4 + joint] = base + offset
+    return points
+
+
+def _face_points(t, template):
+    """合成的人脸：468 个点，头左右转、上下点头（鼻尖、眼角、下巴、额头的位置和 FaceMesh 一致）"""
+    yaw, pitch = 0.08 * np.sin(t * 0.9), 0.05 * np.sin(t * 0.6)
+    points = template.copy()
+    points[:, 0] += 0.5 + yaw * (0.5 - points[:, 2] * 5)
+    points[:, 1] += 0.45 + pitch * (0.5 - points[:, 2] * 5)
+    return points
+
+
+def synthetic_recording(frames=120, fps=30, hands=2, face=True, seed=0):
+    """不需要摄像头的合成录制（只有关键点），CI 和没有录像时的回放测试用"""
+    rng = np.random.default_rng(seed)
+    template = np.column_stack([rng.normal(0, 0.07, 468), rng.normal(0, 0.09, 468), rng.normal(0, 0.01, 468)])
+    for index, point in {1: (0, 0, -0.05), 33: (-0.05, -0.04, 0), 263: (0.05, -0.04, 0),
+                         152: (0, 0.11, 0), 10: (0, -0.11, 0)}.items():
+        template[index] = point
+    rec = Recording()
+    for i in range(frames):
+        t = i / fps
+        hand_list = [(_hand_points(t, phase), side, 0.9)
+                     for phase, side in zip((0.0, np.pi), ('Right', 'Left'))][:hands]
+        packet = encode_packet(hand_list, _face_points(t, template) if face else None)
+        rec.append(timestamp=t, packet=packet)
+    return rec
+
+
+class ReplayPacer(FramePacer):
+    """按录制的时间戳推进游戏时间：回放得再快，游戏看到的 dt 也和录制时一样"""
+
+    def __init__(self, target_fps, clock):
+        super().__init__(target_fps)
+        self.clock = clock
+
+    def tick(self, now=None):
+        return super().tick(self.clock() if now is None else now)
+
+
+def replay_game(factory, name, recording, detect=False, warmup=3, seed=0, digest=False):
+    """把录制逐帧喂给一个游戏的 process()，返回帧率、各阶段耗时和内存
+
+    factory(name) 创建游戏实例（和 app.get_game_instance 一样）；前 warmup 帧不计入帧率。
+    digest=True 时额外返回所有输出画面的摘要，用来确认两次回放结果一致。
+    """
+    import hashlib
+
+    random.seed(seed)
+    np.random.seed(seed)
+    mem_before = process_memory_mb()
+    created = time.perf_counter()
+    game = factory(name)
+    if game is None:
+        raise ValueError(f"unknown game: {name}")
+    create_s = time.perf_counter() - created
+    mem_loaded = process_memory_mb()
+
+    remote = None if detect else use_remote_detection(game)
+    index = [0]
+    if getattr(game, 'pacer', None) is not None:
+        game.pacer = ReplayPacer(game.pacer.target_fps, lambda: recording.timestamps[index[0]])
+
+    label = game_label(game)
+    metrics.reset()
+    hasher = hashlib.blake2b(digest_size=16) if digest else None
+    frame_ms = []
+    mem_peak = mem_loaded or 0.0
+    try:
+        for i in range(len(recording)):
+            index[0] = i
+            frame = recording.frame(i)
+            if remote is not None:
+                remote.results = recording.results(i)
+            start = time.perf_counter()
+            output = game.process(frame)
+            frame_ms.append((time.perf_counter() - start) * 1000.0)
+            if hasher is not None and output is not None:
+                hasher.update(np.ascontiguousarray(output).data)
+            if i % 10 == 0:
+                mem_peak = max(mem_peak, process_memory_mb() or 0.0)
+        stages = metrics.snapshot(label).get(label, {})
+    finally:
+        if hasattr(game, 'close'):
+            game.close()
+
+    timed = np.array(frame_ms[warmup:] or frame_ms)
+    report = {
+        'game': name,
+        'frames': len(frame_ms),
+        'detect': detect,
+        'create_s': round(create_s, 3),
+        'fps': round(1000.0 / timed.mean(), 1) if len(timed) else 0.0,
+        'frame_ms': {'mean': round(float(timed.mean()), 3), 'p50': round(float(np.percentile(timed, 50)), 3),
+                     'p95': round(float(np.percentile(timed, 95)), 3)} if len(timed) else {},
+        'stages': stages,
+        'memory_mb': {'before': mem_before, 'loaded': mem_loaded, 'peak': mem_peak},
+    }
+    if hasher is not None:
+        report['digest'] = hasher.hexdigest()
+    return report
+
+
+def replay_all(factory, names, recording, **kwargs):
+    """依次回放多个游戏；某个游戏出错时记录错误，继续下一个"""
+    reports = []
+    for name in names:
+        try:
+            reports.append(replay_game(factory, name, recording, **kwargs))
+        except Exception as e:
+            reports.append({'game': name, 'error': f"{type(e).__name__}: {e}"})
+    return reports
+
+
+def main():
+    from .sources import open_source
+
+    parser = argparse.ArgumentParser(description="录制画面和识别结果，供 benchmarks/bench_replay.py 回放")
+    sub = parser.add_subparsers(dest='command', required=True)
+    rec = sub.add_parser('record')
+    rec.add_argument('output')
+    rec.add_argument('--source', default=None, help="画面源，格式同 GESTURE_CAMERA（webcam / file:a.mp4）")
+    rec.add_argument('--frames', type=int, default=300)
+    rec.add_argument('--no-face', action='store_true', help="不跑 FaceMesh（跑酷游戏回放时没有人脸）")
+    syn = sub.add_parser('synthetic')
+    syn.add_argument('output')
+    syn.add_argument('--frames', type=int, default=120)
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        recording = record(open_source(args.source), args.frames, face=not args.no_face)
+    else:
+        recording = synthetic_recording(args.frames)
+    recording.save(args.output)
+    print(f"{len(recording)} frames, {recording.duration:.1f}s -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
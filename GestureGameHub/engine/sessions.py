@@ -0,0 +1,251 @@
+# engine/sessions.py
+"""多会话：每个浏览器会话有自己的游戏实例，互不干扰
+
+- 会话按 LRU 排序，超过上限时淘汰最久未用的会话
+- 空闲超过 idle_timeout 秒的会话在下次访问管理器时被回收
+- 每个会话统计自己消耗的 CPU 时间（渲染、编码线程的 thread_time，加上 MediaPipe 推理的耗时）
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from .capture import CapturedFrame
+from .remote import restore_local_detection
+
+
+def release_game(game):
+    """释放游戏实例持有的 MediaPipe 等资源"""
+    if game is None:
+        return
+    try:
+        # 只传关键点模式下检测器被替换过，先换回来才能释放真正的检测器
+        restore_local_detection(game)
+        if hasattr(game, 'close'):
+            game.close()
+            return
+        for attr in ('hands', 'hands_detector', 'face_mesh'):
+            detector = getattr(game, attr, None)
+            if detector is not None and hasattr(detector, 'close'):
+                detector.close()
+    except Exception as e:
+        print(f">>> [Session] 释放游戏资源出错: {e}")
+
+
+class UploadSource:
+    """客户端上传的画面：只保留最新一帧，接口和 CameraSubscription 一致"""
+
+    # 帧率由客户端控制（WebSocket 按信用额度发送），流水线不按目标帧率丢帧，否则客户端等不到回应
+    client_paced = True
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._latest = None
+        self._seq = 0
+        self.last_seq = None
+        self.closed = False
+
+    def push(self, frame, results=None):
+        """放入新帧（results: 客户端已经算好的识别结果，可选），返回是否覆盖了一帧还没被读走的旧帧"""
+        with self._cond:
+            overwritten = self._latest is not None and (
+                self.last_seq is None or self._latest.seq > self.last_seq)
+            self._seq += 1
+            self._latest = CapturedFrame(self._seq, time.time(), frame, results)
+            self._cond.notify_all()
+            return overwritten
+
+    def read(self, timeout=1.0, copy=False):
+        deadline = time.time() + timeout
+        with self._cond:
+            while not self.closed:
+                item = self._latest
+                if item is not None and (self.last_seq is None or item.seq > self.last_seq):
+                    self.last_seq = item.seq
+                    return item
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            return None
+
+    @property
+    def ended(self):
+        return self.closed
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class GameSession:
+    def __init__(self, session_id):
+        self.id = session_id
+        self.game_name = None
+        self.game = None
+        self.upload = UploadSource()
+        self.created = time.time()
+        self.last_active = self.created
+        self.closed = False
+
+        self._lock = threading.Lock()
+        self.cpu_seconds = 0.0
+        self.frames = 0
+
+        # 换下来的游戏：流水线里可能还有它的帧，等用到它的流水线都处理完再释放
+        self._pipelines = set()
+        self._retired = []  # [(game, 还可能用到它的流水线), ...]
+
+    def touch(self):
+        self.last_active = time.time()
+
+    def set_game(self, game_name, game):
+        with self._lock:
+            old = self.game
+            self.game_name = game_name
+            self.game = game
+            self._retired = [entry for entry in self._retired if entry[0] is not game]
+            if old is not None and old is not game and self._pipelines:
+                self._retired.append((old, set(self._pipelines)))
+                old = None
+        self.touch()
+        if old is not None and old is not game:
+            release_game(old)
+
+    # --- 流水线回调（FramePipeline 的 game_owner）---
+    def attach(self, pipeline):
+        with self._lock:
+            self._pipelines.add(pipeline)
+
+    def rendered(self, pipeline, game):
+        """pipeline 开始渲染 game 的帧：之前换下来的游戏它都不会再用了"""
+        self._release_retired(pipeline, keep=game)
+
+    def detach(self, pipeline):
+        with self._lock:
+            self._pipelines.discard(pipeline)
+        self._release_retired(pipeline)
+
+    def _release_retired(self, pipeline, keep=None):
+        done = []
+        with self._lock:
+            for game, pending in self._retired:
+                if game is not keep:
+                    pending.discard(pipeline)
+                if not pending:
+                    done.append(game)
+            self._retired = [entry for entry in self._retired if entry[1]]
+        for game in done:
+            release_game(game)
+
+    def charge(self, cpu_seconds, frame_done=False):
+        """流水线各阶段回调：累计本会话消耗的 CPU 时间"""
+        with self._lock:
+            self.cpu_seconds += cpu_seconds
+            if frame_done:
+                self.frames += 1
+        self.last_active = time.time()
+
+    def close(self):
+        self.closed = True
+        self.upload.close()
+        with self._lock:
+            game, self.game = self.game, None
+            retired, self._retired = [g for g, _ in self._retired], []
+        for old in retired + [game]:
+            release_game(old)
+
+    def stats(self):
+        now = time.time()
+        with self._lock:
+            cpu, frames = self.cpu_seconds, self.frames
+        pacer = getattr(self.game, 'pacer', None)
+        tracker = getattr(self.game, 'tracker', None)
+        roi = getattr(self.game, 'roi', None)
+        return {
+            'id': self.id[:8],
+            'game': self.game_name,
+            'age_s': round(now - self.created, 1),
+            'idle_s': round(now - self.last_active, 1),
+            'frames': frames,
+            'cpu_s': round(cpu, 3),
+            'cpu_ms_per_frame': round(cpu * 1000 / frames, 2) if frames else None,
+            'pacing': pacer.stats() if pacer is not None else None,
+            'tracking': tracker.stats() if tracker is not None else None,
+            'roi': roi.stats() if roi is not None else None,
+        }
+
+
+class SessionManager:
+    """按会话 id 管理游戏实例，带 LRU 上限和空闲回收"""
+
+    def __init__(self, game_factory, max_sessions=8, idle_timeout=300.0):
+        self.game_factory = game_factory
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()
+
+    def get(self, session_id, create=True):
+        evicted = []
+        with self._lock:
+            evicted += self._collect_idle()
+            session = self._sessions.get(session_id)
+            if session is None and create:
+                session = self._sessions[session_id] = GameSession(session_id)
+                while len(self._sessions) > self.max_sessions:
+                    _, old = self._sessions.popitem(last=False)
+                    evicted.append(old)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+                session.touch()
+        # 释放资源可能比较慢，放在锁外面做
+        for old in evicted:
+            old.close()
+        return session
+
+    def start_game(self, session_id, game_name):
+        """为会话创建（或替换）游戏实例；游戏不存在时返回 None"""
+        game = self.game_factory(game_name)
+        if game is None:
+            return None
+        session = self.get(session_id)
+        session.set_game(game_name, game)
+        return session
+
+    def ensure_game(self, session_id, game_name):
+        """会话还没有游戏（或游戏不同）时才创建"""
+        session = self.get(session_id)
+        if game_name and (session.game is None or session.game_name != game_name):
+            return self.start_game(session_id, game_name) or session
+        return session
+
+    def remove(self, session_id):
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is not None:
+            session.close()
+
+    def _collect_idle(self):
+        if not self.idle_timeout:
+            return []
+        now = time.time()
+        idle = [sid for sid, s in self._sessions.items() if now - s.last_active > self.idle_timeout]
+        return [self._sessions.pop(sid) for sid in idle]
+
+    def evict_idle(self):
+        with self._lock:
+            evicted = self._collect_idle()
+        for old in evicted:
+            old.close()
+        return len(evicted)
+
+    def stats(self):
+        self.evict_idle()
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return {
+            'max_sessions': self.max_sessions,
+            'idle_timeout': self.idle_timeout,
+            'sessions': [s.stats() for s in sessions],
+        }
@@ -0,0 +1,139 @@
+# engine/sources.py
+"""画面源：统一 open() / read() / release() 接口，方便用视频文件或合成画面替代真实摄像头"""
+import os
+import time
+import cv2
+import numpy as np
+
+
+class WebcamSource:
+    """本地摄像头"""
+
+    def __init__(self, index=0):
+        self.index = index
+        self.cap = None
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.index)
+        # 驱动端只保留 1 帧缓冲，避免读到排队的旧画面
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return self.cap.isOpened()
+
+    def read(self):
+        if self.cap is None:
+            return False, None
+        return self.cap.read()
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class VideoFileSource:
+    """视频文件：按文件自身帧率播放，loop=True 时循环播放"""
+
+    def __init__(self, path, loop=True, realtime=True):
+        self.path = path
+        self.loop = loop
+        self.realtime = realtime
+        self.cap = None
+        self.frame_interval = 0.0
+        self.next_time = 0.0
+
+    def open(self):
+        if not os.path.exists(self.path):
+            return False
+        self.cap = cv2.VideoCapture(self.path)
+        fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
+        self.frame_interval = 1.0 / fps if self.realtime else 0.0
+        self.next_time = time.time()
+        return self.cap.isOpened()
+
+    def read(self):
+        if self.cap is None:
+            return False, None
+        success, frame = self.cap.read()
+        if not success and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, frame = self.cap.read()
+        if success and self.frame_interval:
+            delay = self.next_time - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            self.next_time = max(self.next_time, time.time() - 1.0) + self.frame_interval
+        return success, frame
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class SyntheticSource:
+    """合成画面源：无摄像头 / CI 环境下使用
+
+    fps 为 None 时不限速，尽可能快地产生帧；max_frames 到达后 read() 返回 False。
+    """
+
+    def __init__(self, width=640, height=480, fps=30, max_frames=None):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.max_frames = max_frames
+        self.count = 0
+        self.next_time = 0.0
+
+    def open(self):
+        self.count = 0
+        self.next_time = time.time()
+        return True
+
+    def read(self):
+        if self.max_frames is not None and self.count >= self.max_frames:
+            return False, None
+        if self.fps:
+            # 模拟摄像头的出帧节奏（只会阻塞采集线程）
+            delay = self.next_time - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            self.next_time = max(self.next_time, time.time() - 1.0) + 1.0 / self.fps
+
+        frame = np.full((self.height, self.width, 3), 60, dtype=np.uint8)
+        # 一个左右移动的方块，便于肉眼确认画面在刷新
+        size = self.height // 6
+        x = int((self.count * 8) % max(1, self.width - size))
+        y = (self.height - size) // 2
+        frame[y:y + size, x:x + size] = (0, 200, 255)
+        cv2.putText(frame, f"#{self.count}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+        self.count += 1
+        return True, frame
+
+    def release(self):
+        pass
+
+
+def open_source(spec=None):
+    """根据描述字符串创建画面源
+
+    - "webcam" / "webcam:1"          本地摄像头（默认 0 号）
+    - "file:/path/to/video.mp4"      视频文件，循环播放
+    - "synthetic" / "synthetic:1280x720@30"  合成画面
+    未指定时读取环境变量 GESTURE_CAMERA，再默认使用 0 号摄像头。
+    """
+    spec = spec or os.environ.get('GESTURE_CAMERA') or 'webcam'
+    kind, _, arg = spec.partition(':')
+    if kind == 'webcam':
+        return WebcamSource(int(arg) if arg else 0)
+    if kind == 'file':
+        return VideoFileSource(arg)
+    if kind == 'synthetic':
+        width, height, fps = 640, 480, 30
+        if arg:
+            size, _, rate = arg.partition('@')
+            if size:
+                width, height = (int(v) for v in size.lower().split('x'))
+            if rate:
+                fps = int(rate) or None
+        return SyntheticSource(width, height, fps)
+    raise ValueError(f"未知的画面源: {spec}")
@@ -0,0 +1,166 @@
+# engine/warmup.py
+"""游戏预加载：在后台线程提前创建游戏实例，切换游戏时直接拿走用
+
+创建一个游戏要导入模块（torch 等）、加载模型和素材、初始化 MediaPipe 图，
+原来这些都发生在 /play 请求线程里，第一帧要等它们全部完成。
+
+- preload(name): 后台创建一个实例放进就绪列表（同一游戏最多一个，已就绪或正在创建时不重复）
+- take(name): 取走就绪的实例（没有则返回 None），并在后台为下一位玩家补一个；
+  游戏有 on_attach() 时先调用它，重置构造时按时间初始化的状态
+- 就绪实例数超过 max_ready，或进程内存超过 memory_limit_mb 时，淘汰最久未被请求的实例
+"""
+import os
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .metrics import metrics
+from .remote import DETECTOR_ATTRS
+from .sessions import release_game
+
+try:
+    import psutil
+except ImportError:  # 可选依赖：没有 psutil 时读取 /proc
+    psutil = None
+
+# 预热 MediaPipe 图用的空白图片（首帧要初始化推理引擎，比平时慢好几倍）
+_BLANK = np.zeros((64, 64, 3), dtype=np.uint8)
+
+
+def process_memory_mb():
+    """当前进程的常驻内存（MB），拿不到时返回 None"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 2 ** 20
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def warm_detectors(game):
+    """让游戏的检测器先处理一帧，把推理引擎的初始化提前做掉"""
+    for attr in DETECTOR_ATTRS:
+        detector = getattr(game, attr, None)
+        if detector is not None and hasattr(detector, 'process'):
+            detector.process(_BLANK)
+
+
+class GamePreloader:
+    def __init__(self, factory, max_ready=4, memory_limit_mb=2048, workers=1):
+        self.factory = factory
+        self.max_ready = max_ready
+        self.memory_limit_mb = memory_limit_mb
+        self._lock = threading.Lock()
+        self._ready = OrderedDict()  # name -> (game, 就绪时间)
+        self._pending = set()
+        # 一个后台线程就够了，不和正在跑的游戏抢 CPU
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='GamePreloader')
+
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+
+    def _over_memory(self):
+        if not self.memory_limit_mb:
+            return False
+        used = process_memory_mb()
+        return used is not None and used > self.memory_limit_mb
+
+    def preload(self, name):
+        """后台预加载一个游戏；返回是否真的安排了任务"""
+        with self._lock:
+            if name in self._ready:
+                self._ready.move_to_end(name)
+                return False
+            if name in self._pending:
+                return False
+            self._pending.add(name)
+        self._executor.submit(self._build, name)
+        return True
+
+    def _build(self, name):
+        game = None
+        try:
+            if self._over_memory():
+                # 内存不够时先腾出最旧的实例，还不够就放弃
+                self._evict(1)
+                if self._over_memory():
+                    self.skipped += 1
+                    print(f">>> [Preload] 内存超过 {self.memory_limit_mb}MB，跳过预加载 {name}")
+                    return
+            with metrics.timed(f'preload.{name}'):
+                game = self.factory(name)
+                if game is not None:
+                    warm_detectors(game)
+        except Exception:
+            traceback.print_exc()
+        finally:
+            with self._lock:
+                self._pending.discard(name)
+                if game is not None:
+                    self._ready[name] = (game, time.time())
+                    game = None
+                over = len(self._ready) - self.max_ready
+        if over > 0:
+            self._evict(over)
+
+    def _evict(self, count):
+        with self._lock:
+            victims = [self._ready.popitem(last=False)[1][0] for _ in range(min(count, len(self._ready)))]
+        for game in victims:
+            release_game(game)
+
+    def take(self, name, replenish=True):
+        """取走预加载好的实例；没有时返回 None（调用方自己创建）"""
+        with self._lock:
+            entry = self._ready.pop(name, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if replenish:
+            self.preload(name)
+        game = entry[0]
+        # 实例是提前建好的，构造时记下的时间（倒计时等）已经过期，交给玩家前让游戏重置一下
+        on_attach = getattr(game, 'on_attach', None)
+        if on_attach is not None:
+            on_attach()
+        return game
+
+    def wait(self, name, timeout=30.0):
+        """等待某个游戏预加载完成（基准测试和测试用）"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self._lock:
+                if name in self._ready:
+                    return True
+                if name not in self._pending:
+                    return False
+            time.sleep(0.01)
+        return False
+
+    def clear(self):
+        self._evict(len(self._ready))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+        self.clear()
+
+    def stats(self):
+        mem = process_memory_mb()
+        with self._lock:
+            return {
+                'ready': list(self._ready),
+                'pending': sorted(self._pending),
+                'hits': self.hits,
+                'misses': self.misses,
+                'skipped': self.skipped,
+                'max_ready': self.max_ready,
+                'memory_mb': round(mem, 1) if mem is not None else None,
+                'memory_limit_mb': self.memory_limit_mb,
+            }
@@ -0,0 +1,167 @@
+# engine/ws_ingest.py
+"""WebSocket 接入：浏览器用 getUserMedia 采集画面并上传，服务器处理后从同一连接发回
+
+协议（一条连接对应一个游戏会话）：
+- 客户端 → 服务器，二进制消息：一帧 JPEG 画面，或以 b'LMK1' 开头的关键点包（见 remote.py）
+- 客户端 → 服务器，文本消息：JSON 控制指令，如 {"type": "start"}；
+  或 JSON 形式的关键点 {"type": "landmarks", "hands": [...]}
+- 服务器 → 客户端，二进制消息：渲染好的一帧 JPEG
+- 服务器 → 客户端，文本消息：JSON，如 {"type": "hello", "credits": 2}、{"type": "credit"}
+
+背压：客户端最多同时有 credits 帧在途，每收到一帧结果（或被丢弃的 credit 通知）才补回一个额度；
+服务器端只保留最新一帧输入（UploadSource）和最新一帧输出（流水线队列），
+客户端再慢也不会在服务器上堆积帧。
+"""
+import json
+import threading
+
+import cv2
+import numpy as np
+
+from .encoder import MjpegStreamEncoder
+from .pipeline import FramePipeline
+from .remote import (DEFAULT_FRAME_SIZE, blank_frame, is_landmark_packet, parse_json, parse_packet,
+                     restore_local_detection, use_remote_detection)
+
+# 客户端允许的在途帧数：2 帧可以让上传和处理重叠，又不会积压
+DEFAULT_CREDITS = 2
+
+
+def decode_frame(data):
+    """JPEG/PNG 字节 → BGR 画面；解码失败返回 None"""
+    if not data:
+        return None
+    return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+
+
+class SocketSession:
+    """把一条 WebSocket 连接接到某个游戏会话上
+
+    ws: 有 send(data) / receive(timeout) 的连接对象（flask-sock / simple-websocket）
+    session: GameSession，帧推到 session.upload，CPU 时间记到会话名下
+    """
+
+    def __init__(self, ws, session, credits=DEFAULT_CREDITS, on_control=None,
+                 frame_size=DEFAULT_FRAME_SIZE):
+        self.ws = ws
+        self.session = session
+        self.credits = credits
+        self.on_control = on_control
+        self.frame_size = frame_size
+
+        self.pipeline = None
+        self._closed = threading.Event()
+        self._sender = None
+        # 结果帧由发送线程发，credit / stats / 控制回复由接收线程发；
+        # simple-websocket 的 send 不是线程安全的（wsproto 状态 + 分段写 socket），所有发送都要串行
+        self._send_lock = threading.Lock()
+
+        self.frames_received = 0
+        self.frames_rejected = 0
+        self.frames_dropped = 0
+        self.frames_sent = 0
+
+    def _send(self, data):
+        with self._send_lock:
+            self.ws.send(data)
+
+    def _send_loop(self):
+        try:
+            while not self._closed.is_set():
+                data = self.pipeline.get(timeout=0.5)
+                if data is None:
+                    if self.pipeline.ended:
+                        break
+                    continue
+                self._send(data)
+                self.frames_sent += 1
+        except Exception:
+            # 连接已断开
+            pass
+        finally:
+            self._closed.set()
+
+    def _push(self, frame, results=None):
+        game = self.session.game
+        if results is not None:
+            use_remote_detection(game)
+        else:
+            restore_local_detection(game)
+        self.frames_received += 1
+        if self.session.upload.push(frame, results):
+            # 旧帧没处理就被覆盖了，不会有对应的结果帧，直接退还额度
+            self.frames_dropped += 1
+            self._send(json.dumps({'type': 'credit'}))
+
+    def handle_message(self, message):
+        if isinstance(message, (bytes, bytearray)):
+            if is_landmark_packet(message):
+                try:
+                    results = parse_packet(message)
+                except ValueError:
+                    self.frames_rejected += 1
+                    return
+                self._push(blank_frame(self.frame_size), results)
+                return
+            frame = decode_frame(message)
+            if frame is None:
+                self.frames_rejected += 1
+                return
+            self._push(frame)
+            return
+        try:
+            msg = json.loads(message)
+        except ValueError:
+            return
+        if msg.get('type') == 'landmarks':
+            try:
+                results = parse_json(msg)
+            except (KeyError, TypeError, ValueError):
+                self.frames_rejected += 1
+                return
+            self._push(blank_frame(self.frame_size), results)
+        elif msg.get('type') == 'stats':
+            self._send(json.dumps({'type': 'stats', **self.stats()}))
+        elif self.on_control is not None:
+            reply = self.on_control(self.session, msg)
+            if reply is not None:
+                self._send(json.dumps(reply))
+
+    def serve(self, receive_timeout=1.0):
+        """阻塞直到连接关闭：当前线程收消息，后台线程发结果"""
+        # 发回给浏览器的是单张 JPEG，不需要 multipart 分片头
+        encode = MjpegStreamEncoder(multipart=False)
+        self.pipeline = FramePipeline(self.session.upload, lambda: self.session.game,
+                                      encode=encode, cpu_meter=self.session, game_owner=self.session).start()
+        self._sender = threading.Thread(target=self._send_loop, name='SocketSession-send', daemon=True)
+        self._sender.start()
+        try:
+            self._send(json.dumps({'type': 'hello', 'credits': self.credits,
+                                     'game': self.session.game_name}))
+            while not self._closed.is_set() and not self.session.closed:
+                message = self.ws.receive(timeout=receive_timeout)
+                if message is None:
+                    continue
+                self.handle_message(message)
+        except Exception:
+            # ConnectionClosed 等：客户端离开
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        self._closed.set()
+        if self.pipeline is not None:
+            self.pipeline.stop()
+        restore_local_detection(self.session.game)
+        if self._sender is not None and self._sender is not threading.current_thread():
+            self._sender.join(timeout=2.0)
+
+    def stats(self):
+        return {
+            'received': self.frames_received,
+            'rejected': self.frames_rejected,
+            'dropped': self.frames_dropped,
+            'sent': self.frames_sent,
+            'pipeline': self.pipeline.stats() if self.pipeline is not None else None,
+        }
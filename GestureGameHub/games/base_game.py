@@ -1,18 +1,28 @@
 # games/base_game.py
 import cv2
 import mediapipe as mp
+from engine.metrics import metrics, timed_method
+from .detector_pool import detector_pool, release_detectors
+from .tracking import use_tracking
+from .gestures import GestureReader
 
 class BaseGame:
     def __init__(self):
         # 初始化 MediaPipe
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
+        self.hands = detector_pool.lease(
+            'hands',
             max_num_hands=1,
             min_detection_confidence=0.7,
             min_tracking_confidence=0.5
         )
         self.mp_draw = mp.solutions.drawing_utils
+        # 按 games/tracking.py 的配置隔帧检测，中间帧预测关键点
+        use_tracking(self)
+        # 手指状态、方向等手势特征（阈值按游戏配置）
+        self.gestures = GestureReader.for_game(self)
 
+    @timed_method('process')
     def process(self, frame):
         """
         核心方法：
@@ -22,12 +32,21 @@ class BaseGame:
         4. 绘制游戏画面
         5. 返回最终合成的图片
         """
-        # 将BGR转RGB供MediaPipe使用
-        img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(img_rgb)
+        results = self.detect(frame)
         
         # 子类需要实现具体的 update_and_draw
         return self.update_and_draw(frame, results)
 
+    def detect(self, frame):
+        """只做 MediaPipe 识别（流水线模式下在推理线程里单独调用）"""
+        # 将BGR转RGB供MediaPipe使用
+        img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        with metrics.timed('hands.process', self):
+            return self.hands.process(img_rgb)
+
     def update_and_draw(self, frame, results):
-        raise NotImplementedError("每个游戏必须实现这个方法")
\ No newline at end of file
+        raise NotImplementedError("每个游戏必须实现这个方法")
+
+    def close(self):
+        """切换游戏 / 会话结束时调用：把检测器还给检测器池"""
+        release_detectors(self, 'hands')
\ No newline at end of file
@@ -0,0 +1,120 @@
+# games/compositor.py
+"""“左边游戏 + 右边侧边栏”布局的画布合成器
+
+各适配器原来每帧都 np.zeros 一张 1280×720 的新画布，画侧边栏背景、边框，
+再用 cv2.putText 把标题、玩法说明这些不会变的文字重新光栅化一遍。
+
+CanvasCompositor 把画面分成两层：
+- 静态层：背景、边框、标题、说明文字。按 key（游戏 / 主题 / 状态）缓存，
+  key 第一次出现时调用 draw_static(layer) 画一次，之后直接复用
+- 动态区域（slot）：分数、生命、指令、摄像头预览等。每个区域带一个 token（通常就是要显示的内容），
+  这块画布上次画的 token 没变就整块跳过；变了就先从静态层恢复这块区域再重画
+
+画完的画布会交给流水线的编码线程，所以不能只用一张：这里维护一组缓冲轮流使用，
+还被别人引用着（编码中 / 排队中 / 调用方自己留着）的缓冲不会被复用，全忙时再分配新的。
+"""
+import sys
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+from engine.metrics import metrics
+
+
+class CanvasCompositor:
+    def __init__(self, width, height, max_buffers=6, max_layers=8):
+        self.width = width
+        self.height = height
+        self.max_buffers = max_buffers
+        self.max_layers = max_layers
+        self._layers = OrderedDict()  # key -> 静态层
+        self._slots = {}              # name -> (x, y, w, h)
+        self._buffers = []            # [画布, 静态层 key, {slot: token}]
+        self._current = None
+        self._layer = None
+
+    def add_slot(self, name, x, y, w, h):
+        """登记一块动态区域（画布坐标），超出画布的部分会被裁掉"""
+        x0, y0 = max(0, int(x)), max(0, int(y))
+        x1, y1 = min(self.width, int(x + w)), min(self.height, int(y + h))
+        self._slots[name] = (x0, y0, max(0, x1 - x0), max(0, y1 - y0))
+
+    def _static_layer(self, key, draw_static):
+        layer = self._layers.get(key)
+        if layer is not None:
+            self._layers.move_to_end(key)
+            return layer
+        layer = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        with metrics.timed('compositor.static'):
+            draw_static(layer)
+        self._layers[key] = layer
+        while len(self._layers) > self.max_layers:
+            self._layers.popitem(last=False)
+        return layer
+
+    def _acquire(self):
+        for entry in self._buffers:
+            # 引用只剩列表里这一个（加上 getrefcount 自己的参数）才说明没人在用
+            if sys.getrefcount(entry[0]) <= 2:
+                return entry
+        entry = [np.empty((self.height, self.width, 3), dtype=np.uint8), None, {}]
+        if len(self._buffers) < self.max_buffers:
+            self._buffers.append(entry)
+        return entry
+
+    def begin(self, key, draw_static):
+        """开始合成一帧，返回本帧的画布
+
+        key: 静态层的标识，draw_static(layer) 只在 key 第一次出现时调用
+        返回的画布已经是静态层的内容，动态区域保留着这块缓冲上次画的样子
+        """
+        layer = self._static_layer(key, draw_static)
+        entry = self._acquire()
+        # 性能浮层直接画在输出画面上，开着的时候每帧都整张恢复
+        if entry[1] != key or metrics.overlay_enabled:
+            np.copyto(entry[0], layer)
+            entry[1] = key
+            entry[2].clear()
+        self._current = entry
+        self._layer = layer
+        return entry[0]
+
+    def slot(self, name):
+        """当前画布上某个动态区域的视图"""
+        x, y, w, h = self._slots[name]
+        return self._current[0][y:y + h, x:x + w]
+
+    def draw(self, name, token, painter):
+        """重画一块动态区域，返回是否真的画了
+
+        token 和这块画布上次画的相同就跳过；None 表示每帧都重画
+        painter(view) 在区域视图上用局部坐标绘制，画出区域的部分自动被裁掉
+        """
+        canvas, _, tokens = self._current
+        if token is not None and tokens.get(name, self) == token:
+            return False
+        x, y, w, h = self._slots[name]
+        view = canvas[y:y + h, x:x + w]
+        np.copyto(view, self._layer[y:y + h, x:x + w])
+        painter(view)
+        tokens[name] = token
+        return True
+
+    def text(self, name, text, org, font, scale, color, thickness=1):
+        """在动态区域里写一行字，org 和 cv2.putText 一样用画布坐标"""
+        x, y = self._slots[name][:2]
+        local = (org[0] - x, org[1] - y)
+        return self.draw(name, (text, org, font, scale, color, thickness),
+                         lambda view: cv2.putText(view, text, local, font, scale, color, thickness))
+
+    def paste(self, name, image, interpolation=cv2.INTER_LINEAR):
+        """把图像缩放后直接写进动态区域（摄像头预览、游戏画面），返回区域视图"""
+        view = self.slot(name)
+        h, w = view.shape[:2]
+        if image.shape[:2] == (h, w):
+            np.copyto(view, image)
+        else:
+            cv2.resize(image, (w, h), dst=view, interpolation=interpolation)
+        self._current[2].pop(name, None)
+        return view
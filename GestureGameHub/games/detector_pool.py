@@ -0,0 +1,167 @@
+# games/detector_pool.py
+"""MediaPipe 检测器池：按配置复用 Hands / FaceMesh，切换游戏不再重新加载模型
+
+用法：
+    self.hands = detector_pool.lease('hands', max_num_hands=1, min_detection_confidence=0.7)
+    ...
+    detector_pool.release(self.hands)   # 游戏 close() 时归还
+
+- 同一配置的检测器归还后放进空闲列表，下次 lease 直接取出，并先处理一张空白图片
+  清掉上一个游戏留下的跟踪状态（reset() 会重启整个图，首帧耗时和冷启动差不多）
+- 空闲超过 idle_timeout 秒、或同一配置空闲数超过 max_idle 的检测器会被关闭
+- 一个检测器同一时间只借给一个游戏（MediaPipe 图不是线程安全的）；
+  归还后要过 grace 秒才会再借出，给旧游戏流水线里正在跑的那一帧留出时间
+"""
+import threading
+import time
+
+import mediapipe as mp
+import numpy as np
+
+from engine.metrics import metrics
+from engine.remote import restore_local_detection
+from .tracking import crop_detectors, unwrap_detector
+
+FACTORIES = {
+    'hands': lambda **config: mp.solutions.hands.Hands(**config),
+    'face_mesh': lambda **config: mp.solutions.face_mesh.FaceMesh(**config),
+}
+
+
+# 清空跟踪状态用的空白图片：检测不到目标时 MediaPipe 会丢弃上一帧的跟踪结果
+_BLANK = np.zeros((64, 64, 3), dtype=np.uint8)
+
+
+def pool_key(kind, config):
+    return (kind, tuple(sorted(config.items())))
+
+
+class DetectorPool:
+    def __init__(self, idle_timeout=120.0, max_idle=2, grace=0.5):
+        self.idle_timeout = idle_timeout
+        self.max_idle = max_idle
+        self.grace = grace
+        # 游戏在 __del__ 里也会归还检测器，GC 可能发生在持锁期间，所以用可重入锁
+        self._lock = threading.RLock()
+        self._idle = {}    # key -> [(detector, 归还时间), ...]
+        self._leased = {}  # id(detector) -> (key, detector)
+
+        self.created = 0
+        self.reused = 0
+        self.closed = 0
+
+    def lease(self, kind='hands', **config):
+        key = pool_key(kind, config)
+        with self._lock:
+            expired = self._reap_locked()
+            detector = None
+            idle = self._idle.get(key) or []
+            for i in range(len(idle) - 1, -1, -1):
+                if time.time() - idle[i][1] >= self.grace:
+                    detector = idle.pop(i)[0]
+                    break
+            if detector is not None:
+                self.reused += 1
+                self._leased[id(detector)] = (key, detector)
+        self._close_all(expired)
+        if detector is not None:
+            detector.process(_BLANK)
+            return detector
+
+        with metrics.timed(f'detector.load.{kind}'):
+            detector = FACTORIES[kind](**config)
+        with self._lock:
+            self.created += 1
+            self._leased[id(detector)] = (key, detector)
+        return detector
+
+    def release(self, detector):
+        """归还检测器；不是从池里借出的检测器直接关闭"""
+        if detector is None:
+            return
+        to_close = []
+        with self._lock:
+            entry = self._leased.pop(id(detector), None)
+            if entry is None:
+                to_close.append(detector)
+            else:
+                idle = self._idle.setdefault(entry[0], [])
+                idle.append((detector, time.time()))
+                while len(idle) > self.max_idle:
+                    to_close.append(idle.pop(0)[0])
+            to_close += self._reap_locked()
+        self._close_all(to_close)
+
+    def config_of(self, detector):
+        """借出 detector 时用的配置（dict）；不是从池里借出的返回 None"""
+        with self._lock:
+            entry = self._leased.get(id(detector))
+        return dict(entry[0][1]) if entry is not None else None
+
+    def _reap_locked(self):
+        """摘出空闲太久的检测器（由调用方在锁外关闭）"""
+        if not self.idle_timeout:
+            return []
+        now = time.time()
+        expired = []
+        for key, idle in list(self._idle.items()):
+            keep = [(d, t) for d, t in idle if now - t <= self.idle_timeout]
+            expired += [d for d, t in idle if now - t > self.idle_timeout]
+            if keep:
+                self._idle[key] = keep
+            else:
+                del self._idle[key]
+        return expired
+
+    def _close_all(self, detectors):
+        for detector in detectors:
+            try:
+                detector.close()
+            except Exception as e:
+                print(f">>> [DetectorPool] 关闭检测器出错: {e}")
+            with self._lock:
+                self.closed += 1
+
+    def reap(self):
+        """关闭空闲太久的检测器，返回关闭的数量"""
+        with self._lock:
+            expired = self._reap_locked()
+        self._close_all(expired)
+        return len(expired)
+
+    def clear(self):
+        """关闭所有空闲检测器"""
+        with self._lock:
+            idle = [d for entries in self._idle.values() for d, _ in entries]
+            self._idle.clear()
+        self._close_all(idle)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'leased': len(self._leased),
+                'idle': {f'{k[0]}{dict(k[1])}': len(v) for k, v in self._idle.items()},
+                'created': self.created,
+                'reused': self.reused,
+                'closed': self.closed,
+            }
+
+
+# 全局检测器池
+detector_pool = DetectorPool()
+
+
+def release_detectors(game, *attrs):
+    """游戏 close() 用：把 attrs 上的检测器归还到池里，可以重复调用
+
+    只传关键点模式下检测器被 RemoteDetector 替换过，先换回真正的检测器再归还；
+    包在 LandmarkTracker / RoiDetector 里的检测器取出来归还（RoiDetector 的裁剪检测器也一起归还）。
+    """
+    restore_local_detection(game)
+    for attr in attrs:
+        detector = getattr(game, attr, None)
+        if detector is not None:
+            setattr(game, attr, None)
+            detector_pool.release(unwrap_detector(detector))
+            for crop in crop_detectors(detector):
+                detector_pool.release(crop)
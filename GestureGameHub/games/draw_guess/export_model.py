@@ -0,0 +1,113 @@
+# games/draw_guess/export_model.py
+"""把训练好的 draw_model.pth 导出成游戏用的推理后端
+
+    numpy        draw_model.npz       纯 NumPy（numpy_cnn.py），游戏默认用它，不用 import torch
+    torchscript  draw_model.ts        torch.jit.trace + freeze 的 float32 模型
+    int8         draw_model_int8.ts   全连接层动态量化成 int8（参数量主要在 fc1）后再 trace
+    torch        draw_model.pth       原来的 eager 模型
+
+每个导出文件都记录了 .pth 的 sha1，对不上（模型重新训练过）时加载返回 None，游戏退回下一个后端。
+
+用法: python games/draw_guess/export_model.py [draw_model.pth]
+"""
+import os
+import sys
+import warnings
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+try:
+    from cnn_model import DrawCNN
+    from numpy_cnn import NumpyDrawCNN
+except ImportError:  # 作为 games.draw_guess.export_model 导入时
+    from games.draw_guess.cnn_model import DrawCNN
+    from games.draw_guess.numpy_cnn import NumpyDrawCNN
+from games.exports import file_sha1, is_stale  # 直接运行时 numpy_cnn 已把仓库根目录加进 sys.path
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+ARTIFACTS = {'numpy': 'draw_model.npz', 'torchscript': 'draw_model.ts', 'int8': 'draw_model_int8.ts'}
+
+
+def artifact_path(model_path, backend):
+    return os.path.join(os.path.dirname(os.path.abspath(model_path)), ARTIFACTS[backend])
+
+
+def load_state(model_path):
+    return torch.load(model_path, map_location='cpu')
+
+
+def load_torch_model(model_path):
+    state = load_state(model_path)
+    model = DrawCNN(state['fc.2.bias'].shape[0])
+    model.load_state_dict(state)
+    return model.eval()
+
+
+def export_numpy(model_path, out_path=None):
+    out_path = out_path or artifact_path(model_path, 'numpy')
+    state = {k: v.numpy() for k, v in load_state(model_path).items() if v.dtype.is_floating_point}
+    NumpyDrawCNN.from_state_dict(state).save(out_path, file_sha1(model_path))
+    return out_path
+
+
+def export_torchscript(model_path, out_path=None, quantize=False):
+    out_path = out_path or artifact_path(model_path, 'int8' if quantize else 'torchscript')
+    model = load_torch_model(model_path)
+    if quantize:
+        model = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+    with torch.no_grad():
+        traced = torch.jit.freeze(torch.jit.trace(model, torch.zeros(1, 1, 28, 28)))
+    torch.jit.save(traced, out_path, _extra_files={'source_sha1': file_sha1(model_path)})
+    return out_path
+
+
+def export_all(model_path):
+    """导出全部后端，返回 {后端: 路径}"""
+    return {
+        'numpy': export_numpy(model_path),
+        'torchscript': export_torchscript(model_path),
+        'int8': export_torchscript(model_path, quantize=True),
+    }
+
+
+class TorchClassifier:
+    """torch 模型（eager / TorchScript）套上和 NumpyDrawCNN 一样的 predict_proba(images) 接口"""
+
+    def __init__(self, module):
+        self.module = module
+
+    def predict_proba(self, images):
+        x = torch.from_numpy(np.ascontiguousarray(images, dtype=np.float32)).reshape(-1, 1, 28, 28)
+        with torch.no_grad():
+            return torch.softmax(self.module(x), dim=1).numpy()
+
+
+def load_torch_classifier(backend, model_path):
+    """torch 系的后端；导出文件不存在或和 model_path 对不上时返回 None"""
+    if not os.path.exists(model_path):
+        return None
+    if backend == 'torch':
+        return TorchClassifier(load_torch_model(model_path))
+    path = artifact_path(model_path, backend)
+    if not os.path.exists(path):
+        return None
+    extra = {'source_sha1': ''}
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', FutureWarning)  # torch.jit 在新版本里标记为弃用，功能不变
+        module = torch.jit.load(path, map_location='cpu', _extra_files=extra)
+    sha1 = extra['source_sha1']
+    if isinstance(sha1, bytes):
+        sha1 = sha1.decode()
+    if is_stale(sha1, model_path):
+        return None
+    return TorchClassifier(module)
+
+
+if __name__ == '__main__':
+    warnings.filterwarnings('ignore', category=FutureWarning)
+    warnings.filterwarnings('ignore', category=DeprecationWarning)
+    source = sys.argv[1] if len(sys.argv) > 1 else os.path.join(MODEL_DIR, 'draw_model.pth')
+    for backend, path in export_all(source).items():
+        print(f"导出完成 [{backend}]: {path} ({os.path.getsize(path) / 1024:.0f} KB)")
@@ -0,0 +1,106 @@
+# games/draw_guess/numpy_cnn.py
+"""DrawCNN 的纯 NumPy 推理：游戏里不用 import torch
+
+DrawCNN 只有 conv-BN-ReLU-pool ×2 + 两层全连接，导出时把 BatchNorm 折进卷积的权重和偏置
+（推理时 BN 就是逐通道的乘加），卷积用 im2col（sliding_window_view）+ 一次矩阵乘。
+内部按 NHWC 排列，fc1 的权重列在导出时换成同样的顺序，展平不用转置。
+
+导出的 draw_model.npz 记录了源 .pth 的 sha1，模型重新训练后旧的 .npz 不会被误用
+（train_lite.py 训练完会顺带导出，也可以手动运行 python games/draw_guess/export_model.py）。
+"""
+import os
+import sys
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from games.exports import load_export
+except ImportError:  # 直接运行 games/draw_guess/ 下的脚本时仓库根目录不在 sys.path 上
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from games.exports import load_export
+
+FORMAT_VERSION = 1
+BN_EPS = 1e-5  # nn.BatchNorm2d 的默认 eps
+LAYERS = ('conv1_w', 'conv1_b', 'conv2_w', 'conv2_b', 'fc1_w', 'fc1_b', 'fc2_w', 'fc2_b')
+
+
+def _fold_bn(state, conv, bn):
+    """conv + BN → 等价的 conv，权重排成 (3 * 3 * in, out)，和 im2col 的列顺序一致"""
+    scale = state[bn + '.weight'] / np.sqrt(state[bn + '.running_var'] + BN_EPS)
+    weight = state[conv + '.weight'] * scale[:, None, None, None]
+    bias = (state[conv + '.bias'] - state[bn + '.running_mean']) * scale + state[bn + '.bias']
+    return weight.transpose(2, 3, 1, 0).reshape(-1, weight.shape[0]), bias
+
+
+def _conv_bn_relu_pool(x, weight, bias):
+    """3x3 卷积（padding=1）+ ReLU + 2x2 最大池化，x 是 (N, H, W, C)"""
+    n, h, w, c = x.shape
+    padded = np.pad(x, ((0, 0), (1, 1), (1, 1), (0, 0)))
+    # (N, H, W, C, 3, 3) → (N, H, W, 3, 3, C)，和权重的 (kh, kw, in) 顺序对齐
+    cols = sliding_window_view(padded, (3, 3), axis=(1, 2)).transpose(0, 1, 2, 4, 5, 3)
+    out = cols.reshape(n * h * w, 9 * c) @ weight
+    out += bias
+    np.maximum(out, 0, out=out)
+    return out.reshape(n, h // 2, 2, w // 2, 2, -1).max(axis=(2, 4))
+
+
+class NumpyDrawCNN:
+    def __init__(self, conv1_w, conv1_b, conv2_w, conv2_b, fc1_w, fc1_b, fc2_w, fc2_b):
+        self.conv1_w, self.conv1_b = np.asarray(conv1_w, np.float32), np.asarray(conv1_b, np.float32)
+        self.conv2_w, self.conv2_b = np.asarray(conv2_w, np.float32), np.asarray(conv2_b, np.float32)
+        self.fc1_w, self.fc1_b = np.asarray(fc1_w, np.float32), np.asarray(fc1_b, np.float32)
+        self.fc2_w, self.fc2_b = np.asarray(fc2_w, np.float32), np.asarray(fc2_b, np.float32)
+        self.source_sha1 = ''
+
+    @classmethod
+    def from_state_dict(cls, state):
+        """state 是 DrawCNN.state_dict() 转成的 {名字: ndarray}"""
+        state = {k: np.asarray(v, dtype=np.float64) for k, v in state.items()}
+        conv1_w, conv1_b = _fold_bn(state, 'layer1.0', 'layer1.1')
+        conv2_w, conv2_b = _fold_bn(state, 'layer2.0', 'layer2.1')
+        # torch 按 (C, H, W) 展平，这里按 (H, W, C)
+        fc1 = state['fc.0.weight']
+        channels = conv2_w.shape[1]
+        side = int(round((fc1.shape[1] // channels) ** 0.5))
+        fc1_w = fc1.reshape(-1, channels, side, side).transpose(2, 3, 1, 0).reshape(fc1.shape[1], -1)
+        return cls(conv1_w, conv1_b, conv2_w, conv2_b, fc1_w, state['fc.0.bias'],
+                   state['fc.2.weight'].T, state['fc.2.bias'])
+
+    def save(self, path, source_sha1=''):
+        np.savez_compressed(path, version=np.int32(FORMAT_VERSION), source_sha1=np.str_(source_sha1),
+                            **{name: getattr(self, name) for name in LAYERS})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version']) != FORMAT_VERSION:
+                raise ValueError(f"unsupported cnn format {int(data['version'])}")
+            model = cls(*(data[name] for name in LAYERS))
+            model.source_sha1 = str(data['source_sha1'])
+        return model
+
+    @property
+    def num_classes(self):
+        return len(self.fc2_b)
+
+    def logits(self, images):
+        """images: (N, 28, 28) 或 (28, 28)，取值 0~1"""
+        x = np.asarray(images, dtype=np.float32).reshape(-1, 28, 28, 1)
+        x = _conv_bn_relu_pool(x, self.conv1_w, self.conv1_b)
+        x = _conv_bn_relu_pool(x, self.conv2_w, self.conv2_b)
+        x = x.reshape(len(x), -1) @ self.fc1_w
+        x += self.fc1_b
+        np.maximum(x, 0, out=x)
+        return x @ self.fc2_w + self.fc2_b
+
+    def predict_proba(self, images):
+        logits = self.logits(images)
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+
+def load_numpy_cnn(npz_path, model_path=None):
+    """加载导出的 .npz；文件不存在、格式不对或和 model_path 对不上（模型重新训练过）时返回 None"""
+    return load_export(npz_path, NumpyDrawCNN.load, model_path)
@@ -6,6 +6,7 @@ import torch.nn as nn
 import torch.optim as optim
 from torch.utils.data import TensorDataset, DataLoader
 from cnn_model import DrawCNN
+from export_model import export_all
 
 # 1. 配置想猜的物体 (可自己添加，必须是 QuickDraw 存在的类别)
 CLASSES = ['apple', 'banana', 'book', 'car', 'cat', 'clock', 'cloud', 'face', 'flower', 'star']
@@ -94,5 +95,9 @@ def train():
         
     print(f">>> 模型已保存至: {MODEL_PATH}")
 
+    # 导出游戏用的推理后端（NumPy / TorchScript / int8），见 export_model.py
+    for backend, path in export_all(MODEL_PATH).items():
+        print(f">>> 已导出 [{backend}]: {path}")
+
 if __name__ == "__main__":
     train()
\ No newline at end of file
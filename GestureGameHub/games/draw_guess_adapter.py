@@ -1,19 +1,42 @@
 import cv2
 import numpy as np
 import mediapipe as mp
-import torch
 import os
 import math
 import traceback
 import time
 import random
 from collections import deque
+from engine.metrics import metrics, timed_method
+from .detector_pool import detector_pool, release_detectors
+from .gestures import GestureReader
 
-# 尝试导入模型
+# 纯 NumPy 推理，默认不 import torch（见 draw_guess/numpy_cnn.py）
 try:
-    from games.draw_guess.cnn_model import DrawCNN
+    from games.draw_guess.numpy_cnn import load_numpy_cnn
 except ImportError:
-    from draw_guess.cnn_model import DrawCNN
+    from draw_guess.numpy_cnn import load_numpy_cnn
+
+# DRAW_CNN_BACKEND 指定推理后端：numpy / torchscript / int8 / torch；指定的不可用时按这个顺序往后退
+BACKENDS = ('numpy', 'torchscript', 'int8', 'torch')
+
+
+def load_classifier(model_path, backend=None):
+    """返回 (后端名, 有 predict_proba(images) 的模型)；torch 系的后端才 import torch"""
+    backend = backend or os.environ.get('DRAW_CNN_BACKEND', 'numpy')
+    order = BACKENDS[BACKENDS.index(backend):] if backend in BACKENDS else BACKENDS
+    for name in order:
+        if name == 'numpy':
+            model = load_numpy_cnn(os.path.join(os.path.dirname(model_path), 'draw_model.npz'), model_path)
+        else:
+            try:
+                from games.draw_guess.export_model import load_torch_classifier
+            except ImportError:
+                from draw_guess.export_model import load_torch_classifier
+            model = load_torch_classifier(name, model_path)
+        if model is not None:
+            return name, model
+    return None, None
 
 class DrawGuessAdapter:
     def __init__(self):
@@ -25,18 +48,19 @@ class DrawGuessAdapter:
         # 2. 加载模型和标签
         self.model_loaded = False
         self.labels = []
-        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        self.backend = None
         
         if os.path.exists(label_path) and os.path.exists(model_path):
             try:
                 with open(label_path, 'r') as f:
                     self.labels = [line.strip() for line in f.read().splitlines() if line.strip()]
                 if len(self.labels) > 0:
-                    self.model = DrawCNN(len(self.labels)).to(self.device)
-                    self.model.load_state_dict(torch.load(model_path, map_location=self.device))
-                    self.model.eval()
-                    self.model_loaded = True
-                    print(f">>> [你画我猜] 模型加载成功！共 {len(self.labels)} 个题目。")
+                    self.backend, self.model = load_classifier(model_path)
+                    self.model_loaded = self.model is not None
+                    if self.model_loaded:
+                        print(f">>> [你画我猜] 模型加载成功（{self.backend}）！共 {len(self.labels)} 个题目。")
+                    else:
+                        print(">>> [你画我猜] 没有可用的模型")
             except Exception as e:
                 print(f">>> [你画我猜] 加载出错: {e}")
                 self.labels = ["apple", "book", "car"] 
@@ -46,7 +70,8 @@ class DrawGuessAdapter:
 
         # 3. MediaPipe
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(max_num_hands=1, min_detection_confidence=0.7, min_tracking_confidence=0.7)
+        self.hands = detector_pool.lease('hands', max_num_hands=1, min_detection_confidence=0.7, min_tracking_confidence=0.7)
+        self.gestures = GestureReader.for_game(self)
         self.mp_draw = mp.solutions.drawing_utils
         
         # 4. 画布设置 (统一标准分辨率)
@@ -68,6 +93,9 @@ class DrawGuessAdapter:
         self.prediction = "..."       
         self.status_text = "Ready"    
         self.frame_count = 0
+        self.predict_interval = 0.5   # 画画时每 0.5 秒识别一次（原来按 30FPS 每 15 帧）
+        self.last_predict_time = 0.0
+        self.input_block_until = 0.0  # 按下 SKIP 后短时间内忽略手势，防止连续跳题
 
         self.state = 'SELECTING' # 状态: SELECTING (抽题) -> PLAYING (游戏) -> GAME_OVER (结算)
         self.selection_start_time = time.time()
@@ -93,6 +121,19 @@ class DrawGuessAdapter:
         self.c_btn_clear = (80, 80, 220)
         self.c_btn_skip = (220, 100, 80) # 跳过按钮颜色
 
+    def close(self):
+        release_detectors(self, 'hands')
+
+    def on_attach(self):
+        """预加载的实例交给玩家时调用（engine/warmup.py）：从“Get Ready”倒计时重新开始"""
+        self.state = 'SELECTING'
+        self.selection_start_time = time.time()
+        self.score = 0
+        self.time_left = self.game_duration
+        self.input_block_until = 0.0
+        self.last_predict_time = 0.0
+        self.reset_round()
+
     def reset_round(self):
         """重置回合（清空画布，换新题）"""
         self.canvas[:] = 255
@@ -115,6 +156,7 @@ class DrawGuessAdapter:
             return True
         return False
 
+    @timed_method('cnn.predict')
     def predict(self):
         if not self.model_loaded: return
         try:
@@ -134,16 +176,12 @@ class DrawGuessAdapter:
                     pad_left = (h - w) // 2; pad_right = h - w - pad_left
                     img_square = cv2.copyMakeBorder(img_crop, 0, 0, pad_left, pad_right, cv2.BORDER_CONSTANT, value=0)
                 img_small = cv2.resize(img_square, (28, 28), interpolation=cv2.INTER_AREA)
-                img_tensor = torch.from_numpy(img_small).float().div(255.0).unsqueeze(0).unsqueeze(0)
-                with torch.no_grad():
-                    img_tensor = img_tensor.to(self.device)
-                    output = self.model(img_tensor)
-                    probs = torch.softmax(output, dim=1)
-                    p, idx = torch.max(probs, 1)
-                    if p.item() > 0.1: 
-                        self.prediction = self.labels[idx.item()]
-                        # 每次预测完立刻检查是否正确
-                        self.check_correct_guess()
+                probs = self.model.predict_proba(img_small.astype(np.float32) / 255.0)[0]
+                idx = int(np.argmax(probs))
+                if probs[idx] > 0.1: 
+                    self.prediction = self.labels[idx]
+                    # 每次预测完立刻检查是否正确
+                    self.check_correct_guess()
         except Exception: pass 
 
     # --- 抽题画面绘制 ---
@@ -245,18 +283,9 @@ class DrawGuessAdapter:
         return img
 
     def count_fingers(self, lm):
-        pts = lm.landmark
-        fingers = []
-        if pts[4].x < pts[3].x: fingers.append(1)
-        else: fingers.append(0)
-        for id in [8, 12, 16, 20]:
-            if pts[id].y < pts[id-2].y: fingers.append(1)
-            else: fingers.append(0)
-        total = sum(fingers)
-        if abs(pts[4].x - pts[3].x) < 0.02: 
-            if fingers[0] == 1: total -= 1
-        return total
+        return self.gestures.read(lm).finger_count
 
+    @timed_method('process')
     def process(self, frame):
         self.frame_count += 1
         frame = cv2.resize(frame, (self.width, self.height))
@@ -278,7 +307,8 @@ class DrawGuessAdapter:
         if self.state == 'GAME_OVER':
             white_bg = self.canvas.copy()
             img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.hands.process(img_rgb)
+            with metrics.timed('hands.process', self):
+                results = self.hands.process(img_rgb)
             if results.multi_hand_landmarks:
                 for lm in results.multi_hand_landmarks:
                     if self.count_fingers(lm) >= 4: # 张开手掌重开
@@ -294,9 +324,10 @@ class DrawGuessAdapter:
         
         try:
             img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.hands.process(img_rgb)
+            with metrics.timed('hands.process', self):
+                results = self.hands.process(img_rgb)
             
-            if results.multi_hand_landmarks:
+            if results.multi_hand_landmarks and time.time() >= self.input_block_until:
                 for lm in results.multi_hand_landmarks:
                     pts = lm.landmark
                     x1, y1 = int(pts[8].x * self.width), int(pts[8].y * self.height)
@@ -319,8 +350,7 @@ class DrawGuessAdapter:
                     cx, cy = avg_x, avg_y
                     self.prev_cx, self.prev_cy = cx, cy
                     
-                    fingers = [1 if pts[4].x < pts[3].x else 0] + \
-                              [1 if pts[id].y < pts[id-2].y else 0 for id in [8, 12, 16, 20]]
+                    fingers = self.gestures.read(lm).fingers
 
         
                     # 如果张开手掌 (手指>=4) 且不在边缘保护区 -> 清空
@@ -345,7 +375,7 @@ class DrawGuessAdapter:
                         elif 140 < cx < 240 and 20 < cy < 80:
                             self.reset_round()
                             self.status_text = "SKIPPED"
-                            time.sleep(0.2) 
+                            self.input_block_until = time.time() + 0.2
 
                         # 绘画 (非按钮区域)
                         else:
@@ -354,7 +384,9 @@ class DrawGuessAdapter:
                             cv2.circle(self.canvas, (cx, cy), self.brush_thickness//2, self.c_ink, -1)
                             self.xp, self.yp = cx, cy
                             self.status_text = "DRAWING"
-                            if self.frame_count % 15 == 0: self.predict()
+                            if time.time() - self.last_predict_time >= self.predict_interval:
+                                self.last_predict_time = time.time()
+                                self.predict()
 
                     # 移动 (食指+中指)
                     elif fingers[1] == 1 and fingers[2] == 1:
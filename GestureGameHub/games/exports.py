@@ -0,0 +1,34 @@
+# games/exports.py
+"""模型导出文件的公共部分：导出时记下源模型文件的 sha1，加载时对不上就当作过期
+
+街霸的扁平化随机森林（street_fighter/forest.py）和你画我猜的 DrawCNN 导出（draw_guess/）共用，
+模型重新训练后旧的导出文件不会被误用，游戏退回加载源模型。
+"""
+import hashlib
+import os
+
+
+def file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_stale(source_sha1, model_path):
+    """导出文件记录的 sha1 和现在的源模型对不上（源模型不存在时不算过期）"""
+    return bool(model_path) and os.path.exists(model_path) and source_sha1 != file_sha1(model_path)
+
+
+def load_export(path, loader, model_path=None):
+    """loader(path) 加载导出文件（返回的对象带 source_sha1）；文件不存在、格式不对或过期时返回 None"""
+    if not os.path.exists(path):
+        return None
+    try:
+        exported = loader(path)
+    except (OSError, ValueError, KeyError):
+        return None
+    if is_stale(exported.source_sha1, model_path):
+        return None
+    return exported
@@ -5,6 +5,11 @@ import random
 import time
 import math
 import traceback
+from engine.metrics import metrics, timed_method
+from engine.pacing import FramePacer
+from .detector_pool import detector_pool, release_detectors
+from .tracking import use_tracking
+from .gestures import GestureReader
 
 class FingertipCatchAdapter:
     """Fingertip Catch Stars game adapter.
@@ -21,10 +26,14 @@ class FingertipCatchAdapter:
         self.lives = 3
         self.level = 1
         self.base_speed = 3.0
+        # star speeds are in pixels per frame at 30 FPS; scaled by the real frame time
+        self.pacer = FramePacer(30)
 
         # MediaPipe
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(max_num_hands=1, min_detection_confidence=0.6, min_tracking_confidence=0.6)
+        self.hands = detector_pool.lease('hands', max_num_hands=1, min_detection_confidence=0.6, min_tracking_confidence=0.6)
+        use_tracking(self)
+        self.gestures = GestureReader.for_game(self)
         self.mp_draw = mp.solutions.drawing_utils
 
         # stars list
@@ -97,7 +106,9 @@ class FingertipCatchAdapter:
         cv2.fillPoly(img, [np.array(pts, dtype=np.int32)], color)
         cv2.polylines(img, [np.array(pts, dtype=np.int32)], True, (20,120,200), 2)
 
+    @timed_method('process')
     def process(self, frame):
+        step = self.pacer.tick() * self.pacer.target_fps
         try:
             frame = cv2.resize(frame, (self.width, self.height))
             view = frame.copy()
@@ -115,7 +126,8 @@ class FingertipCatchAdapter:
 
             # process hands for both PLAYING and END states (so we can detect restart touches)
             img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.hands.process(img_rgb)
+            with metrics.timed('hands.process', self):
+                results = self.hands.process(img_rgb)
 
             # default fingertip position center bottom
             fx, fy = self.width//2, int(self.height*0.75)
@@ -130,17 +142,15 @@ class FingertipCatchAdapter:
                 lm = results.multi_hand_landmarks[0]
                 fx = int(lm.landmark[8].x * self.width)
                 fy = int(lm.landmark[8].y * self.height)
-                # simple up detection used elsewhere
-                def is_up(tip, pip):
-                    return lm.landmark[tip].y < lm.landmark[pip].y
-                index_up = is_up(8,6)
-                middle_up = is_up(12,10)
+                features = self.gestures.read(lm)
+                index_up = features.is_up(1)
+                middle_up = features.is_up(2)
                 cv2.circle(view, (fx, fy), 10, (0,255,0), -1)
 
             # update stars
             for s in self.stars:
                 if not s['alive']: continue
-                s['y'] += s['vy']
+                s['y'] += s['vy'] * step
 
             # collision detection
             caught_any = []
@@ -238,9 +248,11 @@ class FingertipCatchAdapter:
             traceback.print_exc()
             return frame
 
+    def close(self):
+        release_detectors(self, 'hands')
+
     def __del__(self):
         try:
-            if hasattr(self, 'hands'):
-                self.hands.close()
+            self.close()
         except Exception:
             pass
@@ -1,13 +1,16 @@
 # games/fruit_ninja_game.py
 """水果忍者游戏适配器 - 将原始Pygame水果忍者游戏集成到MediaPipe框架中"""
 import cv2
-import numpy as np
 import pygame
 import sys
 import os
 import random
 import time
 from .base_game import BaseGame
+from engine.metrics import metrics
+from engine.pacing import FramePacer
+from .surface_bridge import SurfaceBridge
+from .compositor import CanvasCompositor
 
 
 class FruitNinjaGame(BaseGame):
@@ -27,12 +30,14 @@ class FruitNinjaGame(BaseGame):
         
         # 创建 Pygame surface
         self.game_surface = pygame.Surface((self.WIDTH, self.HEIGHT))
-        self.clock = pygame.time.Clock()
+        self.surface_bridge = SurfaceBridge()
+        self.pacer = FramePacer(self.FPS)
         
         # 画布配置
         self.canvas_w = 1280
         self.canvas_h = 720
         self.sidebar_w = 380
+        self.setup_compositor()
         
         # 手指位置
         self.finger_pos = None
@@ -67,6 +72,75 @@ class FruitNinjaGame(BaseGame):
         self.game_over = False
         self.first_round = True
         
+    def setup_compositor(self):
+        """画布布局：背景、边框、标题和游戏说明缓存在静态层，每帧只重画游戏画面、摄像头和变化的文字"""
+        self.compositor = CanvasCompositor(self.canvas_w, self.canvas_h)
+        
+        # 游戏画面（左侧居中）
+        game_area_w = self.canvas_w - self.sidebar_w
+        scale = min((game_area_w - 40) / self.WIDTH, (self.canvas_h - 40) / self.HEIGHT)
+        self.game_rect = (
+            (game_area_w - int(self.WIDTH * scale)) // 2,
+            (self.canvas_h - int(self.HEIGHT * scale)) // 2,
+            int(self.WIDTH * scale),
+            int(self.HEIGHT * scale),
+        )
+        self.compositor.add_slot('game', *self.game_rect)
+        
+        # 摄像头预览（放在边栏顶部）
+        self.sidebar_x = self.canvas_w - self.sidebar_w
+        self.camera_w, self.camera_h = self.sidebar_w - 20, 200
+        self.compositor.add_slot('camera', self.sidebar_x + 10, 10, self.camera_w, self.camera_h)
+        
+        # 文字区域：框住各自那一行（基线上方 25px 到下方 7px）
+        for name, baseline in (('state', 300), ('score', 360), ('lives', 410), ('finger', self.canvas_h - 30)):
+            self.compositor.add_slot(name, self.sidebar_x, baseline - 25, self.sidebar_w, 32)
+    
+    def draw_static_layer(self, canvas):
+        canvas[:] = (20, 20, 20)
+        
+        # 游戏画面边框
+        offset_x, offset_y, new_w, new_h = self.game_rect
+        cv2.rectangle(canvas, (offset_x-2, offset_y-2), 
+                     (offset_x+new_w+2, offset_y+new_h+2), (255, 200, 0), 2)
+        
+        # 边栏背景
+        sidebar_x = self.sidebar_x
+        cv2.rectangle(canvas, (sidebar_x, 0), (self.canvas_w, self.canvas_h), (40, 40, 40), -1)
+        cv2.line(canvas, (sidebar_x, 0), (sidebar_x, self.canvas_h), (100, 100, 100), 2)
+        self.draw_camera_frame(canvas)
+        
+        # 游戏标题（位置下移）
+        cv2.putText(canvas, 'FRUIT NINJA', (sidebar_x + 40, self.camera_h + 50), 
+                   cv2.FONT_HERSHEY_DUPLEX, 1.0, (255, 215, 0), 2)
+        
+        # 游戏说明
+        instructions = [
+            'CONTROLS:',
+            '- Use index finger',
+            '- Slice fruits',
+            '- Avoid bombs',
+            '',
+            'RULES:',
+            '- Cut bombs = -1 life',
+            '- Missing fruits is OK',
+            ''
+        ]
+        
+        inst_y = 480
+        for line in instructions:
+            if line:
+                cv2.putText(canvas, line, (sidebar_x + 20, inst_y), 
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+            inst_y += 30
+    
+    def draw_camera_frame(self, canvas):
+        """摄像头画面的边框和标签（压在画面上，贴完摄像头后要重画）"""
+        sidebar_x = self.sidebar_x
+        cv2.rectangle(canvas, (sidebar_x+10, 10), (sidebar_x+10+self.camera_w, 10+self.camera_h), (100, 200, 255), 2)
+        cv2.putText(canvas, 'CAMERA', (sidebar_x + 20, 30), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+    
     def generate_random_fruits(self, fruit):
         """生成随机水果 - 基于原始项目逻辑"""
         fruit_path = os.path.join(self.fruit_dir, "images", "fruit_images", fruit + ".png")
@@ -147,11 +221,8 @@ class FruitNinjaGame(BaseGame):
         return False
     
     def pygame_surface_to_cv2(self, surface):
-        """将Pygame Surface转换为OpenCV图像"""
-        arr = pygame.surfarray.array3d(surface)
-        arr = np.transpose(arr, (1, 0, 2))
-        arr = cv2.cvtColor(arr, cv2.COLOR_RGB2BGR)
-        return arr
+        """将Pygame Surface转换为OpenCV图像（复用同一块缓冲，马上会被 resize 进画布）"""
+        return self.surface_bridge.convert(surface)
     
     def draw_waiting_screen(self):
         """绘制等待开始界面"""
@@ -223,6 +294,9 @@ class FruitNinjaGame(BaseGame):
     
     def update_and_draw(self, frame, results):
         """主游戏循环 - 更新并绘制游戏画面"""
+        # 水果的速度、重力都是按 30FPS 每帧设计的，换算成真实帧间隔对应的帧数
+        step = self.pacer.tick() * self.FPS
+        
         # 1. 更新手指位置（带平滑处理和丢失缓冲）
         if results.multi_hand_landmarks:
             hand_landmarks = results.multi_hand_landmarks[0]
@@ -273,10 +347,10 @@ class FruitNinjaGame(BaseGame):
             # 更新所有水果位置 - 基于原始项目逻辑
             for key, value in self.data.items():
                 if value['throw']:
-                    value['x'] += value['speed_x']
-                    value['y'] += value['speed_y']
-                    value['speed_y'] += (0.05 * value['t'] * 0.7)  # 重力加速度降低到70%
-                    value['t'] += 1
+                    value['x'] += value['speed_x'] * step
+                    value['y'] += value['speed_y'] * step
+                    value['speed_y'] += (0.05 * value['t'] * 0.7) * step  # 重力加速度降低到70%
+                    value['t'] += step
 
                     if value['y'] > 800:
                         # 水果掉出屏幕，重新生成
@@ -312,98 +386,47 @@ class FruitNinjaGame(BaseGame):
                     self.generate_random_fruits(key)
         
         # 3. 根据游戏状态绘制不同内容
-        if self.game_state == "WAITING":
-            self.draw_waiting_screen()
-        elif self.game_state == "PLAYING":
-            if self.game_over:
-                self.draw_gameover_screen()
-            else:
-                self.draw_playing_screen()
+        with metrics.timed('pygame.draw', self):
+            if self.game_state == "WAITING":
+                self.draw_waiting_screen()
+            elif self.game_state == "PLAYING":
+                if self.game_over:
+                    self.draw_gameover_screen()
+                else:
+                    self.draw_playing_screen()
         
         # 4. 转换Pygame surface到OpenCV图像
-        game_image = self.pygame_surface_to_cv2(self.game_surface)
-        
-        # 5. 创建最终画布
-        canvas = np.zeros((self.canvas_h, self.canvas_w, 3), dtype=np.uint8)
-        canvas[:] = (20, 20, 20)
-        
-        # 6. 放置游戏画面（左侧居中）
-        game_area_w = self.canvas_w - self.sidebar_w
-        scale = min((game_area_w - 40) / self.WIDTH, (self.canvas_h - 40) / self.HEIGHT)
-        new_w = int(self.WIDTH * scale)
-        new_h = int(self.HEIGHT * scale)
-        game_resized = cv2.resize(game_image, (new_w, new_h))
-        
-        offset_x = (game_area_w - new_w) // 2
-        offset_y = (self.canvas_h - new_h) // 2
-        canvas[offset_y:offset_y+new_h, offset_x:offset_x+new_w] = game_resized
-        
-        # 游戏画面边框
-        cv2.rectangle(canvas, (offset_x-2, offset_y-2), 
-                     (offset_x+new_w+2, offset_y+new_h+2), (255, 200, 0), 2)
+        with metrics.timed('surfarray.array3d', self):
+            game_image = self.pygame_surface_to_cv2(self.game_surface)
         
-        # 7. 绘制右侧边栏
-        sidebar_x = self.canvas_w - self.sidebar_w
+        # 5. 取出画布：背景、边框、标题和说明来自缓存的静态层
+        canvas = self.compositor.begin('sidebar', self.draw_static_layer)
         
-        # 边栏背景
-        cv2.rectangle(canvas, (sidebar_x, 0), (self.canvas_w, self.canvas_h), (40, 40, 40), -1)
-        cv2.line(canvas, (sidebar_x, 0), (sidebar_x, self.canvas_h), (100, 100, 100), 2)
+        # 6. 放置游戏画面（左侧居中），直接缩放进画布
+        with metrics.timed('cv2.resize', self):
+            self.compositor.paste('game', game_image)
         
-        # 摄像头预览（放在边栏顶部）
-        camera_h = 200
-        camera_w = self.sidebar_w - 20
-        camera_preview = cv2.resize(frame, (camera_w, camera_h))
-        # 镜像翻转摄像头画面，使其更自然
-        camera_preview = cv2.flip(camera_preview, 1)
-        canvas[10:10+camera_h, sidebar_x+10:sidebar_x+10+camera_w] = camera_preview
-        # 摄像头画面边框
-        cv2.rectangle(canvas, (sidebar_x+10, 10), (sidebar_x+10+camera_w, 10+camera_h), (100, 200, 255), 2)
-        
-        # 摄像头标签
-        cv2.putText(canvas, 'CAMERA', (sidebar_x + 20, 30), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-        
-        # 游戏标题（位置下移）
-        cv2.putText(canvas, 'FRUIT NINJA', (sidebar_x + 40, camera_h + 50), 
-                   cv2.FONT_HERSHEY_DUPLEX, 1.0, (255, 215, 0), 2)
+        # 7. 右侧边栏：摄像头预览，镜像翻转使其更自然
+        with metrics.timed('cv2.resize', self):
+            camera_preview = self.compositor.paste('camera', frame)
+        cv2.flip(camera_preview, 1, dst=camera_preview)
+        self.draw_camera_frame(canvas)
         
-        # 游戏状态（位置下移）
-        status_y = 300
+        # 游戏状态、分数和生命：内容没变的区域直接跳过
+        sidebar_x = self.sidebar_x
         state_color = (0, 255, 0) if self.game_state == "PLAYING" else (255, 255, 0)
-        cv2.putText(canvas, f'State: {self.game_state}', (sidebar_x + 20, status_y), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, state_color, 2)
-        
-        # 分数和生命（位置下移）
-        info_y = 360
-        cv2.putText(canvas, f'Score: {self.score}', (sidebar_x + 20, info_y), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
-        cv2.putText(canvas, f'Lives: {self.player_lives}', (sidebar_x + 20, info_y + 50), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
-        
-        # 游戏说明
-        instructions = [
-            'CONTROLS:',
-            '- Use index finger',
-            '- Slice fruits',
-            '- Avoid bombs',
-            '',
-            'RULES:',
-            '- Cut bombs = -1 life',
-            '- Missing fruits is OK',
-            ''
-        ]
-        
-        inst_y = 480
-        for line in instructions:
-            if line:
-                cv2.putText(canvas, line, (sidebar_x + 20, inst_y), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
-            inst_y += 30
+        self.compositor.text('state', f'State: {self.game_state}', (sidebar_x + 20, 300), 
+                             cv2.FONT_HERSHEY_SIMPLEX, 0.7, state_color, 2)
+        self.compositor.text('score', f'Score: {self.score}', (sidebar_x + 20, 360), 
+                             cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+        self.compositor.text('lives', f'Lives: {self.player_lives}', (sidebar_x + 20, 410), 
+                             cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
         
         # 手指位置指示
+        finger_info = ''
         if self.finger_pos and self.game_state != "WAITING":
             finger_info = f'Finger: ({int(self.finger_pos[0])}, {int(self.finger_pos[1])})'
-            cv2.putText(canvas, finger_info, (sidebar_x + 20, self.canvas_h - 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (100, 255, 100), 1)
+        self.compositor.text('finger', finger_info, (sidebar_x + 20, self.canvas_h - 30), 
+                             cv2.FONT_HERSHEY_SIMPLEX, 0.5, (100, 255, 100), 1)
         
         return canvas
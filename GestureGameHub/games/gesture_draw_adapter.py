@@ -5,6 +5,9 @@ import time
 import math
 import random
 import traceback
+from engine.metrics import metrics, timed_method
+from .detector_pool import detector_pool, release_detectors
+from .gestures import GestureReader
 
 class GestureDrawAdapter:
     """A gesture drawing game adapter for browser.
@@ -21,7 +24,8 @@ class GestureDrawAdapter:
 
         # MediaPipe Hands
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(max_num_hands=1, min_detection_confidence=0.6, min_tracking_confidence=0.6)
+        self.hands = detector_pool.lease('hands', max_num_hands=1, min_detection_confidence=0.6, min_tracking_confidence=0.6)
+        self.gestures = GestureReader.for_game(self)
         self.mp_draw = mp.solutions.drawing_utils
 
         # canvas (white background)
@@ -251,19 +255,9 @@ class GestureDrawAdapter:
         return frame
 
     def count_fingers(self, lm):
-        pts = lm.landmark
-        fingers = []
-        if pts[4].x < pts[3].x: fingers.append(1)
-        else: fingers.append(0)
-        for id in [8, 12, 16, 20]:
-            if pts[id].y < pts[id-2].y: fingers.append(1)
-            else: fingers.append(0)
-        total = sum(fingers)
-        # thumb correction
-        if abs(pts[4].x - pts[3].x) < 0.02:
-            if fingers[0] == 1: total -= 1
-        return total
+        return self.gestures.read(lm).finger_count
 
+    @timed_method('process')
     def process(self, frame):
         try:
             frame = cv2.resize(frame, (self.width, self.height))
@@ -276,7 +270,8 @@ class GestureDrawAdapter:
 
             # process hands
             img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.hands.process(img_rgb)
+            with metrics.timed('hands.process', self):
+                results = self.hands.process(img_rgb)
 
             pip_w, pip_h = int(self.width*self.pip_scale), int(self.height*self.pip_scale)
             frame_small = cv2.resize(frame, (pip_w, pip_h))
@@ -286,11 +281,9 @@ class GestureDrawAdapter:
 
             if results.multi_hand_landmarks:
                 lm = results.multi_hand_landmarks[0]
-                # simple up detection
-                def is_up(tip, pip):
-                    return lm.landmark[tip].y < lm.landmark[pip].y
-                index_up = is_up(8,6)
-                middle_up = is_up(12,10)
+                features = self.gestures.read(lm)
+                index_up = features.is_up(1)
+                middle_up = features.is_up(2)
                 ix = int(lm.landmark[8].x * self.width)
                 iy = int(lm.landmark[8].y * self.height)
                 cv2.circle(frame, (ix, iy), 8, (0,255,0) if index_up else (0,120,0), -1)
@@ -390,9 +383,11 @@ class GestureDrawAdapter:
             traceback.print_exc()
             return frame
 
+    def close(self):
+        release_detectors(self, 'hands')
+
     def __del__(self):
         try:
-            if hasattr(self, 'hands'):
-                self.hands.close()
+            self.close()
         except Exception:
             pass
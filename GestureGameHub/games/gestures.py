@@ -0,0 +1,98 @@
+# games/gestures.py
+"""手势特征：各游戏共用的手指状态 / 方向 / 捏合 / 张掌判断
+
+原来吃豆人、迷宫的 detect_gesture，你画我猜、指尖绘画的 count_fingers，指尖绘画、摘星之手的 is_up
+各写了一份，阈值也各不相同。现在关键点每帧只转换一次成 (21, 3) 数组（games/landmarks.py），所有特征一次算完；
+同一帧的同一只手被多处读取时直接用缓存。
+
+各游戏的阈值在 GESTURE_PROFILES 里按适配器类名配置：
+    gestures = GestureReader.for_game(self)
+    features = gestures.read(hand_landmarks)
+    features.direction, features.fingers, features.finger_count, features.pinch, features.palm_open
+"""
+import math
+
+from .landmarks import to_array
+
+# 各游戏的手势阈值（按适配器类名）；没有列出的游戏用 default
+#   direction: 食指尖相对手腕的偏移超过它才算指向某个方向（归一化坐标）
+#   thumb_margin: 拇指尖和拇指关节的水平距离小于它时，数手指不算拇指
+#   pinch: 拇指尖到食指尖的距离小于手掌长度的这个比例时算捏合
+#   palm_open: 伸出的手指数达到它算张开手掌
+GESTURE_PROFILES = {
+    'default': {'direction': 0.12, 'thumb_margin': 0.02, 'pinch': 0.35, 'palm_open': 4},
+    'PacmanGameAdapter': {'direction': 0.12},
+    # 迷宫走错一步代价大，方向要指得更明确
+    'MazeGame': {'direction': 0.15},
+}
+
+WRIST, THUMB_IP, THUMB_TIP, INDEX_MCP, INDEX_TIP, MIDDLE_MCP = 0, 3, 4, 5, 8, 9
+# 食指、中指、无名指、小指的指尖（PIP 关节是指尖 - 2）
+FINGER_TIPS = (8, 12, 16, 20)
+
+
+class HandFeatures:
+    """一只手一帧的所有手势特征
+
+    points: (21, 3) 关键点（games/landmarks.py 转换出的 float32 数组）
+    fingers: (拇指, 食指, 中指, 无名指, 小指) 是否伸出（拇指按左右方向判断，不做修正）
+    finger_count: 伸出的手指数（拇指和关节挨得太近时不算）
+    direction: 'UP' / 'DOWN' / 'LEFT' / 'RIGHT' / 'NONE'，食指尖相对手腕的方向
+    pinch: 拇指尖和食指尖是否捏在一起；pinch_distance 是两者距离与手掌长度之比
+    palm_open: 是否张开手掌
+    """
+    __slots__ = ('points', 'fingers', 'finger_count', 'direction', 'pinch_distance', 'pinch', 'palm_open')
+
+    def __init__(self, points, direction=0.12, thumb_margin=0.02, pinch=0.35, palm_open=4):
+        self.points = points
+        # 一次取出 x / y 两列；十几次标量比较用 Python float 做比逐个取 numpy 标量快得多，
+        # 而且和原来直接读 protobuf 字段（float32 转 double）的结果完全一致
+        x, y = points[:, 0].tolist(), points[:, 1].tolist()
+
+        fingers = (x[THUMB_TIP] < x[THUMB_IP],) + tuple(y[tip] < y[tip - 2] for tip in FINGER_TIPS)
+        self.fingers = fingers
+        count = sum(fingers)
+        if fingers[0] and abs(x[THUMB_TIP] - x[THUMB_IP]) < thumb_margin:
+            count -= 1
+        self.finger_count = count
+
+        dx, dy = x[INDEX_TIP] - x[WRIST], y[INDEX_TIP] - y[WRIST]
+        if abs(dx) > abs(dy):
+            self.direction = 'RIGHT' if dx > direction else 'LEFT' if dx < -direction else 'NONE'
+        else:
+            self.direction = 'DOWN' if dy > direction else 'UP' if dy < -direction else 'NONE'
+
+        palm = math.hypot(x[MIDDLE_MCP] - x[WRIST], y[MIDDLE_MCP] - y[WRIST])
+        gap = math.hypot(x[THUMB_TIP] - x[INDEX_TIP], y[THUMB_TIP] - y[INDEX_TIP])
+        self.pinch_distance = gap / palm if palm > 0 else float('inf')
+        self.pinch = self.pinch_distance < pinch
+        self.palm_open = count >= palm_open
+
+    def is_up(self, finger):
+        """第 finger 根手指（0=拇指 … 4=小指）是否伸出"""
+        return self.fingers[finger]
+
+
+class GestureReader:
+    """按一套阈值读取手势特征，同一个关键点对象只算一次"""
+
+    def __init__(self, cache_size=4, **config):
+        self.config = dict(GESTURE_PROFILES['default'])
+        self.config.update(config)
+        self.cache_size = cache_size
+        # (关键点对象, 特征)：保留对象本身的引用，按 is 比较，不会被别的对象复用 id 误命中
+        self._cache = []
+
+    @classmethod
+    def for_game(cls, game):
+        return cls(**GESTURE_PROFILES.get(type(game).__name__, {}))
+
+    def read(self, landmarks):
+        for source, features in self._cache:
+            if source is landmarks:
+                return features
+        features = HandFeatures(to_array(landmarks), **self.config)
+        self._cache.append((landmarks, features))
+        if len(self._cache) > self.cache_size:
+            self._cache.pop(0)
+        return features
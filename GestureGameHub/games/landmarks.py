@@ -0,0 +1,163 @@
+# games/landmarks.py
+"""关键点转换层：MediaPipe 的 protobuf 关键点 → 连续的 float32 数组，每帧只转换一次
+
+游戏逻辑里到处是 hand_landmarks.landmark[i].x 这样的逐个属性访问（纯 Python 的 protobuf 下每次都
+要走一遍描述符），这里把一帧的结果一次性转成数组：
+
+    frame = landmark_frame(results)
+    frame.hands        # (n, 21, 3) float32，n 只手
+    frame.handedness   # ('Right', 'Left', ...)，和 hands 一一对应
+    frame.scores       # (n,) float32 置信度
+    frame.hand_index   # (n,) MediaPipe 给的手序号
+    frame.faces        # (m, K, 3) float32，用到时才转换
+
+同一个 results 对象多次调用 landmark_frame() 返回同一个 LandmarkFrame；to_array() 对同一个关键点对象
+也只转换一次（ROI、跟踪、手势特征、街霸特征读的是同一帧的同一只手），返回的数组是只读的。
+protobuf 有 C 实现时走“序列化 + frombuffer”的快速路径，否则逐个读取。
+"""
+import threading
+
+import numpy as np
+
+try:
+    from google.protobuf.internal import api_implementation
+    _FAST_PATH = api_implementation.Type() != 'python'
+except ImportError:
+    _FAST_PATH = False
+
+HAND_POINTS = 21
+
+# 只有 x / y / z 三个字段的 NormalizedLandmark 序列化后的布局：
+#   0x0A 0x0F (repeated 字段头 + 长度) 0x0D x 0x15 y 0x1D z
+_PACKED = np.dtype([('head', 'u1', 3), ('x', '<f4'), ('tag_y', 'u1'), ('y', '<f4'), ('tag_z', 'u1'), ('z', '<f4')])
+_PACKED_HEAD = (0x0A, 0x0F, 0x0D)
+
+
+class _IdentityCache:
+    """最近几个对象 → 转换结果，按 is 比较；保留对象本身的引用，id 不会被别的对象复用"""
+
+    def __init__(self, size):
+        self.size = size
+        self._lock = threading.Lock()
+        self._items = []
+
+    def get(self, key):
+        with self._lock:
+            for source, value in self._items:
+                if source is key:
+                    return value
+        return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._items.append((key, value))
+            if len(self._items) > self.size:
+                self._items.pop(0)
+        return value
+
+
+_arrays = _IdentityCache(16)
+_frames = _IdentityCache(8)
+
+
+def _unpack_serialized(landmark_list, count):
+    """快速路径；有 visibility / presence 等其他字段时布局对不上，返回 None"""
+    buf = landmark_list.SerializeToString()
+    if len(buf) != count * _PACKED.itemsize:
+        return None
+    packed = np.frombuffer(buf, dtype=_PACKED)
+    if not (packed['head'] == _PACKED_HEAD).all():
+        return None
+    out = np.empty((count, 3), dtype=np.float32)
+    out[:, 0], out[:, 1], out[:, 2] = packed['x'], packed['y'], packed['z']
+    return out
+
+
+def to_array(landmarks, indices=None):
+    """一组关键点 → (K, 3) float32 数组；indices 给定时只取这些点（纯 Python 实现下只读这些点）
+
+    landmarks 可以是 NormalizedLandmarkList、它的 .landmark 字段，或者已经是数组。
+    """
+    if isinstance(landmarks, np.ndarray):
+        return landmarks if indices is None else landmarks[indices]
+    out = _arrays.get(landmarks)
+    if out is not None:
+        return out if indices is None else out[indices]
+    points = getattr(landmarks, 'landmark', landmarks)
+    out = None
+    if _FAST_PATH and hasattr(landmarks, 'SerializeToString'):
+        out = _unpack_serialized(landmarks, len(points))
+    if out is None:
+        if indices is not None:
+            # 只要几个点时不转换整组，也不缓存
+            points = [points[i] for i in indices]
+            return np.array([v for p in points for v in (p.x, p.y, p.z)], dtype=np.float32).reshape(-1, 3)
+        out = np.array([v for p in points for v in (p.x, p.y, p.z)], dtype=np.float32).reshape(-1, 3)
+    out.flags.writeable = False
+    _arrays.put(landmarks, out)
+    return out if indices is None else out[indices]
+
+
+class LandmarkFrame:
+    """一帧识别结果的关键点数组；左右手、人脸等用到时才转换"""
+
+    def __init__(self, results):
+        self.results = results
+        hands = getattr(results, 'multi_hand_landmarks', None) or []
+        self.hands = np.empty((len(hands), HAND_POINTS, 3), dtype=np.float32)
+        for i, hand in enumerate(hands):
+            self.hands[i] = to_array(hand)
+        self._handedness = None
+        self._faces = None
+
+    @property
+    def num_hands(self):
+        return len(self.hands)
+
+    def _read_handedness(self):
+        labels, scores, indices = [], [], []
+        handedness = getattr(self.results, 'multi_handedness', None) or [None] * len(self.hands)
+        for i, cls in enumerate(handedness):
+            top = cls.classification[0] if cls is not None and len(cls.classification) else None
+            labels.append(top.label if top is not None else 'Right')
+            scores.append(top.score if top is not None else 1.0)
+            indices.append(top.index if top is not None else i)
+        self._handedness = (tuple(labels), np.array(scores, dtype=np.float32), np.array(indices, dtype=np.int32))
+        return self._handedness
+
+    @property
+    def handedness(self):
+        return (self._handedness or self._read_handedness())[0]
+
+    @property
+    def scores(self):
+        return (self._handedness or self._read_handedness())[1]
+
+    @property
+    def hand_index(self):
+        return (self._handedness or self._read_handedness())[2]
+
+    @property
+    def faces(self):
+        if self._faces is None:
+            faces = getattr(self.results, 'multi_face_landmarks', None) or []
+            self._faces = (np.stack([to_array(face) for face in faces]) if faces
+                           else np.empty((0, 0, 3), dtype=np.float32))
+        return self._faces
+
+    def hand(self, label=None):
+        """第一只手（label 给定时为第一只该侧的手）的 (21, 3) 数组，没有时返回 None"""
+        if label is None:
+            return self.hands[0] if len(self.hands) else None
+        for i, side in enumerate(self.handedness):
+            if side == label:
+                return self.hands[i]
+        return None
+
+
+def landmark_frame(results):
+    """results → LandmarkFrame，同一个 results 对象只转换一次"""
+    frame = _frames.get(results)
+    if frame is None:
+        frame = _frames.put(results, LandmarkFrame(results))
+    return frame
@@ -1,11 +1,16 @@
 # games/maze_game/maze_adapter.py
 import cv2
 import time
-import numpy as np
 import os
 import sys
 import mediapipe as mp
 import traceback
+from engine.metrics import metrics, timed_method
+from engine.pacing import FramePacer
+from games.detector_pool import detector_pool, release_detectors
+from games.tracking import use_tracking
+from games.gestures import GestureReader
+from games.compositor import CanvasCompositor
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(os.path.join(current_dir, 'src'))
@@ -18,6 +23,7 @@ class MazeGame:
         self.canvas_w, self.canvas_h = 1280, 720
         self.sidebar_w = 380
         self.maze_w = self.canvas_w - self.sidebar_w
+        self.setup_compositor()
         
         self.core = MazeCore()
         self.renderer = MazeRenderer(self.maze_w, self.canvas_h)
@@ -31,19 +37,37 @@ class MazeGame:
         self.win_delay_start = 0 
         self.is_waiting_next_level = False
         
-        # 【新增】FPS 控制
+        # FPS 控制：流水线按目标帧率丢掉多余的画面，不再在渲染线程里 sleep
         self.target_fps = 20
-        self.frame_duration = 1.0 / self.target_fps
+        self.pacer = FramePacer(self.target_fps)
         
         # MediaPipe 初始化
         self.mp_hands = mp.solutions.hands
         self.mp_draw = mp.solutions.drawing_utils
-        self.hands_detector = self.mp_hands.Hands(
+        self.hands_detector = detector_pool.lease(
+            'hands',
             max_num_hands=1,
             model_complexity=0, 
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5
         )
+        use_tracking(self, 'hands_detector')
+        self.gestures = GestureReader.for_game(self)
+
+    def close(self):
+        release_detectors(self, 'hands_detector')
+
+    def setup_compositor(self):
+        """侧边栏布局：背景随关卡主题缓存，只重画摄像头、指令、关卡和冷却条"""
+        self.compositor = CanvasCompositor(self.canvas_w, self.canvas_h)
+        self.cam_w = self.sidebar_w - 20
+        self.cam_h = int(self.cam_w * 0.75)
+        self.info_y = 20 + self.cam_h + 50
+        self.bar_w = 200
+        self.compositor.add_slot('camera', self.maze_w + 10, 20, self.cam_w, self.cam_h)
+        self.compositor.add_slot('cmd', self.maze_w, self.info_y - 30, self.sidebar_w, 42)
+        self.compositor.add_slot('level', self.maze_w, self.info_y + 20, self.sidebar_w, 42)
+        self.compositor.add_slot('cooldown', self.maze_w + 20, self.info_y + 80, self.bar_w + 1, 11)
 
     def start_game(self):
         self.core.start_game()
@@ -54,25 +78,26 @@ class MazeGame:
         self.renderer.trail = []
 
     def detect_gesture(self, landmarks):
-        wrist = landmarks.landmark[0]
-        tip = landmarks.landmark[8]
-        dx, dy = tip.x - wrist.x, tip.y - wrist.y
-        threshold = 0.15
-        if abs(dx) > abs(dy):
-            return "RIGHT" if dx > threshold else "LEFT" if dx < -threshold else "NONE"
-        else:
-            return "DOWN" if dy > threshold else "UP" if dy < -threshold else "NONE"
+        return self.gestures.read(landmarks).direction
+
+    def detect(self, frame):
+        # 1. AI 识别
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        with metrics.timed('hands.process', self):
+            return self.hands_detector.process(rgb_frame)
 
+    @timed_method('process')
     def process(self, frame):
-        # 【新增】简单的 FPS 限制
-        # 这一行会让程序稍微“休息”一下，释放 CPU 资源
-        time.sleep(0.02) 
+        try:
+            results = self.detect(frame)
+        except Exception as e:
+            print("CRITICAL ERROR in process:", e)
+            traceback.print_exc()
+            return frame
+        return self.update_and_draw(frame, results)
 
+    def update_and_draw(self, frame, results):
         try:
-            # 1. AI 识别
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.hands_detector.process(rgb_frame)
-            
             command = "NONE"
             if results.multi_hand_landmarks:
                 for hl in results.multi_hand_landmarks:
@@ -114,34 +139,35 @@ class MazeGame:
                 if command != "NONE": self.start_game()
 
             # 3. 渲染
-            self.renderer.update_visuals(self.core.player_pos)
-            self.renderer.draw(self.core)
-            game_img = self.renderer.get_image()
-
-            # 4. 拼接
-            combined = np.zeros((self.canvas_h, self.canvas_w, 3), dtype=np.uint8)
-            combined[:, :self.maze_w] = game_img
-            
+            self.renderer.update_visuals(self.core.player_pos, self.pacer.tick())
+            with metrics.timed('pygame.draw', self):
+                self.renderer.draw(self.core)
+            # 4. 拼接：游戏画面直接写进画布左侧，侧边栏只重画变化的区域
             theme = self.renderer.get_current_theme(self.core.level)
-            cv2.rectangle(combined, (self.maze_w, 0), (self.canvas_w, self.canvas_h), theme["bg"], -1)
+            combined = self.compositor.begin(theme["style"], lambda layer: cv2.rectangle(
+                layer, (self.maze_w, 0), (self.canvas_w, self.canvas_h), theme["bg"], -1))
+            with metrics.timed('surfarray.array3d', self):
+                self.renderer.get_image(out=combined[:, :self.maze_w])
             
-            cw = self.sidebar_w - 20
-            ch = int(cw * 0.75)
-            cam_small = cv2.resize(frame, (cw, ch))
-            combined[20:20+ch, self.maze_w+10:self.maze_w+10+cw] = cam_small
+            with metrics.timed('cv2.resize', self):
+                self.compositor.paste('camera', frame)
             
-            info_y = 20 + ch + 50
-            cv2.putText(combined, f"CMD: {command}", (self.maze_w+20, info_y), cv2.FONT_HERSHEY_SIMPLEX, 1, (255,255,255), 2)
+            info_y = self.info_y
+            self.compositor.text('cmd', f"CMD: {command}", (self.maze_w+20, info_y), cv2.FONT_HERSHEY_SIMPLEX, 1, (255,255,255), 2)
             
             display_level = min(self.core.level, self.core.max_levels)
-            cv2.putText(combined, f"LEVEL: {display_level}/{self.core.max_levels}", (self.maze_w+20, info_y+50), cv2.FONT_HERSHEY_SIMPLEX, 0.9, theme["hero"], 2)
+            self.compositor.text('level', f"LEVEL: {display_level}/{self.core.max_levels}", (self.maze_w+20, info_y+50), cv2.FONT_HERSHEY_SIMPLEX, 0.9, theme["hero"], 2)
             
             # 冷却条
-            bar_w = 200
+            bar_w = self.bar_w
             progress = min(1.0, (cur_time - self.last_move_time) / self.move_interval)
             bar_color = (0, 255, 0) if progress >= 1.0 else (0, 0, 255)
-            cv2.rectangle(combined, (self.maze_w+20, info_y+80), (self.maze_w+20+int(bar_w*progress), info_y+90), bar_color, -1)
-            cv2.rectangle(combined, (self.maze_w+20, info_y+80), (self.maze_w+20+bar_w, info_y+90), (100,100,100), 1)
+            fill_w = int(bar_w*progress)
+            
+            def draw_cooldown(view):
+                cv2.rectangle(view, (0, 0), (fill_w, 10), bar_color, -1)
+                cv2.rectangle(view, (0, 0), (bar_w, 10), (100,100,100), 1)
+            self.compositor.draw('cooldown', (fill_w, bar_color), draw_cooldown)
 
             return combined
             
@@ -1,11 +1,11 @@
 # games/maze_game/src/maze_renderer.py
 import pygame
-import numpy as np
-import cv2
 import time
 import math
 import traceback
 
+from games.surface_bridge import surface_to_bgr
+
 class MazeRenderer:
     def __init__(self, width, height):
         pygame.init()
@@ -44,10 +44,12 @@ class MazeRenderer:
         idx = (level - 1) % len(self.THEMES)
         return self.THEMES[idx]
 
-    def update_visuals(self, target_pos):
+    def update_visuals(self, target_pos, dt=None):
         tx, ty = target_pos
-        self.visual_pos[0] += (tx - self.visual_pos[0]) * 0.2
-        self.visual_pos[1] += (ty - self.visual_pos[1]) * 0.2
+        # 每帧(20FPS)追上 20% 的距离；给了 dt 时按真实时间换算，帧率变化时移动速度不变
+        k = 0.2 if dt is None else 1 - 0.8 ** (dt * 20)
+        self.visual_pos[0] += (tx - self.visual_pos[0]) * k
+        self.visual_pos[1] += (ty - self.visual_pos[1]) * k
         self.trail.append(tuple(self.visual_pos))
         if len(self.trail) > 8: self.trail.pop(0)
 
@@ -207,6 +209,6 @@ class MazeRenderer:
         self.surface.blit(t2, t2.get_rect(center=(self.w//2, self.h//2 + 30)))
 
     # [核心修复] 确保这个方法存在且缩进正确
-    def get_image(self):
-        view = pygame.surfarray.array3d(self.surface)
-        return cv2.cvtColor(view.transpose([1, 0, 2]), cv2.COLOR_RGB2BGR)
\ No newline at end of file
+    def get_image(self, out=None):
+        # out 可以直接是最终画布的切片，省掉中间数组
+        return surface_to_bgr(self.surface, out)
\ No newline at end of file
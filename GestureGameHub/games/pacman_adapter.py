@@ -1,7 +1,6 @@
 # games/pacman_adapter.py
 """吃豆人游戏适配器 - 将Pygame吃豆人游戏集成到MediaPipe框架中"""
 import cv2
-import numpy as np
 import pygame
 import sys
 import os
@@ -13,6 +12,10 @@ sys.path.insert(0, pacman_game_dir)
 from src.game import Game as PacmanGame
 from src.config import FPS, TILE
 from .base_game import BaseGame
+from engine.metrics import metrics
+from engine.pacing import FramePacer
+from .surface_bridge import SurfaceBridge
+from .compositor import CanvasCompositor
 
 
 class PacmanGameAdapter(BaseGame):
@@ -37,14 +40,16 @@ class PacmanGameAdapter(BaseGame):
         
         # 创建 Pygame surface 用于渲染游戏
         self.game_surface = pygame.Surface((self.pacman_game.width, self.pacman_game.height))
+        self.surface_bridge = SurfaceBridge()
         
-        # 初始化时钟
-        self.clock = pygame.time.Clock()
+        # 帧节奏：按真实帧间隔推进游戏，不再用 Clock.tick 在渲染线程里 sleep 限速
+        self.pacer = FramePacer(FPS)
         
         # 画布配置
         self.canvas_w = 1280
         self.canvas_h = 720
         self.sidebar_w = 380
+        self.setup_compositor()
         
         # 手势识别配置
         self.last_command = "NONE"
@@ -56,6 +61,96 @@ class PacmanGameAdapter(BaseGame):
         self.game_over_timer = 0  # 游戏结束后的计时器
         self.restart_delay = 3.0  # 游戏结束3秒后可以重启
         
+    def setup_compositor(self):
+        """画布布局：背景、边栏和标题缓存在静态层，每帧只重画游戏区、摄像头和变化的区域"""
+        self.compositor = CanvasCompositor(self.canvas_w, self.canvas_h)
+        self.sidebar_x = self.canvas_w - self.sidebar_w
+        game_area_w = self.canvas_w - self.sidebar_w
+        self.compositor.add_slot('game', 0, 0, game_area_w - 1, self.canvas_h)
+        
+        # 摄像头画面
+        self.cam_w = self.sidebar_w - 20
+        self.cam_h = int(self.cam_w * 0.75)
+        self.compositor.add_slot('camera', self.sidebar_x + 10, 10, self.cam_w, self.cam_h)
+        
+        # 方向指示（箭头长 50、线宽 5）和下面的文字信息
+        self.info_start_y = 10 + self.cam_h + 50
+        self.compositor.add_slot('arrow', self.sidebar_x + self.sidebar_w // 2 - 56, self.info_start_y - 56, 112, 112)
+        self.text_y = self.info_start_y + 100
+        self.line_height = 45
+        self.compositor.add_slot('info', self.sidebar_x, self.text_y + 15, self.sidebar_w, self.line_height * 3)
+    
+    def draw_static_layer(self, canvas):
+        canvas[:] = (20, 20, 20)
+        sidebar_x = self.sidebar_x
+        cv2.rectangle(canvas, (sidebar_x, 0), (self.canvas_w, self.canvas_h), (15, 15, 15), -1)
+        cv2.line(canvas, (sidebar_x, 0), (sidebar_x, self.canvas_h), (100, 100, 100), 2)
+        cv2.rectangle(canvas, (sidebar_x + 8, 8), 
+                     (sidebar_x + 10 + self.cam_w + 2, 10 + self.cam_h + 2), (255, 255, 255), 2)
+        cv2.putText(canvas, "PACMAN GAME", (sidebar_x + 20, self.text_y), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
+    
+    def draw_game_area(self, canvas, game_image):
+        """游戏区：game_image 为 None 时是等待开始的画面"""
+        if game_image is None:
+            # 等待开始状态
+            overlay = canvas.copy()
+            cv2.rectangle(overlay, (0, 0), (self.canvas_w - self.sidebar_w, self.canvas_h), (0, 0, 0), -1)
+            cv2.addWeighted(overlay, 0.7, canvas, 0.3, 0, canvas)
+            
+            font = cv2.FONT_HERSHEY_TRIPLEX
+            text = "CLICK START TO PLAY"
+            text_size = cv2.getTextSize(text, font, 1.5, 2)[0]
+            text_x = (self.canvas_w - self.sidebar_w - text_size[0]) // 2
+            text_y = self.canvas_h // 2
+            cv2.putText(canvas, text, (text_x, text_y), font, 1.5, (0, 255, 255), 2)
+            return
+        
+        # 计算游戏画面的位置（左侧居中）
+        game_area_w = self.canvas_w - self.sidebar_w
+        scale = min((game_area_w - 40) / game_image.shape[1], 
+                   (self.canvas_h - 40) / game_image.shape[0])
+        new_w = int(game_image.shape[1] * scale)
+        new_h = int(game_image.shape[0] * scale)
+        
+        # 居中放置，直接缩放进画布
+        offset_x = (game_area_w - new_w) // 2
+        offset_y = (self.canvas_h - new_h) // 2
+        with metrics.timed('cv2.resize', self):
+            cv2.resize(game_image, (new_w, new_h), dst=canvas[offset_y:offset_y+new_h, offset_x:offset_x+new_w])
+        
+        # 游戏画面边框
+        cv2.rectangle(canvas, (offset_x-2, offset_y-2), 
+                     (offset_x+new_w+2, offset_y+new_h+2), (0, 200, 200), 2)
+        
+        # 游戏结束提示
+        if self.pacman_game.game_over:
+            overlay = canvas.copy()
+            cv2.rectangle(overlay, (0, 0), (self.canvas_w - self.sidebar_w, self.canvas_h), (0, 0, 0), -1)
+            cv2.addWeighted(overlay, 0.7, canvas, 0.3, 0, canvas)
+            
+            victory = self.pacman_game.map.remaining_pellets() == 0
+            text = "VICTORY!" if victory else "GAME OVER"
+            color = (0, 255, 0) if victory else (0, 0, 255)
+            text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_TRIPLEX, 2, 3)[0]
+            text_x = (self.canvas_w - self.sidebar_w - text_size[0]) // 2
+            cv2.putText(canvas, text, (text_x, self.canvas_h // 2 - 50), 
+                       cv2.FONT_HERSHEY_TRIPLEX, 2, color, 3)
+            
+            # 显示重启倒计时
+            remaining = max(0, self.restart_delay - self.game_over_timer)
+            restart_text = f"Restarting in {remaining:.1f}s"
+            restart_size = cv2.getTextSize(restart_text, cv2.FONT_HERSHEY_SIMPLEX, 1, 2)[0]
+            restart_x = (self.canvas_w - self.sidebar_w - restart_size[0]) // 2
+            cv2.putText(canvas, restart_text, (restart_x, self.canvas_h // 2 + 30), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+    
+    def draw_info(self, view, lines):
+        # view 从第一行文字上方 30px 开始
+        for i, (text, scale, color) in enumerate(lines):
+            cv2.putText(view, text, (20, 30 + self.line_height * i), 
+                       cv2.FONT_HERSHEY_SIMPLEX, scale, color, 1)
+    
     def start_game(self):
         """前端点击开始按钮时调用"""
         self.game_state = "PLAYING"
@@ -87,17 +182,8 @@ class PacmanGameAdapter(BaseGame):
         self.game_state = "PLAYING"
     
     def detect_gesture(self, landmarks):
-        """识别食指方向"""
-        wrist = landmarks.landmark[0]
-        index_tip = landmarks.landmark[8]
-        dx = index_tip.x - wrist.x
-        dy = index_tip.y - wrist.y
-        threshold = 0.12
-        
-        if abs(dx) > abs(dy):
-            return "RIGHT" if dx > threshold else "LEFT" if dx < -threshold else "NONE"
-        else:
-            return "DOWN" if dy > threshold else "UP" if dy < -threshold else "NONE"
+        """识别食指方向（阈值见 games/gestures.py 的 GESTURE_PROFILES）"""
+        return self.gestures.read(landmarks).direction
     
     def apply_gesture_to_pacman(self, command):
         """将手势命令转换为游戏输入"""
@@ -121,18 +207,17 @@ class PacmanGameAdapter(BaseGame):
         """核心方法：更新游戏逻辑并绘制画面"""
         import time
         
-        # 1. 创建画布
-        canvas = np.zeros((self.canvas_h, self.canvas_w, 3), dtype=np.uint8)
-        canvas[:] = (20, 20, 20)
+        dt = self.pacer.tick()
         
-        # 2. 处理手势识别
+        # 1. 处理手势识别
         command = "NONE"
         if results.multi_hand_landmarks:
             for hand_landmarks in results.multi_hand_landmarks:
                 self.mp_draw.draw_landmarks(frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
                 command = self.detect_gesture(hand_landmarks)
         
-        # 3. 更新游戏逻辑
+        # 2. 更新游戏逻辑
+        game_image = None
         if self.game_state == "PLAYING":
             # 应用手势命令（带冷却）
             current_time = time.time()
@@ -144,110 +229,47 @@ class PacmanGameAdapter(BaseGame):
             
             # 检查是否游戏结束
             if self.pacman_game.game_over:
-                self.game_over_timer += 1 / FPS
+                self.game_over_timer += dt
                 # 3秒后自动重启游戏
                 if self.game_over_timer >= self.restart_delay:
                     self.restart_game()
             else:
                 # 游戏未结束，正常更新
-                dt = self.clock.tick(FPS) / 1000.0
                 self.pacman_game.update(dt)
             
             # 渲染游戏到 surface
-            self.pacman_game.draw(self.game_surface)
+            with metrics.timed('pygame.draw', self):
+                self.pacman_game.draw(self.game_surface)
             
             # 将 Pygame surface 转换为 OpenCV 图像
-            game_image = self.pygame_surface_to_cv2(self.game_surface)
-            
-            # 计算游戏画面的位置（左侧居中）
-            game_area_w = self.canvas_w - self.sidebar_w
-            scale = min((game_area_w - 40) / game_image.shape[1], 
-                       (self.canvas_h - 40) / game_image.shape[0])
-            new_w = int(game_image.shape[1] * scale)
-            new_h = int(game_image.shape[0] * scale)
-            game_resized = cv2.resize(game_image, (new_w, new_h))
-            
-            # 居中放置
-            offset_x = (game_area_w - new_w) // 2
-            offset_y = (self.canvas_h - new_h) // 2
-            canvas[offset_y:offset_y+new_h, offset_x:offset_x+new_w] = game_resized
-            
-            # 游戏画面边框
-            cv2.rectangle(canvas, (offset_x-2, offset_y-2), 
-                         (offset_x+new_w+2, offset_y+new_h+2), (0, 200, 200), 2)
+            with metrics.timed('surfarray.array3d', self):
+                game_image = self.pygame_surface_to_cv2(self.game_surface)
         
-        elif self.game_state == "INTRO":
-            # 等待开始状态
-            overlay = canvas.copy()
-            cv2.rectangle(overlay, (0, 0), (self.canvas_w - self.sidebar_w, self.canvas_h), (0, 0, 0), -1)
-            cv2.addWeighted(overlay, 0.7, canvas, 0.3, 0, canvas)
-            
-            font = cv2.FONT_HERSHEY_TRIPLEX
-            text = "CLICK START TO PLAY"
-            text_size = cv2.getTextSize(text, font, 1.5, 2)[0]
-            text_x = (self.canvas_w - self.sidebar_w - text_size[0]) // 2
-            text_y = self.canvas_h // 2
-            cv2.putText(canvas, text, (text_x, text_y), font, 1.5, (0, 255, 255), 2)
+        # 3. 取出画布（背景、边栏和标题来自缓存），画游戏区：等待画面每块缓冲只画一次
+        canvas = self.compositor.begin('sidebar', self.draw_static_layer)
+        self.compositor.draw('game', 'intro' if game_image is None else None,
+                             lambda view: self.draw_game_area(view, game_image))
         
-        # 4. 绘制右侧边栏
-        sidebar_x = self.canvas_w - self.sidebar_w
-        cv2.rectangle(canvas, (sidebar_x, 0), (self.canvas_w, self.canvas_h), (15, 15, 15), -1)
-        cv2.line(canvas, (sidebar_x, 0), (sidebar_x, self.canvas_h), (100, 100, 100), 2)
+        # 4. 右侧边栏：方向指示（箭头尖会伸进摄像头画面，所以先画箭头再贴摄像头）
+        self.compositor.draw('arrow', command, lambda view: self.draw_arrow(view, command, 56, 56))
         
         # 摄像头画面
-        cam_w = self.sidebar_w - 20
-        cam_h = int(cam_w * 0.75)
-        cam_resized = cv2.resize(frame, (cam_w, cam_h))
-        cv2.rectangle(canvas, (sidebar_x + 8, 8), 
-                     (sidebar_x + 10 + cam_w + 2, 10 + cam_h + 2), (255, 255, 255), 2)
-        canvas[10:10+cam_h, sidebar_x+10:sidebar_x+10+cam_w] = cam_resized
-        
-        # 方向指示
-        info_start_y = 10 + cam_h + 50
-        self.draw_arrow(canvas, command, sidebar_x + self.sidebar_w // 2, info_start_y)
+        with metrics.timed('cv2.resize', self):
+            self.compositor.paste('camera', frame)
         
         # 文字信息
-        text_y = info_start_y + 100
-        line_height = 45
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        
-        cv2.putText(canvas, "PACMAN GAME", (sidebar_x + 20, text_y), 
-                   font, 0.8, (0, 255, 255), 2)
-        
         if self.game_state == "PLAYING":
-            cv2.putText(canvas, f"Score: {self.pacman_game.score}", 
-                       (sidebar_x + 20, text_y + line_height), font, 0.7, (255, 255, 255), 1)
-            cv2.putText(canvas, f"Lives: {self.pacman_game.lives}", 
-                       (sidebar_x + 20, text_y + line_height * 2), font, 0.7, (255, 255, 255), 1)
-            cv2.putText(canvas, f"Pellets: {self.pacman_game.map.remaining_pellets()}", 
-                       (sidebar_x + 20, text_y + line_height * 3), font, 0.7, (200, 200, 200), 1)
-            
-            # 游戏结束提示
-            if self.pacman_game.game_over:
-                overlay = canvas.copy()
-                cv2.rectangle(overlay, (0, 0), (self.canvas_w - self.sidebar_w, self.canvas_h), (0, 0, 0), -1)
-                cv2.addWeighted(overlay, 0.7, canvas, 0.3, 0, canvas)
-                
-                victory = self.pacman_game.map.remaining_pellets() == 0
-                text = "VICTORY!" if victory else "GAME OVER"
-                color = (0, 255, 0) if victory else (0, 0, 255)
-                text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_TRIPLEX, 2, 3)[0]
-                text_x = (self.canvas_w - self.sidebar_w - text_size[0]) // 2
-                cv2.putText(canvas, text, (text_x, self.canvas_h // 2 - 50), 
-                           cv2.FONT_HERSHEY_TRIPLEX, 2, color, 3)
-                
-                # 显示重启倒计时
-                remaining = max(0, self.restart_delay - self.game_over_timer)
-                restart_text = f"Restarting in {remaining:.1f}s"
-                restart_size = cv2.getTextSize(restart_text, cv2.FONT_HERSHEY_SIMPLEX, 1, 2)[0]
-                restart_x = (self.canvas_w - self.sidebar_w - restart_size[0]) // 2
-                cv2.putText(canvas, restart_text, (restart_x, self.canvas_h // 2 + 30), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+            lines = (
+                (f"Score: {self.pacman_game.score}", 0.7, (255, 255, 255)),
+                (f"Lives: {self.pacman_game.lives}", 0.7, (255, 255, 255)),
+                (f"Pellets: {self.pacman_game.map.remaining_pellets()}", 0.7, (200, 200, 200)),
+            )
         else:
-            cv2.putText(canvas, "Use hand gestures", 
-                       (sidebar_x + 20, text_y + line_height), font, 0.6, (200, 200, 200), 1)
-            cv2.putText(canvas, "to control Pacman", 
-                       (sidebar_x + 20, text_y + line_height * 2), font, 0.6, (200, 200, 200), 1)
+            lines = (
+                ("Use hand gestures", 0.6, (200, 200, 200)),
+                ("to control Pacman", 0.6, (200, 200, 200)),
+            )
+        self.compositor.draw('info', lines, lambda view: self.draw_info(view, lines))
         
         return canvas
     
@@ -288,15 +310,5 @@ class PacmanGameAdapter(BaseGame):
         cv2.line(img, p2, arrow_p2, color, thickness)
     
     def pygame_surface_to_cv2(self, surface):
-        """将 Pygame Surface 转换为 OpenCV 图像"""
-        # 获取 surface 的像素数据
-        w, h = surface.get_size()
-        buf = pygame.surfarray.array3d(surface)
-        
-        # Pygame 使用 (width, height, channels)，需要转置为 (height, width, channels)
-        img = np.transpose(buf, (1, 0, 2))
-        
-        # Pygame 使用 RGB，OpenCV 使用 BGR
-        img = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-        
-        return img
+        """将 Pygame Surface 转换为 OpenCV 图像（复用同一块缓冲，马上会被 resize 进画布）"""
+        return self.surface_bridge.convert(surface)
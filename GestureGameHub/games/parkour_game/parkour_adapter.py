@@ -5,6 +5,11 @@ import time
 import os
 import sys
 import mediapipe as mp
+from engine.metrics import metrics, timed_method
+from engine.pacing import FramePacer
+from games.detector_pool import detector_pool, release_detectors
+from games.compositor import CanvasCompositor
+from games.landmarks import to_array
 
 # 导入同级 src
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -13,6 +18,9 @@ sys.path.append(os.path.join(current_dir, 'src'))
 from parkour_core import ParkourCore
 from parkour_renderer import ParkourRenderer
 
+# 头部姿态用到的 FaceMesh 关键点：鼻尖、左眼角、右眼角、下巴、额头
+HEAD_POSE_POINTS = [1, 33, 263, 152, 10]
+
 class ParkourGame:
     def __init__(self):
         self.canvas_w, self.canvas_h = 1280, 720
@@ -22,10 +30,12 @@ class ParkourGame:
         # 实例化核心与渲染器
         self.core = ParkourCore()
         self.renderer = ParkourRenderer(self.game_w, self.canvas_h)
+        self.setup_compositor()
         
         # MediaPipe 面部控制
         self.mp_face_mesh = mp.solutions.face_mesh
-        self.face_mesh = self.mp_face_mesh.FaceMesh(
+        self.face_mesh = detector_pool.lease(
+            'face_mesh',
             max_num_faces=1,
             refine_landmarks=True,
             min_detection_confidence=0.5,
@@ -38,17 +48,43 @@ class ParkourGame:
         self.head_pose = "CENTER"
         self.last_action_time = 0
         self.move_cooldown = 0.35 # 稍微缩短冷却
+        self.pacer = FramePacer(30)
+
+    def close(self):
+        release_detectors(self, 'face_mesh')
+
+    def setup_compositor(self):
+        """侧边栏布局：背景、标题和玩法提示只画一次，每帧只重画摄像头和指令"""
+        self.compositor = CanvasCompositor(self.canvas_w, self.canvas_h)
+        self.cam_w = self.sidebar_w - 20
+        self.cam_h = int(self.cam_w * 0.75)
+        self.cam_y = 20
+        self.info_y = self.cam_y + self.cam_h + 50
+        self.compositor.add_slot('camera', self.game_w + 10, self.cam_y, self.cam_w, self.cam_h)
+        self.compositor.add_slot('cmd', self.game_w, self.info_y + 15, self.sidebar_w, 50)
+
+    def draw_sidebar(self, layer):
+        # 侧边栏背景
+        cv2.rectangle(layer, (self.game_w, 0), (self.canvas_w, self.canvas_h), (20, 10, 30), -1)
+        cv2.putText(layer, "HEAD CONTROL", (self.game_w+20, self.info_y), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 0, 255), 2)
+        
+        # 玩法提示
+        help_y = self.info_y + 120
+        instructions = [
+            ("LEFT/RIGHT", "Change Lane"),
+            ("NOD UP", "Jump"),
+            ("NOD DOWN", "Slide")
+        ]
+        for i, (act, desc) in enumerate(instructions):
+            cv2.putText(layer, act, (self.game_w+20, help_y + i*60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 1)
+            cv2.putText(layer, desc, (self.game_w+20, help_y + i*60 + 25), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
 
     def detect_head_pose(self, landmarks):
-        """头部姿态检测 (复用原逻辑)"""
-        nose = landmarks[1]
-        left_eye = landmarks[33]
-        right_eye = landmarks[263]
-        chin = landmarks[152]
-        forehead = landmarks[10]
+        """头部姿态检测 (复用原逻辑)，只转换用到的 5 个关键点"""
+        nose, left_eye, right_eye, chin, forehead = to_array(landmarks, HEAD_POSE_POINTS).astype(np.float64)
 
-        yaw_diff = nose.x - (left_eye.x + right_eye.x) / 2
-        pitch_diff = nose.y - (forehead.y + chin.y) / 2
+        yaw_diff = nose[0] - (left_eye[0] + right_eye[0]) / 2
+        pitch_diff = nose[1] - (forehead[1] + chin[1]) / 2
 
         YAW_THRESH = 0.05    
         PITCH_THRESH_UP = 0.025 
@@ -60,15 +96,23 @@ class ParkourGame:
         if yaw_diff > YAW_THRESH: return "RIGHT" 
         return "CENTER"
 
-    def process(self, frame):
+    def detect(self, frame):
         # 1. 摄像头识别
         rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.face_mesh.process(rgb_frame)
+        with metrics.timed('face_mesh.process', self):
+            return self.face_mesh.process(rgb_frame)
 
+    @timed_method('process')
+    def process(self, frame):
+        results = self.detect(frame)
+        return self.update_and_draw(frame, results)
+
+    def update_and_draw(self, frame, results):
+        step = self.pacer.tick() * self.pacer.target_fps
         head_cmd = "CENTER"
         if results.multi_face_landmarks:
             for face_landmarks in results.multi_face_landmarks:
-                head_cmd = self.detect_head_pose(face_landmarks.landmark)
+                head_cmd = self.detect_head_pose(face_landmarks)
                 self.head_pose = head_cmd 
 
         # 2. 触发逻辑
@@ -90,27 +134,21 @@ class ParkourGame:
             elif trigger_action == "DOWN": self.core.start_game(90)
         
         elif self.core.state == "PLAYING":
-            self.core.update(trigger_action)
+            self.core.update(trigger_action, step)
         
         elif self.core.state == "GAME_OVER":
             if time.time() - self.core.death_time > 5:
                 self.core.state = "SELECT_TIME"
 
         # 4. 渲染游戏画面 (Pygame)
-        self.renderer.draw(self.core)
-        game_img = self.renderer.get_image()
-
-        # 5. 拼接侧边栏 (Opencv)
-        combined = np.zeros((self.canvas_h, self.canvas_w, 3), dtype=np.uint8)
-        combined[:, :self.game_w] = game_img
-        
-        # 侧边栏背景
-        cv2.rectangle(combined, (self.game_w, 0), (self.canvas_w, self.canvas_h), (20, 10, 30), -1)
+        with metrics.timed('pygame.draw', self):
+            self.renderer.draw(self.core)
+        # 5. 拼接侧边栏 (Opencv)：游戏画面直接写进画布左侧，侧边栏静态部分来自缓存
+        combined = self.compositor.begin('sidebar', self.draw_sidebar)
+        with metrics.timed('surfarray.array3d', self):
+            self.renderer.get_image(out=combined[:, :self.game_w])
         
         # 小摄像头 (画中画)
-        cw = self.sidebar_w - 20
-        ch = int(cw * 0.75)
-        
         vis_frame = frame.copy()
         if results.multi_face_landmarks:
              for face_landmarks in results.multi_face_landmarks:
@@ -118,26 +156,11 @@ class ParkourGame:
                     connections=self.mp_face_mesh.FACEMESH_TESSELATION,
                     connection_drawing_spec=self.mp_drawing_styles.get_default_face_mesh_tesselation_style())
                     
-        cam_small = cv2.resize(vis_frame, (cw, ch))
-        y_start = 20
-        combined[y_start:y_start+ch, self.game_w+10:self.game_w+10+cw] = cam_small
+        with metrics.timed('cv2.resize', self):
+            self.compositor.paste('camera', vis_frame)
         
         # 状态显示
-        info_y = y_start + ch + 50
-        cv2.putText(combined, "HEAD CONTROL", (self.game_w+20, info_y), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 0, 255), 2)
-        
         cmd_color = (0, 255, 0) if head_cmd != "CENTER" else (100, 100, 100)
-        cv2.putText(combined, f"CMD: {head_cmd}", (self.game_w+20, info_y + 50), cv2.FONT_HERSHEY_SIMPLEX, 1.2, cmd_color, 2)
-        
-        # 玩法提示
-        help_y = info_y + 120
-        instructions = [
-            ("LEFT/RIGHT", "Change Lane"),
-            ("NOD UP", "Jump"),
-            ("NOD DOWN", "Slide")
-        ]
-        for i, (act, desc) in enumerate(instructions):
-            cv2.putText(combined, act, (self.game_w+20, help_y + i*60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 1)
-            cv2.putText(combined, desc, (self.game_w+20, help_y + i*60 + 25), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+        self.compositor.text('cmd', f"CMD: {head_cmd}", (self.game_w+20, self.info_y + 50), cv2.FONT_HERSHEY_SIMPLEX, 1.2, cmd_color, 2)
 
         return combined
\ No newline at end of file
@@ -44,8 +44,11 @@ class ParkourCore:
         self.action_state = "RUN"
         self.spawn_timer = 0
 
-    def update(self, trigger_action=None):
-        """核心逻辑更新帧"""
+    def update(self, trigger_action=None, step=1.0):
+        """核心逻辑更新帧
+
+        step: 这一帧相当于 30FPS 下的几帧（速度和障碍物生成间隔都是按 30FPS 每帧设计的）
+        """
         if self.state != "PLAYING": return
 
         current_t = time.time()
@@ -81,7 +84,7 @@ class ParkourCore:
             if current_t - self.action_timer > self.slide_duration: self.action_state = "RUN"
 
         # 4. 障碍物生成逻辑
-        self.spawn_timer += 1
+        self.spawn_timer += step
         spawn_interval = max(35, int(80 - self.elapsed_time * 0.4))
         
         if self.spawn_timer > spawn_interval:
@@ -93,7 +96,7 @@ class ParkourCore:
             obs = self.obstacles[i]
             # 透视加速效果
             perspective_boost = 1.0 + (obs.z * 2.5) 
-            obs.z += current_speed * perspective_boost
+            obs.z += current_speed * perspective_boost * step
 
             if obs.z > 1.3: 
                 self.obstacles.pop(i)
@@ -1,11 +1,11 @@
 # games/parkour_game/src/parkour_renderer.py
 import pygame
-import cv2
-import numpy as np
 import time
 import math
 import random
 
+from games.surface_bridge import surface_to_bgr
+
 class ParkourRenderer:
     def __init__(self, w, h):
         pygame.init()
@@ -53,9 +53,9 @@ class ParkourRenderer:
         else:
             self._draw_hud(core)
             
-    def get_image(self):
-        view = pygame.surfarray.array3d(self.surface)
-        return cv2.cvtColor(view.transpose([1, 0, 2]), cv2.COLOR_RGB2BGR)
+    def get_image(self, out=None):
+        # out 可以直接是最终画布的切片，省掉中间数组
+        return surface_to_bgr(self.surface, out)
 
     def _draw_vaporwave_bg(self, core):
         # 天空
@@ -0,0 +1,181 @@
+# games/roi_tracker.py
+"""手部 ROI：只把上一帧手所在的区域交给 MediaPipe Hands
+
+RoiDetector 包在 Hands 外面，接口不变（process(image) 返回 results）：
+- 上一帧找到了手：以所有手的外接框为中心、加 padding 裁一个正方形区域去检测，
+  关键点再换算回整幅画面的归一化坐标（z 按裁剪宽度同比缩放），游戏拿到的坐标和原来一致
+- 区域里没找到（或找到的手比上次少）：同一帧退回整幅画面检测
+- 能识别多只手的游戏（max_hands > 已找到的手数）每 full_every 帧整幅画面检测一次，发现新进画面的手
+- 区域已经接近整幅画面时直接整幅检测
+
+裁剪图和整幅画面分别交给两个检测器：视频模式的 Hands 会沿用上一次输入里的跟踪框（归一化坐标），
+裁剪区域每帧都在移动、缩放，和整幅画面混着送进同一个检测器时跟踪框会指到错误的位置。
+所以裁剪图交给单独的 static_image_mode=True 检测器（每次都做手掌检测，没有跟踪状态），
+原来的检测器只看整幅画面，隔了几帧再用时先喂一张空白图清掉过期的跟踪框。
+
+静态模式每帧都要做手掌检测，省下的只有输入尺寸的差别：640x480 的画面上测不出收益
+（python benchmarks/bench_roi.py --recording 有手的录制.npz），所以只作为实验保留：
+游戏里默认不接入，手动在游戏里调用 use_roi() 并设置 GESTURE_HAND_ROI=1 才会生效。
+"""
+import os
+import time
+
+import numpy as np
+
+from .landmarks import to_array
+
+_BLANK = np.zeros((64, 64, 3), dtype=np.uint8)
+
+
+class RoiDetector:
+    """按上一帧的手部外接框裁剪后再检测
+
+    detector: 真正的 Hands（或任何 process(image) -> results 的对象），只处理整幅画面
+    crop_detector: 处理裁剪图的检测器，应当没有跟踪状态（static_image_mode=True）；None 时不裁剪
+    padding: 外接框每边额外留出的比例（相对于框的边长）
+    min_size: 裁剪区域的最小边长（相对于画面短边），手很小或很远时也留足余量
+    max_hands: 检测器最多识别几只手
+    full_every: 手数不满 max_hands 时每几帧整幅画面搜索一次
+    """
+
+    def __init__(self, detector, crop_detector=None, padding=0.6, min_size=0.35, max_hands=1, full_every=15):
+        self.detector = detector
+        self.crop_detector = crop_detector
+        self.padding = padding
+        self.min_size = min_size
+        self.max_hands = max_hands
+        self.full_every = full_every
+
+        self._box = None       # 上一帧手的外接框 (x0, y0, x1, y1)，整幅画面的归一化坐标
+        self._expected = 0     # 上一帧找到的手数
+        self._since_full = 0
+        self._full_stale = False  # 上一帧没有交给整幅画面的检测器，它的跟踪框已经过期
+
+        self.frames = 0
+        self.roi_hits = 0
+        self.roi_misses = 0
+        self.full_searches = 0
+        self._roi_pixels = 0
+        self._seconds = 0.0
+
+    def process(self, image):
+        start = time.perf_counter()
+        self.frames += 1
+        self._since_full += 1
+        try:
+            rect = self._crop_rect(image.shape[1], image.shape[0])
+            if rect is not None:
+                results = self._process_roi(image, rect)
+                if results is not None:
+                    return results
+            return self._process_full(image)
+        finally:
+            self._seconds += time.perf_counter() - start
+
+    def reset(self):
+        self._box = None
+        self._expected = 0
+        self._full_stale = False
+        if hasattr(self.detector, 'reset'):
+            self.detector.reset()
+
+    def close(self):
+        for detector in (self.detector, self.crop_detector):
+            if hasattr(detector, 'close'):
+                detector.close()
+
+    # --- 内部实现 ---
+    def _crop_rect(self, w, h):
+        """本帧的裁剪区域（像素），不该裁剪时返回 None"""
+        if self._box is None or self.crop_detector is None:
+            return None
+        if self._expected < self.max_hands and self._since_full >= self.full_every:
+            return None
+        x0, y0, x1, y1 = self._box
+        side = max((x1 - x0) * w, (y1 - y0) * h) * (1 + 2 * self.padding)
+        side = min(max(side, self.min_size * min(w, h)), min(w, h))
+        cx, cy = (x0 + x1) / 2 * w, (y0 + y1) / 2 * h
+        left = int(min(max(cx - side / 2, 0), w - side))
+        top = int(min(max(cy - side / 2, 0), h - side))
+        side = int(side)
+        # 裁剪区域占了大半幅画面时没有意义
+        if side * side > 0.6 * w * h:
+            return None
+        return left, top, left + side, top + side
+
+    def _process_roi(self, image, rect):
+        x0, y0, x1, y1 = rect
+        h, w = image.shape[:2]
+        crop = np.ascontiguousarray(image[y0:y1, x0:x1])
+        results = self.crop_detector.process(crop)
+        self._full_stale = True
+        hands = getattr(results, 'multi_hand_landmarks', None)
+        if not hands or len(hands) < self._expected:
+            self.roi_misses += 1
+            return None
+        self.roi_hits += 1
+        self._roi_pixels += crop.shape[0] * crop.shape[1]
+        sx, sy = (x1 - x0) / w, (y1 - y0) / h
+        ox, oy = x0 / w, y0 / h
+        for hand in hands:
+            for lm in hand.landmark:
+                lm.x = ox + lm.x * sx
+                lm.y = oy + lm.y * sy
+                lm.z = lm.z * sx
+        self._remember(hands)
+        return results
+
+    def _process_full(self, image):
+        self.full_searches += 1
+        self._since_full = 0
+        if self._full_stale:
+            # 检测不到手时 Hands 会丢掉跟踪框，下一帧重新做手掌检测（和 detector_pool 清状态的办法一样）
+            self.detector.process(_BLANK)
+            self._full_stale = False
+        results = self.detector.process(image)
+        self._remember(getattr(results, 'multi_hand_landmarks', None))
+        return results
+
+    def _remember(self, hands):
+        if not hands:
+            self._box = None
+            self._expected = 0
+            return
+        points = np.concatenate([to_array(hand) for hand in hands])
+        (x0, y0), (x1, y1) = points[:, :2].min(axis=0), points[:, :2].max(axis=0)
+        self._box = (float(x0), float(y0), float(x1), float(y1))
+        self._expected = len(hands)
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'roi_hits': self.roi_hits,
+            'roi_misses': self.roi_misses,
+            'full_searches': self.full_searches,
+            'mean_roi_pixels': self._roi_pixels // self.roi_hits if self.roi_hits else None,
+            'ms_per_frame': round(self._seconds * 1000 / self.frames, 2) if self.frames else None,
+        }
+
+
+def use_roi(game, attr='hands', max_hands=1, crop_detector=None):
+    """把 game.<attr> 上的 Hands 包成 RoiDetector（GESTURE_HAND_ROI=1 时才包装，否则返回 None）
+
+    游戏默认不调用它，需要对比时在游戏的 __init__ 里加上（见 benchmarks/bench_roi.py）。
+    裁剪图用的 static_image_mode 检测器从检测器池借，置信度和模型复杂度沿用 game.<attr> 借出时的配置，
+    游戏 close() 时 release_detectors 一起归还。
+    要和 games/tracking.py 的隔帧检测一起用时先调用本函数，跟踪器包在最外层。
+    """
+    if os.environ.get('GESTURE_HAND_ROI', '0') != '1':
+        return None
+    detector = getattr(game, attr, None)
+    if detector is None:
+        return None
+    if crop_detector is None:
+        from .detector_pool import detector_pool
+        leased = detector_pool.config_of(detector) or {}
+        config = {k: leased[k] for k in ('min_detection_confidence', 'model_complexity') if k in leased}
+        crop_detector = detector_pool.lease('hands', static_image_mode=True, max_num_hands=max_hands, **config)
+    roi = RoiDetector(detector, crop_detector, max_hands=max_hands)
+    setattr(game, attr, roi)
+    game.roi = roi
+    return roi
@@ -0,0 +1,194 @@
+# games/street_fighter/dataset.py
+"""动作数据集的二进制列式格式：每列一个定长文件，追加写入，np.memmap 直接读
+
+一个数据集是一个目录（默认 gesture_data_seq/），四个列文件按行对齐：
+    features.f32    (n, 63) float32  21 个点相对手腕的 (x, y, z)
+    labels.i16      (n,)    int16    动作标签（见 data_collector.LABELS）
+    sessions.u32    (n,)    uint32   采集会话号，窗口不会跨会话拼接
+    timestamps.f64  (n,)    float64  采集时间（time.time()）
+行数按最短的列算，采集中途被打断时多出的半行会被忽略。
+
+读取不用解析文本：load_dataset() 返回内存映射，window_view() 把 (n, 63) 的特征直接看成
+(n - window + 1, window * 63) 的滑动窗口（同一块内存换个 strides，不拷贝）。
+window_datasets() 一次给出多个窗口长度 / 步长的训练集，iter_windows() 按块产出窗口，
+数据集比内存大时也只有一块在内存里。
+"""
+import os
+import time
+from collections import namedtuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+FEATURE_DIM = 63
+COLUMNS = {
+    'features': ('features.f32', np.dtype('<f4'), (FEATURE_DIM,)),
+    'labels': ('labels.i16', np.dtype('<i2'), ()),
+    'sessions': ('sessions.u32', np.dtype('<u4'), ()),
+    'timestamps': ('timestamps.f64', np.dtype('<f8'), ()),
+}
+
+Dataset = namedtuple('Dataset', ['features', 'labels', 'sessions', 'timestamps'])
+
+
+def _row_bytes(dtype, shape):
+    return dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+
+
+def num_rows(path):
+    """数据集的完整行数（各列文件里都写全了的行）"""
+    counts = []
+    for filename, dtype, shape in COLUMNS.values():
+        file_path = os.path.join(path, filename)
+        size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
+        counts.append(size // _row_bytes(dtype, shape))
+    return min(counts)
+
+
+def load_dataset(path):
+    """以只读内存映射打开数据集；空数据集返回长度为 0 的数组"""
+    n = num_rows(path) if os.path.isdir(path) else 0
+    columns = {}
+    for name, (filename, dtype, shape) in COLUMNS.items():
+        if n == 0:
+            columns[name] = np.empty((0,) + shape, dtype=dtype)
+        else:
+            columns[name] = np.memmap(os.path.join(path, filename), dtype=dtype, mode='r', shape=(n,) + shape)
+    return Dataset(**columns)
+
+
+class DatasetWriter:
+    """采集时用：四个列文件整个会话只打开一次，攒够 buffer_rows 行再一起写
+
+    with DatasetWriter(path) as writer:
+        writer.append(row, label)
+    """
+
+    def __init__(self, path, session=None, buffer_rows=64):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.buffer_rows = buffer_rows
+        if session is None:
+            sessions = load_dataset(path).sessions
+            session = int(sessions[-1]) + 1 if len(sessions) else 0
+        self.session = session
+        self.rows = 0
+        self._pending = []
+        self._files = {}
+        # 先截掉上次中断留下的半行，保证各列对齐
+        n = num_rows(path)
+        for name, (filename, dtype, shape) in COLUMNS.items():
+            f = open(os.path.join(path, filename), 'ab')
+            f.truncate(n * _row_bytes(dtype, shape))
+            f.seek(0, os.SEEK_END)
+            self._files[name] = f
+
+    def append(self, features, label, timestamp=None):
+        features = np.asarray(features, dtype=np.float32).reshape(FEATURE_DIM)
+        self._pending.append((features, label, time.time() if timestamp is None else timestamp))
+        self.rows += 1
+        if len(self._pending) >= self.buffer_rows:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        features, labels, stamps = zip(*self._pending)
+        self._pending = []
+        chunks = {
+            'features': np.stack(features),
+            'labels': np.array(labels, dtype='<i2'),
+            'sessions': np.full(len(labels), self.session, dtype='<u4'),
+            'timestamps': np.array(stamps, dtype='<f8'),
+        }
+        for name, chunk in chunks.items():
+            self._files[name].write(chunk.tobytes())
+            self._files[name].flush()
+
+    def close(self):
+        if not self._files:
+            return
+        self.flush()
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def window_view(features, window):
+    """(n, dim) 的特征 → (n - window + 1, window * dim) 的滑动窗口视图，第 i 行是第 i..i+window-1 帧拼起来
+
+    特征按行连续存放时（内存映射的列文件、np.loadtxt 的结果）不拷贝数据，只读。
+    """
+    features = np.asarray(features)
+    n, dim = features.shape
+    if n < window:
+        return np.empty((0, window * dim), dtype=features.dtype)
+    # sliding_window_view 给出 (count, dim, window)，换轴后 (window, dim) 两维在内存里是连续的，reshape 不拷贝
+    windows = sliding_window_view(features, window, axis=0).swapaxes(1, 2)
+    return windows.reshape(len(windows), window * dim)
+
+
+def window_starts(labels, window, sessions=None, stride=1):
+    """可用窗口的起点：第 i 帧的窗口是 [i - window, i)，标签取第 i 帧，
+    要求第 i - window 帧和第 i 帧标签相同（和 train_model 原来的逐行循环一致），且属于同一个会话；
+    stride > 1 时只保留起点是 stride 倍数的窗口"""
+    labels = np.asarray(labels)
+    if len(labels) <= window:
+        return np.empty(0, dtype=np.intp)
+    same = labels[window:] == labels[:-window]
+    if sessions is not None:
+        sessions = np.asarray(sessions)
+        same &= sessions[window:] == sessions[:-window]
+    if stride > 1:
+        keep = np.zeros_like(same)
+        keep[::stride] = True
+        same &= keep
+    return np.flatnonzero(same)
+
+
+def take_windows(features, labels, window, starts):
+    """按起点取出窗口和标签；起点等间隔（全部可用、或按 stride 取且全部可用）时直接返回视图"""
+    windows = window_view(features, window)
+    step = int(starts[1] - starts[0]) if len(starts) > 1 else 1
+    if len(starts) and step > 0 and starts[-1] - starts[0] == step * (len(starts) - 1):
+        windows = windows[starts[0]:starts[-1] + 1:step]
+    else:
+        windows = windows[starts]
+    return windows, np.asarray(labels)[starts + window]
+
+
+def window_datasets(features, labels, windows=(5,), sessions=None, stride=1):
+    """多个窗口长度的训练集 {window: (X, y)}；标签和会话只读一次，特征共用同一份（内存映射的）数组"""
+    labels = np.asarray(labels)
+    sessions = None if sessions is None else np.asarray(sessions)
+    return {window: take_windows(features, labels, window, window_starts(labels, window, sessions, stride))
+            for window in windows}
+
+
+def iter_windows(features, labels, window, chunk=65536, sessions=None, stride=1):
+    """按块产出 (X, y)，每块最多 chunk 个窗口（拷贝出来的普通数组）
+
+    只有当前块涉及的行会从内存映射里读进来，适合比内存大的数据集或增量训练。
+    """
+    starts = window_starts(labels, window, sessions, stride)
+    view = window_view(features, window)
+    labels = np.asarray(labels)
+    for begin in range(0, len(starts), chunk):
+        part = starts[begin:begin + chunk]
+        yield np.array(view[part]), labels[part + window]
+
+
+def import_csv(csv_path, path, session=0):
+    """把旧的 gesture_data_seq.csv 导入成二进制数据集（整个 CSV 算一个会话）"""
+    data = np.loadtxt(csv_path, delimiter=',', skiprows=1, dtype=np.float64, ndmin=2)
+    with DatasetWriter(path, session=session, buffer_rows=4096) as writer:
+        for row in data:
+            writer.append(row[:FEATURE_DIM], int(row[FEATURE_DIM]), 0.0)
+    return writer.rows
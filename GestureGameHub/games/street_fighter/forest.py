@@ -0,0 +1,140 @@
+# games/street_fighter/forest.py
+"""随机森林的扁平化求值器：把 sklearn 的所有树拼成几个 NumPy 数组，一次走完所有树
+
+RandomForestClassifier.predict 每次调用都要做输入校验、按树分发（joblib）、逐树 predict_proba，
+单个样本也要 10ms 左右。这里把每棵树的节点数组首尾相接：
+    feature / threshold / left / right: 所有树的节点，left / right 已加上各树的偏移
+    叶子节点的 left / right 指向自己，最多走 max_depth 步所有树都停在叶子上
+    proba: 叶子节点的类别分布（每行归一化，和单棵树的 predict_proba 一致）
+每一步对所有树（和所有样本）同时做一次 x[feature] <= threshold，结果和 sklearn 完全一致
+（sklearn 同样先把输入转成 float32 再和阈值比较）。
+
+扁平化后的数组可以存成 .npz（export_forest），加载只要几毫秒，不用反序列化 sklearn：
+    python games/street_fighter/forest.py [gesture_model_seq.pkl] [gesture_model_seq.npz]
+文件里记录了源 .pkl 的 sha1，模型重新训练后旧的 .npz 不会被误用（train_model.py 训练完会顺带导出）。
+"""
+import os
+import sys
+
+import numpy as np
+
+try:
+    from games.exports import file_sha1, load_export
+except ImportError:  # 直接运行 games/street_fighter/ 下的脚本时仓库根目录不在 sys.path 上
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from games.exports import file_sha1, load_export
+
+FORMAT_VERSION = 1
+
+
+class FlatForest:
+    def __init__(self, roots, feature, threshold, left, right, proba, classes, n_features, max_depth):
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.feature = np.asarray(feature, dtype=np.intp)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left = np.asarray(left, dtype=np.intp)
+        self.right = np.asarray(right, dtype=np.intp)
+        self.proba = np.asarray(proba, dtype=np.float64)
+        self.classes_ = np.asarray(classes)
+        self.n_features_in_ = int(n_features)
+        self.max_depth = int(max_depth)
+
+    @classmethod
+    def from_model(cls, model):
+        trees = [est.tree_ for est in model.estimators_]
+        offsets = np.cumsum([0] + [t.node_count for t in trees])
+        roots = offsets[:-1].astype(np.intp)
+
+        left = np.concatenate([t.children_left for t in trees]).astype(np.intp)
+        right = np.concatenate([t.children_right for t in trees]).astype(np.intp)
+        nodes = np.arange(len(left), dtype=np.intp)
+        shift = np.repeat(roots, [t.node_count for t in trees])
+        leaf = left == -1
+        # 叶子的 feature 是 -2；指到 0 号特征上，反正左右都走回自己
+        feature = np.where(leaf, 0, np.concatenate([t.feature for t in trees]))
+
+        value = np.concatenate([t.value[:, 0, :] for t in trees]).astype(np.float64)
+        totals = value.sum(axis=1, keepdims=True)
+        totals[totals == 0] = 1.0
+        return cls(roots, feature, np.concatenate([t.threshold for t in trees]),
+                   np.where(leaf, nodes, left + shift), np.where(leaf, nodes, right + shift),
+                   value / totals, model.classes_, model.n_features_in_, max(t.max_depth for t in trees))
+
+    def save(self, path, source_sha1=''):
+        """存成 .npz：下标用 int32、特征号用 int16，只存叶子的类别分布（阈值保持 float64，保证比较结果不变）"""
+        nodes = np.arange(len(self.left))
+        leaf = self.left == nodes
+        np.savez_compressed(
+            path, version=np.int32(FORMAT_VERSION), source_sha1=np.str_(source_sha1),
+            roots=self.roots.astype(np.int32), feature=self.feature.astype(np.int16),
+            threshold=self.threshold, left=self.left.astype(np.int32), right=self.right.astype(np.int32),
+            leaf_nodes=nodes[leaf].astype(np.int32), leaf_proba=self.proba[leaf],
+            classes=self.classes_, n_features=np.int32(self.n_features_in_), max_depth=np.int32(self.max_depth))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version']) != FORMAT_VERSION:
+                raise ValueError(f"unsupported forest format {int(data['version'])}")
+            left = data['left']
+            proba = np.zeros((len(left), data['leaf_proba'].shape[1]), dtype=np.float64)
+            proba[data['leaf_nodes']] = data['leaf_proba']
+            forest = cls(data['roots'], data['feature'], data['threshold'], left, data['right'], proba,
+                         data['classes'], data['n_features'], data['max_depth'])
+            forest.source_sha1 = str(data['source_sha1'])
+        return forest
+
+    def leaves(self, X):
+        """每个样本在每棵树上落到的叶子，形状 (n_samples, n_trees)"""
+        X = np.asarray(X, dtype=np.float32).reshape(-1, self.n_features_in_)
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            moved = np.where(go_left, self.left[node], self.right[node])
+            # 大部分树比 max_depth 浅，全部停在叶子上就提前结束
+            if np.array_equal(moved, node):
+                break
+            node = moved
+        return node
+
+    def predict_proba(self, X):
+        return self.proba[self.leaves(X)].mean(axis=1)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def flatten_forest(model):
+    """能扁平化的模型（sklearn 的随机森林 / ExtraTrees 等投票的决策树集成）返回 FlatForest，否则返回 None"""
+    estimators = getattr(model, 'estimators_', None)
+    # 梯度提升的 estimators_ 是二维数组（每类一列回归树），不能按投票求平均
+    if estimators is None or len(estimators) == 0 or not all(hasattr(est, 'tree_') for est in estimators):
+        return None
+    if getattr(model, 'n_outputs_', 1) != 1:
+        return None
+    return FlatForest.from_model(model)
+
+
+def export_forest(model_path, out_path=None):
+    """把 joblib 存的随机森林导出成 .npz，返回输出路径"""
+    import joblib
+
+    out_path = out_path or os.path.splitext(model_path)[0] + '.npz'
+    forest = flatten_forest(joblib.load(model_path))
+    if forest is None:
+        raise ValueError(f"{model_path} is not a tree ensemble")
+    forest.save(out_path, file_sha1(model_path))
+    return out_path
+
+
+def load_forest(npz_path, model_path=None):
+    """加载导出的 .npz；文件不存在、格式不对或和 model_path 对不上（模型重新训练过）时返回 None"""
+    return load_export(npz_path, FlatForest.load, model_path)
+
+
+if __name__ == '__main__':
+    here = os.path.dirname(os.path.abspath(__file__))
+    source = sys.argv[1] if len(sys.argv) > 1 else os.path.join(here, 'gesture_model_seq.pkl')
+    target = sys.argv[2] if len(sys.argv) > 2 else None
+    print("导出完成:", export_forest(source, target))
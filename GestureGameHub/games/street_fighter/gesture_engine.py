@@ -2,28 +2,89 @@ import mediapipe as mp
 import os
 import joblib
 import numpy as np
-from collections import deque
 import time
 
+from games.landmarks import landmark_frame
+from games.street_fighter.forest import flatten_forest, load_forest
+
+FEATURE_DIM = 63  # 21 个点 × (x, y, z)，相对手腕
+PALM_POINTS = [0, 5, 9, 13, 17]  # 掌心位置取手腕和四个指根的平均
+MATCH_DISTANCE = 0.25  # 和上一帧的手超过这个距离（归一化坐标）就当成新出现的手
+SIDE_PENALTY = 0.15  # 左右手和上一帧不一致时加的距离
+MAX_MISSED = 15  # 连续这么多帧没出现就不再跟踪
+HEAL_DISTANCE = 0.15  # 两只手掌心距离小于它算双手合十
+
+
+class FeatureRing:
+    """预分配的 (window, dim) float32 滑动窗口
+
+    每一行同时写在 i 和 i + window 两个位置，所以最近 window 行（从旧到新）
+    总是缓冲区里连续的一段，view() 不用拷贝，reshape 成 (1, window * dim) 也不用拷贝。
+    """
+
+    def __init__(self, window, dim=FEATURE_DIM):
+        self.window = window
+        self._buf = np.zeros((2 * window, dim), dtype=np.float32)
+        self._pos = 0
+        self.count = 0
+
+    def push(self, row):
+        self._buf[self._pos] = row
+        self._buf[self._pos + self.window] = row
+        self._pos = (self._pos + 1) % self.window
+        self.count = min(self.count + 1, self.window)
+
+    def __len__(self):
+        return self.count
+
+    def view(self):
+        return self._buf[self._pos:self._pos + self.window]
+
+    def clear(self):
+        self._pos = 0
+        self.count = 0
+
+
+class HandSlot:
+    """被跟踪的一只手：稳定的 id、自己的滑动窗口和冷却时间"""
+
+    def __init__(self, hand_id, window):
+        self.id = hand_id
+        self.history = FeatureRing(window)
+        self.palm = None
+        self.side = None
+        self.missed = 0
+        self.cmd = None
+        self.last_cmd_time = 0
+
+
 class GestureEngine:
     def __init__(self):
         self.window_size = 5
-        self.history = deque(maxlen=self.window_size) # 滑动窗口
+        self.slots = [] # 正在跟踪的手，每只手一个滑动窗口
+        self._next_id = 1
         self.model = None
+        # 预测用的模型：默认用扁平化的随机森林（games/street_fighter/forest.py），
+        # 有导出的 gesture_model_seq.npz 时直接加载它，不反序列化 sklearn；GESTURE_FOREST=sklearn 时用 sklearn 原生的 predict
+        self.predictor = None
         
-        # 冷却系统
-        self.last_cmd = None
-        self.last_cmd_time = 0
+        # 冷却系统（动态动作，每只手单独计时，见 HandSlot）
         self.cooldown = 0.5 
         
         model_path = os.path.join(os.path.dirname(__file__), 'gesture_model_seq.pkl')
-        if os.path.exists(model_path):
+        use_flat = os.environ.get('GESTURE_FOREST', 'flat') != 'sklearn'
+        if use_flat:
+            self.predictor = load_forest(os.path.splitext(model_path)[0] + '.npz', model_path)
+        if self.predictor is None and os.path.exists(model_path):
             try:
                 self.model = joblib.load(model_path)
             except:
                 pass
-        else:
-            pass
+            if self.model is not None:
+                self.predictor = (use_flat and flatten_forest(self.model)) or self.model
+        if self.predictor is not None:
+            # 窗口长度跟着模型走（search_models.py 可能选出别的窗口长度）
+            self.window_size = getattr(self.predictor, 'n_features_in_', self.window_size * FEATURE_DIM) // FEATURE_DIM
 
         self.labels = {
             0: "IDLE", 1: "LEFT", 2: "RIGHT", 3: "JUMP", 
@@ -31,46 +92,97 @@ class GestureEngine:
         }
 
     def detect(self, results):
-        if not self.model or not results.multi_hand_landmarks:
+        """单人模式：返回第一只手（MediaPipe 给的 0 号手）的指令；两只手合在一起时返回 HEAL"""
+        slots = self.detect_hands(results)
+        if not slots:
             return None
+        if self.hands_together(slots):
+            return "HEAL"
+        return slots[0].cmd
 
-        # 1. 提取当前帧特征
-        hand_lms = results.multi_hand_landmarks[0]
-        row = []
-        base_x = hand_lms.landmark[0].x
-        base_y = hand_lms.landmark[0].y
-        base_z = hand_lms.landmark[0].z
-
-        for lm in hand_lms.landmark:
-            row.extend([lm.x - base_x, lm.y - base_y, lm.z - base_z])
-            
-        # 2. 加入历史队列
-        self.history.append(row)
-        
-        # 3. 数据不够 5 帧不预测
-        if len(self.history) < self.window_size:
-            return None
+    def detect_hands(self, results):
+        """每只手各自的指令：返回和 results 里的手一一对应的 HandSlot（.id 跨帧稳定，.cmd 是这一帧的指令）
 
-        # 4. 构造输入向量
-        input_vec = np.array(self.history).flatten().reshape(1, -1)
-        
-        # 5. 预测
+        所有凑满窗口的手合在一起调用一次 predict，两只手和一只手的推理开销几乎一样。
+        """
+        if self.predictor is None or not results.multi_hand_landmarks:
+            self._expire([])
+            return []
+
+        # 1. 提取当前帧特征：21 个点相对手腕的坐标（按 float64 相减，和采集训练数据时一致；
+        #    存成 float32 和 sklearn 预测前的转换一样，不影响结果）
+        frame = landmark_frame(results)
+        points = frame.hands.astype(np.float64)
+        rows = (points - points[:, :1]).reshape(len(points), -1)
+
+        # 2. 按位置和左右手把这一帧的手对应到已有的手上，写入各自的滑动窗口
+        slots = self._associate(points[:, PALM_POINTS, :2].mean(axis=1), frame.handedness)
+        for slot, row in zip(slots, rows):
+            slot.history.push(row)
+            slot.cmd = None
+
+        # 3. 数据不够 5 帧的手不预测
+        ready = [slot for slot in slots if len(slot.history) == self.window_size]
+        if not ready:
+            return slots
+
+        # 4. 构造输入（只有一只手时直接用窗口的连续视图，不拷贝）
+        if len(ready) == 1:
+            input_vec = ready[0].history.view().reshape(1, -1)
+        else:
+            input_vec = np.stack([slot.history.view().reshape(-1) for slot in ready])
+
+        # 5. 一次预测所有手
         try:
-            pred_idx = self.model.predict(input_vec)[0]
+            preds = self.predictor.predict(input_vec)
+        except:
+            return slots
+
+        current_time = time.time()
+        for slot, pred_idx in zip(ready, preds):
             cmd = self.labels.get(pred_idx, "IDLE")
-            
-            current_time = time.time()
-            
             # 静态动作：直接返回
             if pred_idx in [0, 1, 2, 7]:
-                return cmd
-            
-            # 动态动作：冷却判定
-            if current_time - self.last_cmd_time > self.cooldown:
-                self.last_cmd_time = current_time
-                return cmd
-            
-            return None 
-            
-        except:
-            return None
\ No newline at end of file
+                slot.cmd = cmd
+            # 动态动作：冷却判定（每只手单独冷却）
+            elif current_time - slot.last_cmd_time > self.cooldown:
+                slot.last_cmd_time = current_time
+                slot.cmd = cmd
+        return slots
+
+    def hands_together(self, slots):
+        """一左一右两只手掌心靠在一起（双手合十）"""
+        if len(slots) != 2 or slots[0].side == slots[1].side:
+            return False
+        return np.hypot(*(slots[0].palm - slots[1].palm)) < HEAL_DISTANCE
+
+    def _associate(self, palms, sides):
+        """贪心匹配：距离 + 左右手不一致的惩罚，最近的先配对；配不上的新开一只手"""
+        pairs = []
+        for i, slot in enumerate(self.slots):
+            dist = np.hypot(*(palms - slot.palm).T)
+            for j in range(len(palms)):
+                cost = dist[j] + (SIDE_PENALTY if sides[j] != slot.side else 0.0)
+                if cost < MATCH_DISTANCE:
+                    pairs.append((cost, i, j))
+        matched = [None] * len(palms)
+        used = set()
+        for cost, i, j in sorted(pairs):
+            if i not in used and matched[j] is None:
+                used.add(i)
+                matched[j] = self.slots[i]
+        for j, slot in enumerate(matched):
+            if slot is None:
+                slot = matched[j] = HandSlot(self._next_id, self.window_size)
+                self._next_id += 1
+                self.slots.append(slot)
+            slot.palm = palms[j]
+            slot.side = sides[j]
+        self._expire(matched)
+        return matched
+
+    def _expire(self, seen):
+        """这一帧没出现的手计数，连续 MAX_MISSED 帧没出现就丢掉（窗口重新开始）"""
+        for slot in self.slots:
+            slot.missed = 0 if any(slot is s for s in seen) else slot.missed + 1
+        self.slots = [slot for slot in self.slots if slot.missed <= MAX_MISSED]
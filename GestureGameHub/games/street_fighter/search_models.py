@@ -0,0 +1,221 @@
+"""动作模型搜索：多种模型 × 多个窗口长度，进程池并行，按采集会话分组交叉验证
+
+每个候选报告交叉验证准确率、单次预测耗时（和 GestureEngine.detect 一样每次一个窗口，
+森林按扁平化求值器计时）和模型文件大小；在耗时预算内选准确率最高的，保存成 gesture_model_seq.pkl
+（森林顺带导出 .npz）。GestureEngine 会按模型的特征数自动确定窗口长度。
+
+用法: python search_models.py [--windows 3,5,8] [--budget-ms 2] [--workers 4] [--folds 5] [--no-export]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+
+try:
+    from dataset import import_csv, load_dataset, take_windows, window_starts
+    from forest import flatten_forest
+    from train_model import save_model
+except ImportError:  # 作为 games.street_fighter.search_models 导入时（测试）
+    from games.street_fighter.dataset import import_csv, load_dataset, take_windows, window_starts
+    from games.street_fighter.forest import flatten_forest
+    from games.street_fighter.train_model import save_model
+
+# 候选模型：family + 参数；每个模型单线程训练，并行度交给进程池
+CANDIDATES = [
+    {'family': 'forest', 'n_estimators': 100},
+    {'family': 'forest', 'n_estimators': 50, 'max_depth': 16},
+    {'family': 'forest', 'n_estimators': 25, 'max_depth': 12},
+    {'family': 'extra_trees', 'n_estimators': 100},
+    {'family': 'hist_gbt', 'max_iter': 100, 'max_depth': 6},
+    {'family': 'mlp', 'hidden_layer_sizes': (64,)},
+]
+LATENCY_CALLS = 200
+
+
+def build_model(spec):
+    params = {k: v for k, v in spec.items() if k != 'family'}
+    family = spec['family']
+    if family == 'forest':
+        from sklearn.ensemble import RandomForestClassifier
+        return RandomForestClassifier(random_state=42, n_jobs=1, **params)
+    if family == 'extra_trees':
+        from sklearn.ensemble import ExtraTreesClassifier
+        return ExtraTreesClassifier(random_state=42, n_jobs=1, **params)
+    if family == 'hist_gbt':
+        from sklearn.ensemble import HistGradientBoostingClassifier
+        return HistGradientBoostingClassifier(random_state=42, **params)
+    if family == 'mlp':
+        from sklearn.neural_network import MLPClassifier
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
+        return make_pipeline(StandardScaler(), MLPClassifier(max_iter=500, random_state=42, **params))
+    raise ValueError(f"unknown model family: {family}")
+
+
+def describe(spec, window):
+    params = ', '.join(f"{k}={v}" for k, v in spec.items() if k != 'family')
+    return f"{spec['family']}({params}) w={window}"
+
+
+def session_folds(groups, folds):
+    """按会话分组的折：会话够多时用 GroupKFold；只有一个会话时按时间切成连续的块当作分组，
+    避免相邻（几乎重叠）的窗口同时出现在训练集和验证集里"""
+    from sklearn.model_selection import GroupKFold
+
+    if len(np.unique(groups)) < folds:
+        groups = np.arange(len(groups)) * folds // max(1, len(groups))
+    return list(GroupKFold(n_splits=folds).split(np.zeros(len(groups)), groups=groups))
+
+
+def predict_latency_ms(model, sample):
+    """单个窗口的预测耗时中位数；森林按游戏里用的扁平化求值器计"""
+    predictor = flatten_forest(model) or model
+    sample = np.ascontiguousarray(sample, dtype=np.float32).reshape(1, -1)
+    predictor.predict(sample)
+    times = []
+    for _ in range(LATENCY_CALLS):
+        start = time.perf_counter()
+        predictor.predict(sample)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times) * 1000.0)
+
+
+def model_size_kb(model):
+    """joblib 文件大小；能扁平化的森林按游戏实际加载的 .npz 算"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'model.pkl')
+        joblib.dump(model, path)
+        size = os.path.getsize(path)
+        forest = flatten_forest(model)
+        if forest is not None:
+            forest.save(os.path.join(tmp, 'model.npz'))
+            size = os.path.getsize(os.path.join(tmp, 'model.npz'))
+    return size / 1024.0
+
+
+def evaluate(job):
+    """进程池里执行：一个 (模型, 窗口长度) 组合的交叉验证 + 全量训练后的耗时 / 大小"""
+    spec, window, dataset_path, folds = job
+    from sklearn.metrics import accuracy_score
+
+    data = load_dataset(dataset_path)
+    starts = window_starts(data.labels, window, data.sessions)
+    X, y = take_windows(data.features, data.labels, window, starts)
+    X = np.asarray(X, dtype=np.float32)
+    groups = np.asarray(data.sessions)[starts + window]
+    result = {'spec': spec, 'window': window, 'name': describe(spec, window), 'samples': len(y)}
+    if len(np.unique(y)) < 2 or len(y) < folds * 2:
+        result['error'] = 'not enough data'
+        return result
+
+    start = time.perf_counter()
+    scores = []
+    for train_idx, test_idx in session_folds(groups, folds):
+        model = build_model(spec).fit(X[train_idx], y[train_idx])
+        scores.append(accuracy_score(y[test_idx], model.predict(X[test_idx])))
+    model = build_model(spec).fit(X, y)
+    result.update({
+        'accuracy': float(np.mean(scores)),
+        'accuracy_std': float(np.std(scores)),
+        'latency_ms': predict_latency_ms(model, X[0]),
+        'size_kb': model_size_kb(model),
+        'train_s': time.perf_counter() - start,
+    })
+    return result
+
+
+def run_search(dataset_path, candidates=CANDIDATES, windows=(5,), folds=5, workers=None):
+    """所有 (模型, 窗口长度) 组合并行评估，返回结果列表（和提交顺序一致）"""
+    jobs = [(spec, window, dataset_path, folds) for window in windows for spec in candidates]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [evaluate(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(evaluate, jobs))
+
+
+def choose(results, budget_ms):
+    """预算内准确率最高的；都超预算时选最快的"""
+    valid = [r for r in results if 'error' not in r]
+    if not valid:
+        return None
+    within = [r for r in valid if r['latency_ms'] <= budget_ms]
+    if within:
+        return max(within, key=lambda r: (r['accuracy'], -r['latency_ms']))
+    return min(valid, key=lambda r: r['latency_ms'])
+
+
+def export_best(best, dataset_path, model_path):
+    """用全部数据重新训练选中的组合并保存（森林顺带导出 .npz）"""
+    data = load_dataset(dataset_path)
+    X, y = take_windows(data.features, data.labels, best['window'],
+                        window_starts(data.labels, best['window'], data.sessions))
+    model = build_model(best['spec']).fit(np.asarray(X, dtype=np.float32), y)
+    save_model(model, model_path)
+    return model
+
+
+def dataset_for_search(current_dir, tmp):
+    """搜索要在子进程里打开数据集：有二进制数据集时直接用，只有旧 CSV 时先导入到临时目录"""
+    dataset_path = os.path.join(current_dir, 'gesture_data_seq')
+    if len(load_dataset(dataset_path).labels):
+        return dataset_path
+    csv_path = os.path.join(current_dir, 'gesture_data_seq.csv')
+    if not os.path.exists(csv_path):
+        return None
+    dataset_path = os.path.join(tmp, 'gesture_data_seq')
+    import_csv(csv_path, dataset_path)
+    return dataset_path
+
+
+def print_table(results, best):
+    print(f"{'model':<52} {'acc':>6} {'±':>5} {'ms/pred':>8} {'size KB':>8} {'train s':>8}")
+    for r in sorted(results, key=lambda r: -r.get('accuracy', -1)):
+        if 'error' in r:
+            print(f"{r['name']:<52} {r['error']}")
+            continue
+        mark = ' *' if r is best else ''
+        print(f"{r['name']:<52} {r['accuracy']:6.3f} {r['accuracy_std']:5.3f} {r['latency_ms']:8.3f} "
+              f"{r['size_kb']:8.0f} {r['train_s']:8.1f}{mark}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--windows', default='5', help="逗号分隔的窗口长度")
+    parser.add_argument('--budget-ms', type=float, default=2.0, help="单次预测耗时上限（每帧都要调用）")
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--no-export', action='store_true')
+    parser.add_argument('--json', help="把完整结果写到这个文件")
+    args = parser.parse_args()
+
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset_path = dataset_for_search(current_dir, tmp)
+        if dataset_path is None:
+            print("未找到数据！请先运行 data_collector.py")
+            return
+        windows = [int(w) for w in args.windows.split(',')]
+        print(f"搜索 {len(CANDIDATES) * len(windows)} 个组合，{args.folds} 折（按采集会话分组）...")
+        results = run_search(dataset_path, CANDIDATES, windows, args.folds, args.workers)
+        best = choose(results, args.budget_ms)
+        print_table(results, best)
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(results, f, indent=2, default=str)
+        if best is None:
+            print("没有可用的模型")
+            return
+        print(f"选中: {best['name']}（预算 {args.budget_ms} ms）")
+        if not args.no_export:
+            export_best(best, dataset_path, os.path.join(current_dir, 'gesture_model_seq.pkl'))
+            print("模型保存成功！")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,8 @@ class Fighter:
         self.update_time = pygame.time.get_ticks()
         self.rect = pygame.Rect((x, y, 80, 180))
         self.vel_y = 0
+        self.carry_x = 0  # Rect 只存整数，上一帧没走完的不足一像素的位移
+        self.carry_y = 0
         self.running = False
         self.jump = False
         self.attacking = False
@@ -36,8 +38,9 @@ class Fighter:
         return animation_list
 
     # 修改后的 move 方法，增加了 gesture_override 参数
-    def move(self, screen_width, screen_height, target, round_over, gesture_override=None):
-        SPEED = 10
+    # step: 这一帧相当于几个基准帧（dt * 基准帧率），速度、重力和攻击冷却都按它缩放；单机版每帧 1
+    def move(self, screen_width, screen_height, target, round_over, gesture_override=None, step=1):
+        SPEED = 10 * step
         GRAVITY = 2
         dx = 0
         dy = 0
@@ -80,7 +83,7 @@ class Fighter:
                     if key[pygame.K_t] or current_action == "SKILL":
                         self.attack_type = 2  # 这会触发 Wizard 的魔法阵动画
 
-            # 玩家 2 控制 (AI指令)
+            # 玩家 2 控制 (AI指令，双人模式下是 2P 的手势)
             if self.player == 2:
                 # 左移
                 if key[pygame.K_LEFT] or current_action == "LEFT":
@@ -95,17 +98,20 @@ class Fighter:
                     self.vel_y = -30
                     self.jump = True
                 # 攻击
-                if key[pygame.K_m] or key[pygame.K_n] or current_action == "ATTACK":
+                if key[pygame.K_m] or key[pygame.K_n] or current_action in ["ATTACK", "SKILL"]:
                     self.attack(target)
                     # 默认轻攻击
                     if key[pygame.K_m] or current_action == "ATTACK":
                         self.attack_type = 1
-                    if key[pygame.K_n]:
+                    # 重攻击 (双人模式下 2P 的技能手势)
+                    if key[pygame.K_n] or current_action == "SKILL":
                         self.attack_type = 2
 
-        # 应用重力
-        self.vel_y += GRAVITY
-        dy += self.vel_y
+        # 应用重力：按基准帧"先加速再移动"的轨迹精确积分，step=1 时和原来逐帧相同，任何帧率下跳跃高度都一样
+        dy += (self.vel_y + GRAVITY / 2) * step + GRAVITY * step * step / 2
+        self.vel_y += GRAVITY * step
+        dx += self.carry_x
+        dy += self.carry_y
 
         # 边界检测
         if self.rect.left + dx < 0:
@@ -125,11 +131,12 @@ class Fighter:
 
         # 攻击冷却
         if self.attack_cooldown > 0:
-            self.attack_cooldown -= 1
+            self.attack_cooldown = max(0, self.attack_cooldown - step)
 
-        # 更新位置
-        self.rect.x += dx
-        self.rect.y += dy
+        # 更新位置（不足一像素的部分留到下一帧）
+        self.carry_x, self.carry_y = dx - round(dx), dy - round(dy)
+        self.rect.x += round(dx)
+        self.rect.y += round(dy)
 
     def update(self):
         if self.health <= 0:
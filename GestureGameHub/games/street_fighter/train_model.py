@@ -1,48 +1,68 @@
-import pandas as pd
-import numpy as np
 import os
 import joblib
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score
 
+try:
+    from dataset import load_dataset, take_windows, window_starts
+    from forest import flatten_forest
+except ImportError:  # 作为 games.street_fighter.train_model 导入时（测试）
+    from games.street_fighter.dataset import load_dataset, take_windows, window_starts
+    from games.street_fighter.forest import flatten_forest
+from games.exports import file_sha1  # 直接运行时 forest 已把仓库根目录加进 sys.path
+
 # --- 配置 ---
 WINDOW_SIZE = 5  # 时间窗口：看过去 5 帧
 # 输入特征数 = 63 (单帧特征) * 5 (帧数) = 315
 
-def create_window_dataset(X, y, window_size):
-    """把连续的时间流数据转换成滑动窗口数据"""
-    Xs, ys = [], []
-    # 从第 N 帧开始，往前取 N 帧
-    for i in range(window_size, len(X)):
-        # 如果这几帧的标签不一样（说明动作切换了），丢弃
-        if y[i] != y[i-window_size]: 
-            continue
-            
-        # 展平窗口：[t-4, t-3, t-2, t-1, t] -> 一维向量
-        window = X[i-window_size:i].flatten()
-        Xs.append(window)
-        ys.append(y[i])
-        
-    return np.array(Xs), np.array(ys)
+def create_window_dataset(X, y, window_size, sessions=None, stride=1):
+    """把连续的时间流数据转换成滑动窗口数据
+
+    第 i 个样本是 X[i-N:i] 展平，标签取 y[i]；第 i-N 帧和第 i 帧标签不一样（说明动作切换了）或
+    不是同一次采集的就丢弃。窗口是 X 上的滑动窗口视图（见 dataset.window_view），
+    只在挑出可用窗口时拷贝一次；全部可用时直接返回视图。
+    """
+    return take_windows(X, y, window_size, window_starts(y, window_size, sessions, stride))
+
+def load_sequences(current_dir):
+    """逐帧的 (X, y, sessions)：优先读二进制数据集，没有时读旧的 CSV（sessions 为 None），都没有返回 None"""
+    dataset_path = os.path.join(current_dir, 'gesture_data_seq') # 二进制数据集（data_collector.py 采集）
+    data_path = os.path.join(current_dir, 'gesture_data_seq.csv') # 旧的 CSV 数据
+    data = load_dataset(dataset_path)
+    if len(data.labels):
+        # 内存映射，不用解析文本
+        return data.features, data.labels, data.sessions
+    if os.path.exists(data_path):
+        import pandas as pd
+        df = pd.read_csv(data_path)
+        return df.iloc[:, :-1].values, df.iloc[:, -1].values, None
+    return None
+
+def save_model(model, model_path):
+    """保存模型；能扁平化的森林顺带导出 .npz（游戏里直接加载它，见 forest.py），否则删掉旧的 .npz"""
+    joblib.dump(model, model_path)
+    npz_path = os.path.splitext(model_path)[0] + '.npz'
+    forest = flatten_forest(model)
+    if forest is not None:
+        forest.save(npz_path, file_sha1(model_path))
+        return npz_path
+    if os.path.exists(npz_path):
+        os.remove(npz_path)
+    return None
 
 def train():
     current_dir = os.path.dirname(__file__)
-    data_path = os.path.join(current_dir, 'gesture_data_seq.csv') # 读取新文件
     model_path = os.path.join(current_dir, 'gesture_model_seq.pkl')
     
-    if not os.path.exists(data_path):
+    print("正在处理时序数据...")
+    sequences = load_sequences(current_dir)
+    if sequences is None:
         print("未找到数据！请先运行 data_collector.py")
         return
-
-    print("正在处理时序数据...")
-    df = pd.read_csv(data_path)
-    
-    X_raw = df.iloc[:, :-1].values
-    y_raw = df.iloc[:, -1].values
     
     # 制作滑动窗口数据集
-    X, y = create_window_dataset(X_raw, y_raw, WINDOW_SIZE)
+    X, y = create_window_dataset(*sequences[:2], WINDOW_SIZE, sequences[2])
     
     print(f"数据集构建完成: {X.shape[0]} 个样本，每个样本 {X.shape[1]} 维特征")
     
@@ -55,8 +75,10 @@ def train():
     acc = accuracy_score(y_test, clf.predict(X_test))
     print(f"模型准确率: {acc:.2f}")
     
-    joblib.dump(clf, model_path)
+    exported = save_model(clf, model_path)
     print("模型保存成功！")
+    if exported:
+        print("已导出:", exported)
 
 if __name__ == "__main__":
-    train()
\ No newline at end of file
+    train()
@@ -1,7 +1,6 @@
 import cv2
 import mediapipe as mp
 import pygame
-import numpy as np
 import os
 import sys
 import random
@@ -12,14 +11,24 @@ sys.path.append(os.path.join(current_dir, 'street_fighter')) # 导入 gesture_en
 
 from fighter import Fighter
 from gesture_engine import GestureEngine # 引入新文件
+from engine.metrics import metrics, timed_method
+from engine.pacing import FramePacer
+from games.surface_bridge import surface_to_bgr
+from games.detector_pool import detector_pool, release_detectors
+from games.compositor import CanvasCompositor
 
 class StreetFighterAdapter:
+    FPS = 30  # Fighter.move 的速度、重力和冷却按每秒 30 帧的基准帧设定
+
     def __init__(self):
         pygame.init()
         try: pygame.mixer.init()
         except: pass 
         
         self.gesture_engine = GestureEngine() # 初始化新引擎
+        # 1: 玩家对电脑；2: 两个人对打，画面左半边的手控制 1P、右半边的手控制 2P（/play/street_fighter?players=2）
+        self.players = 1
+        self.set_players(os.environ.get('STREET_FIGHTER_PLAYERS', 1))
 
         self.WIDTH = 1280
         self.HEIGHT = 720
@@ -49,9 +58,66 @@ class StreetFighterAdapter:
         self.fighter_2 = Fighter(2, 980, 430, True, WIZARD_DATA, wizard_sheet, WIZARD_STEPS, DummySound())
         
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(model_complexity=0, max_num_hands=2, min_detection_confidence=0.5, min_tracking_confidence=0.5)
+        self.hands = detector_pool.lease('hands', model_complexity=0, max_num_hands=2, min_detection_confidence=0.5, min_tracking_confidence=0.5)
         
         self.round_over = False
+        # 运动按真实帧间隔推进，帧率变化时游戏速度不变
+        self.pacer = FramePacer(self.FPS)
+        self.setup_compositor()
+
+    def close(self):
+        release_detectors(self, 'hands')
+
+    def set_players(self, players):
+        self.players = 2 if str(players) == '2' else 1
+
+    def player_commands(self, results):
+        """双人模式：每只手按掌心在画面哪一半分给 1P / 2P（画面已镜像，左半边就是左边的玩家）"""
+        cmds = {}
+        for slot in self.gesture_engine.detect_hands(results):
+            player = 1 if slot.palm[0] < 0.5 else 2
+            cmds.setdefault(player, slot.cmd)
+        return cmds.get(1), cmds.get(2)
+
+    @staticmethod
+    def fighter_command(cmd):
+        # 映射指令到 Fighter (SKILL_1 -> Attack 1, SKILL_2 -> Attack 2)
+        # 注意：fighter.py 的 move 方法需要能处理这些字符串
+        # 为了兼容，我们把它们映射回 fighter 能听懂的简单指令
+        if cmd == "SKILL_1": return "ATTACK" # 映射到轻攻击/重攻击
+        if cmd == "SKILL_2": return "SKILL"  # 映射到 Skill (我们在 fighter.py 改过的 Attack 2)
+        return cmd
+
+    def setup_compositor(self):
+        """侧边栏布局：背景和标题只画一次，每帧只重画摄像头和识别到的指令"""
+        self.SIDEBAR_WIDTH = 400
+        self.compositor = CanvasCompositor(self.WIDTH + self.SIDEBAR_WIDTH, self.HEIGHT)
+        self.cam_h = int(480 * self.SIDEBAR_WIDTH / 640)
+        self.info_y = self.cam_h + 40
+        self.compositor.add_slot('camera', self.WIDTH, 0, self.SIDEBAR_WIDTH, self.cam_h)
+        self.compositor.add_slot('cmd', self.WIDTH, self.info_y + 5, self.SIDEBAR_WIDTH, 100)
+
+    def draw_sidebar(self, layer):
+        layer[0:self.HEIGHT, self.WIDTH:] = (30, 30, 35)
+        cv2.putText(layer, "NEURAL ENGINE:", (self.WIDTH + 20, self.info_y), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (150, 150, 150), 1)
+
+    def draw_command(self, view, cmd, cmd_2=None):
+        # view 是标题下方的指令区域，坐标相对于它的左上角（区域从标题基线下 5px 开始）
+        iy = -5
+        if self.players == 2:
+            for i, (label, c) in enumerate((("1P", cmd), ("2P", cmd_2))):
+                color = (0, 255, 0) if c else (80, 80, 80)
+                cv2.putText(view, f"{label} {c or '...'}", (20, iy + 40 + 45 * i), cv2.FONT_HERSHEY_SIMPLEX, 1.1, color, 2)
+        elif cmd:
+            color = (0, 255, 0)
+            if cmd == "ATTACK": color = (0, 0, 255)
+            elif "SKILL" in cmd: color = (0, 255, 255)
+            elif cmd == "HEAL": color = (255, 0, 255)
+            cv2.putText(view, f"{cmd}", (20, iy + 50), cv2.FONT_HERSHEY_SIMPLEX, 1.8, color, 3)
+            if cmd == "HEAL":
+                cv2.putText(view, "+ HP RECOVERING", (20, iy + 90), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 0, 255), 2)
+        else:
+            cv2.putText(view, "SEARCHING...", (20, iy + 50), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (80, 80, 80), 2)
 
     def draw_health_bar(self, health, x, y):
         ratio = health / 100
@@ -59,20 +125,34 @@ class StreetFighterAdapter:
         pygame.draw.rect(self.screen, (255, 0, 0), (x, y, 400, 30))
         pygame.draw.rect(self.screen, (255, 255, 0), (x, y, 400 * ratio, 30))
 
-    def process(self, frame):
-        # A. 识别
+    def detect(self, frame):
+        # A. 识别 (在 640x480 的小图上做，省算力)
         frame_small = cv2.resize(frame, (640, 480))
         rgb = cv2.cvtColor(frame_small, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(rgb)
-        
-        # 调用新引擎
-        cmd = self.gesture_engine.detect(results)
+        with metrics.timed('hands.process', self):
+            return self.hands.process(rgb)
+
+    @timed_method('process')
+    def process(self, frame):
+        results = self.detect(frame)
+        return self.update_and_draw(frame, results)
+
+    def update_and_draw(self, frame, results):
+        frame_small = cv2.resize(frame, (640, 480))
+
+        # 调用新引擎（双人模式下两只手一次推理）
+        with metrics.timed('gesture_engine.detect', self):
+            if self.players == 2:
+                cmd, cmd_2 = self.player_commands(results)
+            else:
+                cmd, cmd_2 = self.gesture_engine.detect(results), None
         
         if results.multi_hand_landmarks:
             for hand_lms in results.multi_hand_landmarks:
                 mp.solutions.drawing_utils.draw_landmarks(frame_small, hand_lms, self.mp_hands.HAND_CONNECTIONS)
 
         # B. 游戏逻辑
+        step = self.pacer.tick() * self.FPS
         self.screen.blit(self.bg_image, (0, 0))
         self.draw_health_bar(self.fighter_1.health, 20, 20)
         self.draw_health_bar(self.fighter_2.health, self.WIDTH - 420, 20)
@@ -80,9 +160,11 @@ class StreetFighterAdapter:
         if self.round_over == False:
             # P1 回血逻辑 (直接在这里处理)
             if cmd == "HEAL" and self.fighter_1.health < 100:
-                self.fighter_1.health += 0.5
+                self.fighter_1.health = min(100, self.fighter_1.health + 0.5 * step)
+            if cmd_2 == "HEAL" and self.fighter_2.health < 100:
+                self.fighter_2.health = min(100, self.fighter_2.health + 0.5 * step)
 
-            # AI
+            # AI（双人模式下由 2P 的手势控制）
             p1_x = self.fighter_1.rect.centerx
             p2_x = self.fighter_2.rect.centerx
             dist_x = abs(p1_x - p2_x)
@@ -94,16 +176,11 @@ class StreetFighterAdapter:
                 if dice < 2: ai_cmd = "JUMP"
                 elif dice < 5: ai_cmd = "ATTACK"
                 elif dice < 15: ai_cmd = "RIGHT" if random.random() > 0.5 else "LEFT"
+            if self.players == 2:
+                ai_cmd = self.fighter_command(cmd_2)
 
-            # 映射指令到 Fighter (SKILL_1 -> Attack 1, SKILL_2 -> Attack 2)
-            # 注意：fighter.py 的 move 方法需要能处理这些字符串
-            # 为了兼容，我们把它们映射回 fighter 能听懂的简单指令
-            fighter_cmd = cmd
-            if cmd == "SKILL_1": fighter_cmd = "ATTACK" # 映射到轻攻击/重攻击
-            if cmd == "SKILL_2": fighter_cmd = "SKILL"  # 映射到 Skill (我们在 fighter.py 改过的 Attack 2)
-            
-            self.fighter_1.move(self.WIDTH, self.HEIGHT, self.fighter_2, self.round_over, fighter_cmd)
-            self.fighter_2.move(self.WIDTH, self.HEIGHT, self.fighter_1, self.round_over, ai_cmd)
+            self.fighter_1.move(self.WIDTH, self.HEIGHT, self.fighter_2, self.round_over, self.fighter_command(cmd), step)
+            self.fighter_2.move(self.WIDTH, self.HEIGHT, self.fighter_1, self.round_over, ai_cmd, step)
             
             self.fighter_1.update()
             self.fighter_2.update()
@@ -116,45 +193,27 @@ class StreetFighterAdapter:
             cx, cy = self.WIDTH // 2, self.HEIGHT // 2
             self.screen.blit(vic_img, (cx - 300, cy - 200))
             font = pygame.font.SysFont(None, 100)
-            text = font.render("PLAYER 1 WINS!" if self.fighter_1.alive else "COMPUTER WINS!", True, (0, 255, 0) if self.fighter_1.alive else (255, 0, 0))
+            loser = "PLAYER 2 WINS!" if self.players == 2 else "COMPUTER WINS!"
+            text = font.render("PLAYER 1 WINS!" if self.fighter_1.alive else loser, True, (0, 255, 0) if self.fighter_1.alive else (255, 0, 0))
             tr = text.get_rect(center=(cx, cy))
             self.screen.blit(text, tr)
             self.fighter_1.update()
             self.fighter_2.update()
 
-        self.fighter_1.draw(self.screen)
-        self.fighter_2.draw(self.screen)
-        
-        # C. 侧边栏
-        game_view = pygame.surfarray.array3d(self.screen).transpose([1, 0, 2])
-        game_view = cv2.cvtColor(game_view, cv2.COLOR_RGB2BGR)
+        with metrics.timed('pygame.draw', self):
+            self.fighter_1.draw(self.screen)
+            self.fighter_2.draw(self.screen)
         
-        SIDEBAR_WIDTH = 400
-        total_width = self.WIDTH + SIDEBAR_WIDTH
-        combined_view = np.zeros((self.HEIGHT, total_width, 3), dtype=np.uint8)
+        # C. 侧边栏：背景和标题来自缓存，只重画摄像头和指令
+        combined_view = self.compositor.begin('sidebar', self.draw_sidebar)
         
-        combined_view[0:self.HEIGHT, 0:self.WIDTH] = game_view
-        combined_view[0:self.HEIGHT, self.WIDTH:total_width] = (30, 30, 35)
+        # 游戏画面直接写进画布左侧
+        with metrics.timed('surfarray.array3d', self):
+            surface_to_bgr(self.screen, combined_view[0:self.HEIGHT, 0:self.WIDTH])
         
-        ch, cw = frame_small.shape[:2]
-        scale = SIDEBAR_WIDTH / cw
-        nch = int(ch * scale)
-        cam = cv2.resize(frame_small, (SIDEBAR_WIDTH, nch))
-        combined_view[0:nch, self.WIDTH:total_width] = cam
+        with metrics.timed('cv2.resize', self):
+            self.compositor.paste('camera', frame_small)
         
-        iy = nch + 40
-        cv2.putText(combined_view, "NEURAL ENGINE:", (self.WIDTH + 20, iy), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (150, 150, 150), 1)
-        
-        if cmd:
-            color = (0, 255, 0)
-            if cmd == "ATTACK": color = (0, 0, 255)
-            elif "SKILL" in cmd: color = (0, 255, 255)
-            elif cmd == "HEAL": color = (255, 0, 255)
-            cv2.putText(combined_view, f"{cmd}", (self.WIDTH + 20, iy + 50), cv2.FONT_HERSHEY_SIMPLEX, 1.8, color, 3)
-            if cmd == "HEAL":
-                cv2.putText(combined_view, "+ HP RECOVERING", (self.WIDTH + 20, iy + 90), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 0, 255), 2)
-        else:
-            cv2.putText(combined_view, "SEARCHING...", (self.WIDTH + 20, iy + 50), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (80, 80, 80), 2)
-
+        self.compositor.draw('cmd', (self.players, cmd, cmd_2), lambda view: self.draw_command(view, cmd, cmd_2))
 
-        return combined_view
\ No newline at end of file
+        return combined_view
@@ -0,0 +1,229 @@
+# games/tracking.py
+"""关键点跟踪：每 N 帧才跑一次 MediaPipe，中间的帧按匀速运动预测关键点
+
+LandmarkTracker 包在 Hands / FaceMesh 外面，接口和它们一样（process(image) 返回 results），
+游戏的 check_collision / detect_gesture 等代码不用改：
+- 每 interval 帧跑一次真正的检测；画面变化太大（手挥得快）、上次检测太久以前时也立即检测
+- 中间的帧用最近两次检测估计出的速度外推关键点，返回和 mediapipe 字段一致的 RemoteResults
+- 上次没检测到手 / 脸时中间帧直接返回空结果
+
+各游戏的 N 在 TRACKING_PROFILES 里按适配器类名配置，GESTURE_TRACK_INTERVAL 可以统一覆盖（1 表示关闭）。
+stats() 给出推理比例、预测误差（每次真实检测时和预测值比较）和关键点的平均 / 最大时延。
+"""
+import os
+import time
+
+import cv2
+import numpy as np
+
+from engine.remote import build_results
+from .landmarks import to_array
+from .roi_tracker import RoiDetector
+
+# 各游戏的跟踪参数（按适配器类名）；没有列出的游戏用 default（不跟踪，每帧都检测）
+#   interval: 每几帧跑一次检测；motion: 相邻两帧缩略图的平均差异超过它就立即检测（0~1）
+TRACKING_PROFILES = {
+    'default': {'interval': 1, 'motion': 0.06},
+    # 切水果要跟手，挥得快时靠 motion 触发检测
+    'FruitNinjaGame': {'interval': 3, 'motion': 0.05},
+    'FingertipCatchAdapter': {'interval': 2, 'motion': 0.05},
+    # 只看手指方向，预测几帧完全够用
+    'PacmanGameAdapter': {'interval': 3, 'motion': 0.08},
+    'MazeGame': {'interval': 3, 'motion': 0.08},
+}
+
+# 算画面变化用的缩略图尺寸
+_THUMB_SIZE = (32, 24)
+
+
+def tracking_profile(game):
+    profile = dict(TRACKING_PROFILES['default'])
+    profile.update(TRACKING_PROFILES.get(type(game).__name__, {}))
+    override = os.environ.get('GESTURE_TRACK_INTERVAL')
+    if override:
+        profile['interval'] = max(1, int(override))
+    return profile
+
+
+def _points(landmark_list):
+    return to_array(landmark_list).astype(np.float64)
+
+
+class _Track:
+    """一只手（或一张脸）的位置和速度"""
+    __slots__ = ('points', 'velocity', 'measured', 'label', 'score')
+
+    def __init__(self, points, label=None, score=1.0):
+        self.points = points
+        self.velocity = np.zeros_like(points)
+        self.measured = False  # 速度是否已经由两次检测估计过
+        self.label = label
+        self.score = score
+
+
+class LandmarkTracker:
+    """隔帧检测 + 匀速预测
+
+    detector: 真正的 Hands / FaceMesh（或任何 process(image) -> results 的对象）
+    interval: 每几帧检测一次，1 表示每帧都检测
+    motion: 画面变化阈值，超过时本帧立即检测；None 表示不看画面变化
+    max_age: 距离上次检测超过这么多秒就不再预测，直接检测
+    smoothing: 速度估计的平滑系数（0~1，越大越相信最新的两次检测）
+    """
+
+    def __init__(self, detector, interval=2, motion=0.06, max_age=0.3, smoothing=0.6):
+        self.detector = detector
+        self.interval = max(1, int(interval))
+        self.motion = motion
+        self.max_age = max_age
+        self.smoothing = smoothing
+
+        self._hands = []
+        self._faces = []
+        self._results = None
+        self._detect_time = None
+        self._since_detect = 0
+        self._thumb = None
+
+        self.frames = 0
+        self.detections = 0
+        self.motion_triggered = 0
+        self.predicted = 0
+        self._detect_seconds = 0.0
+        self._error_sum = 0.0
+        self._hold_sum = 0.0
+        self._error_count = 0
+        self._age_sum = 0.0
+        self.max_age_seen = 0.0
+
+    # --- 和 Hands / FaceMesh 一样的接口 ---
+    def process(self, image, now=None):
+        now = time.perf_counter() if now is None else now
+        self.frames += 1
+        moved = self._motion(image)
+        self._since_detect += 1
+        stale = self._detect_time is None or now - self._detect_time > self.max_age
+        if stale or moved or self._since_detect >= self.interval:
+            if moved and not stale and self._since_detect < self.interval:
+                self.motion_triggered += 1
+            return self._detect(image, now)
+        if not self._hands and not self._faces:
+            return self._results
+        self.predicted += 1
+        age = now - self._detect_time
+        self._age_sum += age
+        self.max_age_seen = max(self.max_age_seen, age)
+        return self._predict(age)
+
+    def reset(self):
+        self._hands, self._faces = [], []
+        self._results = self._detect_time = self._thumb = None
+        self._since_detect = 0
+        if hasattr(self.detector, 'reset'):
+            self.detector.reset()
+
+    def close(self):
+        if hasattr(self.detector, 'close'):
+            self.detector.close()
+
+    # --- 内部实现 ---
+    def _motion(self, image):
+        """和上一帧比，缩略图平均差异是否超过阈值"""
+        if self.motion is None:
+            return False
+        thumb = cv2.resize(image, _THUMB_SIZE, interpolation=cv2.INTER_AREA)
+        previous, self._thumb = self._thumb, thumb
+        if previous is None or previous.shape != thumb.shape:
+            return False
+        return cv2.absdiff(thumb, previous).mean() / 255.0 > self.motion
+
+    def _detect(self, image, now):
+        start = time.perf_counter()
+        results = self.detector.process(image)
+        self._detect_seconds += time.perf_counter() - start
+        self.detections += 1
+        self._since_detect = 0
+
+        dt = now - self._detect_time if self._detect_time is not None else None
+        hands = []
+        for i, lms in enumerate(getattr(results, 'multi_hand_landmarks', None) or []):
+            cls = results.multi_handedness[i].classification[0] if getattr(results, 'multi_handedness', None) else None
+            hands.append(_Track(_points(lms), cls.label if cls else 'Right', cls.score if cls else 1.0))
+        faces = [_Track(_points(lms)) for lms in getattr(results, 'multi_face_landmarks', None) or []]
+        self._hands = self._update_tracks(self._hands, hands, dt)
+        self._faces = self._update_tracks(self._faces, faces, dt)
+        self._results = results
+        self._detect_time = now
+        return results
+
+    def _update_tracks(self, old, new, dt):
+        """新检测结果按顺序对上旧的轨迹（左右手要一致），更新速度并统计预测误差"""
+        if dt is None or dt <= 0 or dt > self.max_age or len(old) != len(new):
+            return new
+        for prev, track in zip(old, new):
+            if prev.label != track.label or prev.points.shape != track.points.shape:
+                continue
+            predicted = prev.points + prev.velocity * dt
+            self._error_sum += float(np.linalg.norm((predicted - track.points)[:, :2], axis=1).mean())
+            self._hold_sum += float(np.linalg.norm((prev.points - track.points)[:, :2], axis=1).mean())
+            self._error_count += 1
+            measured = (track.points - prev.points) / dt
+            if prev.measured:
+                measured = self.smoothing * measured + (1 - self.smoothing) * prev.velocity
+            track.velocity = measured
+            track.measured = True
+        return new
+
+    def _predict(self, age):
+        hands = [(t.points + t.velocity * age, t.label, t.score) for t in self._hands]
+        face = self._faces[0].points + self._faces[0].velocity * age if self._faces else None
+        return build_results(hands, face)
+
+    def stats(self):
+        return {
+            'interval': self.interval,
+            'frames': self.frames,
+            'detections': self.detections,
+            'motion_triggered': self.motion_triggered,
+            'predicted': self.predicted,
+            'inference_ratio': round(self.detections / self.frames, 3) if self.frames else None,
+            'detect_ms': round(self._detect_seconds * 1000 / self.detections, 2) if self.detections else None,
+            # 预测值和下一次真实检测之间的平均距离（归一化坐标，×画面宽度约等于像素）
+            'prediction_error': round(self._error_sum / self._error_count, 4) if self._error_count else None,
+            # 对照：中间帧直接沿用上次检测结果时的误差
+            'hold_error': round(self._hold_sum / self._error_count, 4) if self._error_count else None,
+            'mean_age_ms': round(self._age_sum * 1000 / self.predicted, 1) if self.predicted else 0.0,
+            'max_age_ms': round(self.max_age_seen * 1000, 1),
+        }
+
+
+def use_tracking(game, attr='hands'):
+    """按游戏的 TRACKING_PROFILES 配置，把 game.<attr> 上的检测器包成 LandmarkTracker
+
+    interval 为 1 时不包装，返回 None；包装后 game.tracker 指向跟踪器。
+    """
+    profile = tracking_profile(game)
+    detector = getattr(game, attr, None)
+    if detector is None or profile['interval'] <= 1:
+        return None
+    tracker = LandmarkTracker(detector, **profile)
+    setattr(game, attr, tracker)
+    game.tracker = tracker
+    return tracker
+
+
+def unwrap_detector(detector):
+    """跟踪器 / ROI 包装里真正的检测器（归还检测器池时用）"""
+    while isinstance(detector, (LandmarkTracker, RoiDetector)):
+        detector = detector.detector
+    return detector
+
+
+def crop_detectors(detector):
+    """包装链上 RoiDetector 另外借用的裁剪检测器（归还检测器池时用）"""
+    found = []
+    while isinstance(detector, (LandmarkTracker, RoiDetector)):
+        if getattr(detector, 'crop_detector', None) is not None:
+            found.append(detector.crop_detector)
+        detector = detector.detector
+    return found
@@ -0,0 +1,160 @@
+// static/remote_camera.js
+// 浏览器摄像头模式：页面地址带 ?camera=client 或 ?camera=landmarks 时启用
+//   client:    用 getUserMedia 采集本机摄像头，压缩成 JPEG 通过 WebSocket 发给服务器
+//   landmarks: 在浏览器里跑 MediaPipe，只发送关键点（每只手 21×3 个 float，约 260 字节）
+// 服务器处理后发回的画面直接替换页面上的游戏画面 <img>。
+(function () {
+    const params = new URLSearchParams(window.location.search);
+    const mode = params.get('camera');
+    if (mode !== 'client' && mode !== 'landmarks') return;
+
+    const img = document.querySelector('img.game-feed, #game-screen');
+    if (!img) return;
+
+    const WIDTH = 640, HEIGHT = 480, QUALITY = 0.7;
+    const gameName = window.location.pathname.split('/').filter(Boolean).pop();
+
+    const video = document.createElement('video');
+    video.muted = true;
+    video.playsInline = true;
+    const canvas = document.createElement('canvas');
+    canvas.width = WIDTH;
+    canvas.height = HEIGHT;
+    const ctx = canvas.getContext('2d');
+    // 和服务器摄像头一样做镜像翻转
+    ctx.setTransform(-1, 0, 0, 1, WIDTH, 0);
+
+    // 背压：最多 credits 帧在途，收到一帧结果或 credit 通知才补回一个额度
+    // 处理链中途丢帧时结果不会回来，超过 STALL_MS 没有结果就补回一个额度
+    const STALL_MS = 1000;
+    let credits = 0;
+    let encoding = false;
+    let lastReply = performance.now();
+    let lastUrl = null;
+
+    // 停止原来的 MJPEG 视频流，改为显示 WebSocket 返回的画面
+    img.removeAttribute('src');
+
+    const scheme = window.location.protocol === 'https:' ? 'wss' : 'ws';
+    const ws = new WebSocket(`${scheme}://${window.location.host}/ws/play?game_name=${encodeURIComponent(gameName)}`);
+    ws.binaryType = 'blob';
+
+    // --- 只传关键点模式 ---
+    const TASKS_VISION = 'https://cdn.jsdelivr.net/npm/@mediapipe/tasks-vision@0.10.11';
+    const MODELS = 'https://storage.googleapis.com/mediapipe-models';
+    // 跑酷用人脸关键点，其他游戏用手
+    const useFace = gameName === 'parkour';
+    const FACE_POINTS = 468;
+    let landmarker = null;
+
+    async function createLandmarker() {
+        const vision = await import(`${TASKS_VISION}/vision_bundle.mjs`);
+        const fileset = await vision.FilesetResolver.forVisionTasks(`${TASKS_VISION}/wasm`);
+        if (useFace) {
+            return vision.FaceLandmarker.createFromOptions(fileset, {
+                baseOptions: { modelAssetPath: `${MODELS}/face_landmarker/face_landmarker/float16/1/face_landmarker.task` },
+                runningMode: 'VIDEO',
+                numFaces: 1,
+            });
+        }
+        return vision.HandLandmarker.createFromOptions(fileset, {
+            baseOptions: { modelAssetPath: `${MODELS}/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task` },
+            runningMode: 'VIDEO',
+            numHands: 2,
+        });
+    }
+
+    // 二进制关键点包，格式见 engine/remote.py
+    // 视频没有翻转，所以 x 取 1 - x、左右手标签互换，和服务器摄像头的镜像画面保持一致
+    function landmarkPacket(result) {
+        const hands = useFace ? [] : result.landmarks;
+        const face = useFace && result.faceLandmarks.length ? result.faceLandmarks[0].slice(0, FACE_POINTS) : null;
+        const size = 5 + hands.length * (5 + 21 * 12) + (face ? 2 + face.length * 12 : 0);
+        const view = new DataView(new ArrayBuffer(size));
+        'LMK1'.split('').forEach((c, i) => view.setUint8(i, c.charCodeAt(0)));
+        view.setUint8(4, hands.length);
+        let offset = 5;
+        const writePoints = (points) => {
+            for (const p of points) {
+                view.setFloat32(offset, 1 - p.x, true);
+                view.setFloat32(offset + 4, p.y, true);
+                view.setFloat32(offset + 8, p.z, true);
+                offset += 12;
+            }
+        };
+        hands.forEach((points, i) => {
+            const category = (result.handednesses || result.handedness)[i][0];
+            view.setUint8(offset, category.categoryName === 'Left' ? 1 : 0);
+            view.setFloat32(offset + 1, category.score, true);
+            offset += 5;
+            writePoints(points);
+        });
+        if (face) {
+            view.setUint16(offset, face.length, true);
+            offset += 2;
+            writePoints(face);
+        }
+        return view.buffer;
+    }
+
+    function sendFrame() {
+        if (credits <= 0 && performance.now() - lastReply > STALL_MS) {
+            credits = 1;
+            lastReply = performance.now();
+        }
+        if (credits <= 0 || encoding || ws.readyState !== WebSocket.OPEN || video.readyState < 2) return;
+        if (mode === 'landmarks') {
+            if (!landmarker) return;
+            const result = landmarker.detectForVideo(video, performance.now());
+            credits -= 1;
+            ws.send(landmarkPacket(result));
+            return;
+        }
+        encoding = true;
+        ctx.drawImage(video, 0, 0, WIDTH, HEIGHT);
+        canvas.toBlob((blob) => {
+            encoding = false;
+            if (blob && ws.readyState === WebSocket.OPEN) {
+                credits -= 1;
+                ws.send(blob);
+            }
+        }, 'image/jpeg', QUALITY);
+    }
+
+    ws.onmessage = (event) => {
+        if (typeof event.data === 'string') {
+            const msg = JSON.parse(event.data);
+            if (msg.type === 'hello') credits = msg.credits;
+            if (msg.type === 'credit') credits += 1;
+            lastReply = performance.now();
+            return;
+        }
+        credits += 1;
+        lastReply = performance.now();
+        if (lastUrl) URL.revokeObjectURL(lastUrl);
+        lastUrl = URL.createObjectURL(event.data);
+        img.src = lastUrl;
+    };
+
+    ws.onclose = () => console.log('[remote camera] 连接已关闭');
+
+    navigator.mediaDevices.getUserMedia({ video: { width: WIDTH, height: HEIGHT }, audio: false })
+        .then((stream) => {
+            video.srcObject = stream;
+            return video.play();
+        })
+        .then(async () => {
+            if (mode === 'landmarks') landmarker = await createLandmarker();
+
+            (function loop() {
+                sendFrame();
+                requestAnimationFrame(loop);
+            })();
+        })
+        .catch((err) => console.error('[remote camera] 无法打开摄像头或加载模型:', err));
+
+    // 供页面上的按钮使用，如 remoteCamera.send({type: 'start'})
+    window.remoteCamera = {
+        send: (msg) => ws.readyState === WebSocket.OPEN && ws.send(JSON.stringify(msg)),
+    };
+})();
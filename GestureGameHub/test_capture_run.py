@@ -0,0 +1,55 @@
+from engine import FrameCapture, SyntheticSource, CameraService
+import time
+
+print('Start synthetic capture')
+cap = FrameCapture(SyntheticSource(width=320, height=240, fps=100), mirror=True).start()
+
+last_seq = None
+seqs = []
+stamps = []
+for i in range(10):
+    item = cap.read(last_seq, timeout=2.0)
+    assert item is not None, 'capture produced no frame'
+    seqs.append(item.seq)
+    stamps.append(item.timestamp)
+    last_seq = item.seq
+    # simulate a slow game frame: the capture thread keeps running meanwhile
+    time.sleep(0.05)
+
+print('Seqs read:', seqs)
+assert seqs == sorted(seqs) and len(set(seqs)) == len(seqs)
+assert stamps == sorted(stamps)
+skipped = seqs[-1] - seqs[0] + 1 - len(seqs)
+print('Frames skipped by slow consumer:', skipped)
+assert skipped > 0, 'slow consumer should pick the latest frame, not the next queued one'
+
+cap.stop()
+print('Stopped, running:', cap.running)
+
+print('Finite source ends the stream')
+cap = FrameCapture(SyntheticSource(width=64, height=48, fps=None, max_frames=5)).start()
+last_seq = None
+while True:
+    item = cap.read(last_seq, timeout=1.0)
+    if item is None:
+        break
+    last_seq = item.seq
+print('Ended:', cap.ended, 'captured:', cap.frames_captured)
+assert cap.ended and cap.frames_captured == 5
+
+print('Shared camera service')
+service = CameraService('synthetic:160x120@60')
+a = service.subscribe()
+b = service.subscribe()
+print('Stats with two subscribers:', service.stats())
+fa = a.read(timeout=2.0)
+fb = b.read(timeout=2.0)
+assert fa is not None and fb is not None
+# both streams see the same device, each with its own copy of the frame
+assert fa.frame is not fb.frame
+a.close()
+assert service.stats()['open'], 'device must stay open while a subscriber remains'
+b.close()
+print('Stats after last subscriber left:', service.stats())
+assert not service.stats()['open'] and service.stats()['subscribers'] == 0
+print('Test done')
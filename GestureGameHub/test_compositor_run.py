@@ -0,0 +1,90 @@
+from games.compositor import CanvasCompositor
+from engine.metrics import metrics
+import cv2
+import numpy as np
+
+W, H = 320, 200
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+static_calls = []
+
+
+def draw_static(layer):
+    static_calls.append(1)
+    layer[:] = (40, 40, 40)
+    cv2.putText(layer, 'TITLE', (200, 30), FONT, 0.8, (0, 255, 255), 2)
+    cv2.putText(layer, 'help text', (200, 180), FONT, 0.5, (200, 200, 200), 1)
+
+
+def reference(score, cam):
+    canvas = np.zeros((H, W, 3), dtype=np.uint8)
+    draw_static(canvas)
+    canvas[40:100, 200:280] = cv2.resize(cam, (80, 60))
+    cv2.putText(canvas, f'Score: {score}', (200, 130), FONT, 0.5, (255, 255, 255), 1)
+    return canvas
+
+
+def compose(comp, score, cam):
+    canvas = comp.begin('main', draw_static)
+    comp.paste('camera', cam)
+    comp.text('score', f'Score: {score}', (200, 130), FONT, 0.5, (255, 255, 255), 1)
+    return canvas
+
+
+comp = CanvasCompositor(W, H)
+comp.add_slot('camera', 200, 40, 80, 60)
+comp.add_slot('score', 195, 110, 125, 28)
+rng = np.random.default_rng(0)
+
+print('Matches a fresh canvas while scores change and frames are held')
+held = []
+for i in range(40):
+    score = i // 3
+    cam = rng.integers(0, 255, (48, 64, 3), dtype=np.uint8)
+    static_calls.clear()
+    out = compose(comp, score, cam)
+    # 模拟编码线程还拿着前几帧：被引用的缓冲不能被复用
+    held.append((out, reference(score, cam)))
+    if len(held) > 3:
+        held.pop(0)
+    for frame, expected in held:
+        assert np.array_equal(frame, expected), i
+    del out, frame
+assert len({id(b[0]) for b in comp._buffers}) == len(comp._buffers) <= comp.max_buffers
+print('buffers in ring:', len(comp._buffers))
+
+print('Static layer is drawn once per key')
+static_calls.clear()
+for _ in range(5):
+    compose(comp, 1, cam)
+assert not static_calls
+comp.begin('other', draw_static)
+assert len(static_calls) == 1
+
+print('Unchanged tokens skip the redraw')
+held.clear()
+compose(comp, 7, cam)
+painted = []
+assert comp.draw('score', 'same', lambda view: painted.append(1))
+assert not comp.draw('score', 'same', lambda view: painted.append(1))
+assert comp.draw('score', None, lambda view: painted.append(1))
+assert len(painted) == 2
+
+print('Painters are clipped to their slot')
+canvas = comp.begin('main', draw_static)
+comp.draw('score', 'big', lambda view: cv2.rectangle(view, (-50, -50), (500, 500), (0, 0, 255), -1))
+mask = np.zeros((H, W), dtype=bool)
+mask[110:138, 195:320] = True
+assert (canvas[mask] == (0, 0, 255)).all()
+assert not (canvas[~mask] == (0, 0, 255)).all(axis=-1).any()
+
+print('Overlay frames are fully restored')
+canvas = comp.begin('main', draw_static)
+canvas[150:200, 0:100] = 0
+metrics.overlay_enabled, was = True, metrics.overlay_enabled
+try:
+    del canvas
+    canvas = comp.begin('main', draw_static)
+    assert (canvas[150:200, 0:100] == 40).all()
+finally:
+    metrics.overlay_enabled = was
+print('Test done')
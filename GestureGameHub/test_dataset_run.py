@@ -0,0 +1,87 @@
+from games.street_fighter.dataset import DatasetWriter, load_dataset, num_rows, window_view, import_csv
+from games.street_fighter.dataset import iter_windows, window_datasets
+from games.street_fighter.train_model import create_window_dataset
+import numpy as np
+import os
+import tempfile
+
+
+def old_create_window_dataset(X, y, window_size):
+    Xs, ys = [], []
+    for i in range(window_size, len(X)):
+        if y[i] != y[i - window_size]:
+            continue
+        Xs.append(X[i - window_size:i].flatten())
+        ys.append(y[i])
+    return np.array(Xs), np.array(ys)
+
+
+rng = np.random.default_rng(0)
+X = rng.normal(0, 0.1, (300, 63)).astype(np.float32)
+y = np.repeat(rng.integers(0, 8, 30), 10)
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, 'data')
+    print('Rows are appended in buffered batches and read back through memmap')
+    with DatasetWriter(path, buffer_rows=16) as writer:
+        for row, label in zip(X[:200], y[:200]):
+            writer.append(row, label, 1.0)
+        assert num_rows(path) == 192, 'only full batches are on disk before close'
+    with DatasetWriter(path) as writer:
+        assert writer.session == 1
+        for row, label in zip(X[200:], y[200:]):
+            writer.append(row, label)
+    data = load_dataset(path)
+    assert isinstance(data.features, np.memmap) and data.features.shape == (300, 63)
+    assert np.array_equal(data.features, X) and np.array_equal(data.labels, y)
+    assert list(np.unique(data.sessions)) == [0, 1] and data.timestamps[0] == 1.0
+
+    print('Windows are strided views with the old training semantics')
+    view = window_view(data.features, 5)
+    assert view.shape == (296, 315) and np.shares_memory(view, data.features)
+    assert np.array_equal(view[7], X[7:12].ravel())
+    old_X, old_y = old_create_window_dataset(X, y, 5)
+    new_X, new_y = create_window_dataset(data.features, data.labels, 5)
+    assert np.array_equal(new_X, old_X) and np.array_equal(new_y, old_y)
+    split_X, split_y = create_window_dataset(data.features, data.labels, 5, data.sessions)
+    crossing = sum(y[s] == y[s + 5] for s in range(195, 200))  # 窗口跨过第二次采集的起点
+    assert len(split_y) == len(old_y) - crossing
+    same = np.full(300, 3)
+    all_X, _ = create_window_dataset(X, same, 5)
+    assert np.shares_memory(all_X, X), 'all windows usable: no copy'
+
+    print('Several window sizes, strides and chunked streaming')
+    sets = window_datasets(data.features, data.labels, (3, 5, 8))
+    for window, (wX, wy) in sets.items():
+        old_X, old_y = old_create_window_dataset(X, y, window)
+        assert np.array_equal(wX, old_X) and np.array_equal(wy, old_y)
+    old_X, old_y = old_create_window_dataset(X, y, 5)
+    starts = [i - 5 for i in range(5, 300) if y[i] == y[i - 5]]
+    sX, sy = create_window_dataset(data.features, data.labels, 5, stride=3)
+    keep = [k for k, s in enumerate(starts) if s % 3 == 0]
+    assert np.array_equal(sX, old_X[keep]) and np.array_equal(sy, old_y[keep])
+    stepped, _ = create_window_dataset(X, same, 5, stride=4)
+    assert np.shares_memory(stepped, X) and np.array_equal(stepped[2], X[8:13].ravel())
+    chunks = list(iter_windows(data.features, data.labels, 5, chunk=64))
+    assert len(chunks) == (len(old_y) + 63) // 64 and all(len(c[0]) <= 64 for c in chunks)
+    assert np.array_equal(np.concatenate([c[0] for c in chunks]), old_X)
+    assert np.array_equal(np.concatenate([c[1] for c in chunks]), old_y)
+
+    print('A torn write is ignored and repaired on the next open')
+    with open(os.path.join(path, 'features.f32'), 'ab') as f:
+        f.write(b'\0' * 100)
+    assert num_rows(path) == 300
+    with DatasetWriter(path) as writer:
+        writer.append(X[0], 1)
+    assert num_rows(path) == 301 and np.array_equal(load_dataset(path).features[300], X[0])
+
+    print('Old CSV data imports as one session')
+    csv_path = os.path.join(tmp, 'old.csv')
+    np.savetxt(csv_path, np.column_stack([X[:50], y[:50]]), delimiter=',',
+               header=','.join([f'v{i}' for i in range(63)] + ['label']), comments='')
+    assert import_csv(csv_path, os.path.join(tmp, 'imported')) == 50
+    imported = load_dataset(os.path.join(tmp, 'imported'))
+    assert np.allclose(imported.features, X[:50]) and np.array_equal(imported.labels, y[:50])
+
+assert len(load_dataset(os.path.join(tempfile.gettempdir(), 'missing-dataset')).labels) == 0
+print('Test done')
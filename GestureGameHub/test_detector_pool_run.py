@@ -0,0 +1,78 @@
+from games.detector_pool import DetectorPool, detector_pool, release_detectors
+from games.base_game import BaseGame
+from games.tracking import LandmarkTracker, unwrap_detector
+from games.roi_tracker import use_roi
+from engine.remote import use_remote_detection
+import os
+import time
+import numpy as np
+
+pool = DetectorPool(idle_timeout=1.0, max_idle=1, grace=0.0)
+
+print('Cold lease loads the model')
+frame = np.zeros((480, 640, 3), dtype=np.uint8)
+t = time.perf_counter()
+a = pool.lease('hands', max_num_hands=1, min_detection_confidence=0.7)
+a.process(frame)
+cold = time.perf_counter() - t
+pool.release(a)
+
+print('Warm lease reuses the same graph')
+t = time.perf_counter()
+b = pool.lease('hands', min_detection_confidence=0.7, max_num_hands=1)
+b.process(frame)
+warm = time.perf_counter() - t
+print('Cold %.1f ms, warm %.2f ms' % (cold * 1000, warm * 1000))
+assert b is a and warm < cold / 2
+
+print('Different configs never share a detector')
+c = pool.lease('hands', max_num_hands=2)
+assert c is not b
+pool.release(b)
+pool.release(c)
+print('Stats:', pool.stats())
+assert pool.stats()['leased'] == 0 and pool.stats()['created'] == 2 and pool.stats()['reused'] == 1
+
+print('Idle detectors are reaped')
+time.sleep(1.1)
+assert pool.reap() == 2 and pool.stats()['idle'] == {}
+
+print('Games return their detector on close, even in landmark mode')
+game = BaseGame()
+real = unwrap_detector(game.hands)
+use_remote_detection(game)
+game.close()
+game.close()
+assert game.hands is None
+leased_before = detector_pool.stats()['leased']
+time.sleep(detector_pool.grace)
+again = BaseGame()
+assert unwrap_detector(again.hands) is real, 'switching back to the same game reuses the pooled detector'
+again.close()
+assert detector_pool.stats()['leased'] == leased_before
+
+print('release_detectors unwraps tracker / ROI wrappers and returns every detector')
+
+
+class WrappedGame:
+    def __init__(self):
+        self.hands = detector_pool.lease('hands', max_num_hands=1, min_detection_confidence=0.55, model_complexity=0)
+        use_roi(self)
+        self.hands = LandmarkTracker(self.hands)
+
+
+os.environ['GESTURE_HAND_ROI'] = '1'
+wrapped = WrappedGame()
+os.environ.pop('GESTURE_HAND_ROI')
+print('The ROI crop detector is leased with the game detector confidence and complexity')
+assert detector_pool.config_of(wrapped.hands.detector.crop_detector) == {
+    'static_image_mode': True, 'max_num_hands': 1, 'min_detection_confidence': 0.55, 'model_complexity': 0}
+assert detector_pool.config_of(object()) is None
+assert detector_pool.stats()['leased'] == leased_before + 2
+release_detectors(wrapped, 'hands')
+release_detectors(wrapped, 'hands')
+stats = detector_pool.stats()
+assert wrapped.hands is None and stats['leased'] == leased_before
+idle = [key for key in stats['idle'] if '0.55' in key]
+assert len(idle) == 2 and any('static_image_mode' in key for key in idle), stats['idle']
+print('Test done')
@@ -0,0 +1,54 @@
+from games.draw_guess.cnn_model import DrawCNN
+from games.draw_guess.export_model import export_all, load_torch_classifier
+from games.draw_guess.numpy_cnn import NumpyDrawCNN, load_numpy_cnn
+from games.draw_guess_adapter import load_classifier
+import numpy as np
+import os
+import tempfile
+import torch
+import warnings
+
+warnings.filterwarnings('ignore')
+torch.manual_seed(0)
+rng = np.random.default_rng(0)
+images = rng.random((16, 28, 28)).astype(np.float32)
+
+with tempfile.TemporaryDirectory() as tmp:
+    model_path = os.path.join(tmp, 'draw_model.pth')
+    model = DrawCNN(10)
+    # 非平凡的 BN 统计量，确认折叠进卷积后结果不变
+    for bn in (model.layer1[1], model.layer2[1]):
+        bn.running_mean.uniform_(-0.5, 0.5)
+        bn.running_var.uniform_(0.5, 2.0)
+        bn.weight.data.uniform_(0.5, 1.5)
+    torch.save(model.state_dict(), model_path)
+    with torch.no_grad():
+        expected = torch.softmax(model.eval()(torch.from_numpy(images).unsqueeze(1)), dim=1).numpy()
+
+    print('Every exported backend matches the eager model')
+    paths = export_all(model_path)
+    assert sorted(paths) == ['int8', 'numpy', 'torchscript'] and all(os.path.exists(p) for p in paths.values())
+    numpy_cnn = load_numpy_cnn(paths['numpy'], model_path)
+    assert np.allclose(numpy_cnn.predict_proba(images), expected, atol=1e-5)
+    assert numpy_cnn.predict_proba(images[0]).shape == (1, 10)
+    scripted = load_torch_classifier('torchscript', model_path)
+    assert np.allclose(scripted.predict_proba(images), expected, atol=1e-5)
+    int8 = load_torch_classifier('int8', model_path)
+    assert np.abs(int8.predict_proba(images) - expected).max() < 0.05
+    assert os.path.getsize(paths['int8']) < os.path.getsize(paths['torchscript']) / 2
+
+    print('The game picks the requested backend and falls back when it is missing')
+    assert load_classifier(model_path, 'numpy')[0] == 'numpy'
+    assert load_classifier(model_path, 'int8')[0] == 'int8'
+    os.remove(paths['numpy'])
+    assert load_classifier(model_path, 'numpy')[0] == 'torchscript'
+
+    print('Exports of an older model are ignored after retraining')
+    export_all(model_path)
+    torch.save(DrawCNN(10).state_dict(), model_path)
+    assert load_numpy_cnn(paths['numpy'], model_path) is None
+    assert load_torch_classifier('torchscript', model_path) is None
+    assert load_classifier(model_path)[0] == 'torch'
+    assert isinstance(NumpyDrawCNN.load(paths['numpy']), NumpyDrawCNN), 'still loads without a source check'
+
+print('Test done')
@@ -0,0 +1,127 @@
+from games.street_fighter.gesture_engine import FeatureRing, GestureEngine
+from games.street_fighter.forest import FlatForest, flatten_forest, load_forest, export_forest
+from games.street_fighter.train_model import create_window_dataset, load_sequences
+from engine.remote import build_results
+from collections import deque
+import joblib
+import numpy as np
+import os
+import tempfile
+import warnings
+
+warnings.filterwarnings('ignore')  # 模型是旧版本 sklearn 存的
+HERE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'games', 'street_fighter')
+MODEL_PATH = os.path.join(HERE, 'gesture_model_seq.pkl')
+
+rng = np.random.default_rng(0)
+
+print('Ring view matches a deque window')
+ring, window = FeatureRing(5, dim=4), deque(maxlen=5)
+for i in range(23):
+    row = rng.random(4)
+    ring.push(row)
+    window.append(row)
+    assert len(ring) == len(window)
+    if len(window) == 5:
+        view = ring.view()
+        assert np.array_equal(view, np.array(window, dtype=np.float32))
+        assert np.shares_memory(view.reshape(1, -1), view), 'flattened window is a view'
+ring.clear()
+assert len(ring) == 0
+
+engine = GestureEngine()
+if not os.path.exists(MODEL_PATH):
+    print('Model not found, skipping forest checks')
+else:
+    model = joblib.load(MODEL_PATH)
+    sequences = load_sequences(HERE)
+    if sequences is not None:
+        # 有录制的数据时（二进制数据集或旧 CSV，和训练时同一个入口）按训练时的滑动窗口构造样本
+        features, labels, sessions = sequences
+        X, _ = create_window_dataset(features, labels, model.n_features_in_ // features.shape[1], sessions)
+        X = np.asarray(X[:20000], dtype=np.float64)
+        source = f'{len(X)} recorded windows'
+    else:
+        X = rng.normal(0, 0.1, (500, model.n_features_in_))
+        source = f'{len(X)} random rows (no recorded dataset in {HERE})'
+    print(f'Parity data: {source}')
+    # 正好等于阈值的样本：检查 <= 的边界和 float32 / float64 比较
+    flat = flatten_forest(model)
+    boundary = X[:50].copy()
+    picks = rng.integers(0, len(flat.threshold), (50, 40))
+    for row, nodes in zip(boundary, picks):
+        row[flat.feature[nodes]] = flat.threshold[nodes].astype(np.float32)
+    X = np.vstack([X, boundary])
+
+    print('Flattened forest agrees with sklearn')
+    assert isinstance(flat, FlatForest)
+    expected = model.predict(X)
+    assert np.array_equal(flat.predict(X), expected)
+    assert np.allclose(flat.predict_proba(X), model.predict_proba(X))
+
+    print('The exported npz loads to the same forest')
+    with tempfile.TemporaryDirectory() as tmp:
+        path = export_forest(MODEL_PATH, os.path.join(tmp, 'forest.npz'))
+        loaded = load_forest(path, MODEL_PATH)
+        assert loaded is not None and np.array_equal(loaded.predict(X), expected)
+        assert np.array_equal(loaded.predict_proba(X), flat.predict_proba(X)) and np.array_equal(loaded.threshold, flat.threshold)
+        other = os.path.join(tmp, 'other.pkl')
+        with open(other, 'wb') as f:
+            f.write(b'retrained')
+        assert load_forest(path, other) is None, 'stale export is ignored'
+        assert load_forest(os.path.join(tmp, 'missing.npz')) is None
+    bundled = os.path.join(HERE, 'gesture_model_seq.npz')
+    if os.path.exists(bundled):
+        assert isinstance(engine.predictor, FlatForest) and engine.model is None, 'engine skips unpickling'
+        assert np.array_equal(engine.predictor.predict(X), expected)
+
+    print('Engine waits for a full window and then predicts')
+    base = rng.random((21, 3)) * 0.2 + 0.1
+    hands = [build_results([(base + rng.normal(0, 0.005, (21, 3)), 'Right', 0.9)]) for _ in range(12)]
+    assert all(engine.detect(r) is None for r in hands[:4])
+    old = deque(maxlen=5)
+    for r in hands:
+        points = np.array([(p.x, p.y, p.z) for p in r.multi_hand_landmarks[0].landmark])
+        old.append((points - points[0]).ravel())
+    for r in hands[4:]:
+        engine.detect(r)
+    assert len(engine.slots) == 1
+    expected = model.predict(np.array(old).flatten().reshape(1, -1))
+    assert np.array_equal(engine.predictor.predict(engine.slots[0].history.view().reshape(1, -1)), expected)
+
+    print('Each hand keeps its id and window, both are classified in one predict call')
+    engine = GestureEngine()
+    left, right = base.copy(), base + (0.5, 0, 0)
+    calls = []
+    predict = engine.predictor.predict
+    engine.predictor.predict = lambda X: calls.append(len(X)) or predict(X)
+    windows = {1: deque(maxlen=5), 2: deque(maxlen=5)}
+    for i in range(10):
+        a = left + rng.normal(0, 0.005, (21, 3)) + (0.01 * i, 0, 0)
+        b = right + rng.normal(0, 0.005, (21, 3)) - (0.01 * i, 0, 0)
+        # MediaPipe 给的手序号会变，两只手也可能都识别成右手
+        hands = [(a, 'Right', 0.9), (b, 'Right', 0.8)][::1 if i % 3 else -1]
+        slots = engine.detect_hands(build_results(hands))
+        for slot, (points, _, _) in zip(slots, hands):
+            windows[slot.id].append((points - points[0]).ravel())
+        assert sorted(slot.id for slot in slots) == [1, 2]
+        assert slots[0].palm[0] < 0.5 if hands[0][0] is a else slots[0].palm[0] > 0.5
+    assert calls == [2] * 6, 'one batched call per frame once both windows are full'
+    for slot in engine.slots:
+        assert np.allclose(slot.history.view(), np.array(windows[slot.id]), atol=1e-6)
+
+    print('A hand that leaves for long gets a new id')
+    left_id = next(slot.id for slot in engine.slots if slot.palm[0] < 0.5)
+    for _ in range(20):
+        engine.detect_hands(build_results([(left, 'Right', 0.9)]))
+    assert [slot.id for slot in engine.slots] == [left_id]
+    assert engine.detect_hands(build_results([(right, 'Left', 0.9), (left, 'Right', 0.9)]))[0].id == 3
+
+    print('Two hands pressed together read as HEAL')
+    engine = GestureEngine()
+    together = [build_results([(base, 'Left', 0.9), (base + (0.05, 0, 0), 'Right', 0.9)]) for _ in range(5)]
+    assert [engine.detect(r) for r in together] == ['HEAL'] * 5
+    assert engine.detect(build_results()) is None
+
+assert flatten_forest(object()) is None
+print('Test done')
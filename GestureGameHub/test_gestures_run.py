@@ -0,0 +1,58 @@
+from games.gestures import GestureReader, HandFeatures, GESTURE_PROFILES
+from games.landmarks import to_array
+from engine.remote import build_results
+import numpy as np
+
+
+def old_count_fingers(pts):
+    fingers = [1 if pts[4].x < pts[3].x else 0] + [1 if pts[i].y < pts[i - 2].y else 0 for i in [8, 12, 16, 20]]
+    total = sum(fingers)
+    if abs(pts[4].x - pts[3].x) < 0.02 and fingers[0] == 1:
+        total -= 1
+    return fingers, total
+
+
+def old_direction(pts, threshold):
+    dx, dy = pts[8].x - pts[0].x, pts[8].y - pts[0].y
+    if abs(dx) > abs(dy):
+        return "RIGHT" if dx > threshold else "LEFT" if dx < -threshold else "NONE"
+    return "DOWN" if dy > threshold else "UP" if dy < -threshold else "NONE"
+
+
+rng = np.random.default_rng(0)
+hands = [build_results([(rng.random((21, 3)), 'Right', 0.9)]).multi_hand_landmarks[0] for _ in range(500)]
+
+print('Matches the per-game detectors it replaces')
+pacman = GestureReader(**GESTURE_PROFILES['PacmanGameAdapter'])
+maze = GestureReader(**GESTURE_PROFILES['MazeGame'])
+for lm in hands:
+    fingers, total = old_count_fingers(lm.landmark)
+    features = pacman.read(lm)
+    assert [int(f) for f in features.fingers] == fingers and features.finger_count == total
+    assert features.direction == old_direction(lm.landmark, 0.12)
+    assert maze.read(lm).direction == old_direction(lm.landmark, 0.15)
+    assert features.palm_open == (total >= 4)
+
+print('Features are computed once per landmark object')
+lm = hands[0]
+assert pacman.read(lm) is pacman.read(lm)
+assert pacman.read(hands[1]) is not pacman.read(lm)
+
+print('Pinch uses the palm length as scale')
+points = np.zeros((21, 3))
+points[9] = (0, 0.2, 0)       # middle MCP: palm length 0.2
+points[4] = (0.30, 0.5, 0)
+points[8] = (0.33, 0.5, 0)
+features = HandFeatures(points)
+assert features.pinch and abs(features.pinch_distance - 0.15) < 1e-9
+points[8] = (0.45, 0.5, 0)
+assert not HandFeatures(points).pinch
+assert to_array(points) is points
+
+
+class MazeGame:
+    pass
+
+
+assert GestureReader.for_game(MazeGame()).config['direction'] == 0.15
+print('Test done')
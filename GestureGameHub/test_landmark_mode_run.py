@@ -0,0 +1,66 @@
+from engine import SessionManager, FramePipeline, encode_packet, parse_packet
+from engine.remote import RemoteDetector, blank_frame, use_remote_detection, restore_local_detection
+import numpy as np
+import mediapipe as mp
+import time
+
+hand = np.random.default_rng(0).random((21, 3)).astype(np.float32)
+
+print('Packet round trip')
+packet = encode_packet([(hand, 'Right', 0.9), (hand[::-1], 'Left', 0.8)])
+print('Packet bytes:', len(packet))
+results = parse_packet(packet)
+assert len(results.multi_hand_landmarks) == 2 and results.multi_face_landmarks is None
+lm = results.multi_hand_landmarks[0].landmark
+assert len(lm) == 21 and abs(lm[8].x - hand[8, 0]) < 1e-6
+assert results.multi_handedness[1].classification[0].label == 'Left'
+assert parse_packet(encode_packet([])).multi_hand_landmarks is None
+try:
+    parse_packet(packet[:40])
+    raise AssertionError('truncated packet must be rejected')
+except ValueError:
+    pass
+
+print('Results work with mediapipe drawing utils')
+canvas = blank_frame()
+mp.solutions.drawing_utils.draw_landmarks(canvas, results.multi_hand_landmarks[0], mp.solutions.hands.HAND_CONNECTIONS)
+assert canvas.any()
+
+
+class MonolithicGame:
+    """calls its own detector inside process(), like DrawGuessAdapter"""
+
+    def __init__(self):
+        self.hands = mp.solutions.hands.Hands(max_num_hands=1)
+        self.seen = []
+
+    def process(self, frame):
+        res = self.hands.process(frame)
+        self.seen.append(res.multi_hand_landmarks is not None)
+        return frame
+
+
+print('Detector swap and restore')
+game = MonolithicGame()
+local = game.hands
+remote = use_remote_detection(game)
+assert isinstance(game.hands, RemoteDetector) and use_remote_detection(game) is remote
+restore_local_detection(game)
+assert game.hands is local and game.remote_detector is None
+
+print('Landmark packets drive a game without server-side inference')
+manager = SessionManager(lambda name: game, idle_timeout=0)
+sess = manager.start_game('lm', 'mono')
+use_remote_detection(game)
+pipeline = FramePipeline(sess.upload, lambda: sess.game, encode=lambda f, g=None: b'x', cpu_meter=sess).start()
+start = time.process_time()
+for i in range(20):
+    sess.upload.push(blank_frame(), parse_packet(packet))
+    assert pipeline.get(timeout=2.0) == b'x'
+cpu_ms = (time.process_time() - start) / 20 * 1000
+pipeline.stop()
+print('Frames seen with a hand:', sum(game.seen), 'cpu per frame %.2f ms' % cpu_ms)
+assert game.seen and all(game.seen)
+manager.remove('lm')
+assert game.hands is local, 'closing the session restores the real detector before releasing it'
+print('Test done')
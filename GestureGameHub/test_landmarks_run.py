@@ -0,0 +1,42 @@
+from games import landmarks
+from games.landmarks import to_array, landmark_frame, LandmarkFrame
+from engine.remote import build_results
+import numpy as np
+
+rng = np.random.default_rng(0)
+right, left = rng.random((21, 3)), rng.random((21, 3))
+face = rng.random((468, 3))
+results = build_results([(right, 'Right', 0.9), (left, 'Left', 0.7)], face)
+
+print('Hands and faces convert to float32 arrays')
+frame = landmark_frame(results)
+assert frame.hands.dtype == np.float32 and frame.hands.shape == (2, 21, 3) and frame.hands.flags.c_contiguous
+assert np.allclose(frame.hands[0], right, atol=1e-6) and np.allclose(frame.hands[1], left, atol=1e-6)
+assert frame.handedness == ('Right', 'Left') and list(frame.hand_index) == [0, 1]
+assert np.allclose(frame.scores, [0.9, 0.7])
+assert np.array_equal(frame.hand('Left'), frame.hands[1]) and frame.hand('Nope') is None
+assert frame.faces.shape == (1, 468, 3) and np.allclose(frame.faces[0], face, atol=1e-6)
+assert landmark_frame(results) is frame, 'one conversion per results object'
+
+print('Index subsets read only what they need')
+sub = to_array(results.multi_face_landmarks[0], [1, 33, 263])
+assert sub.shape == (3, 3) and np.allclose(sub, face[[1, 33, 263]], atol=1e-6)
+
+print('The serialized fast path matches attribute access')
+was = landmarks._FAST_PATH
+landmarks._FAST_PATH = True
+try:
+    for lms in results.multi_hand_landmarks + results.multi_face_landmarks:
+        slow = np.array([(p.x, p.y, p.z) for p in lms.landmark], dtype=np.float32)
+        assert np.array_equal(to_array(lms), slow)
+    # landmarks with visibility set do not have the packed layout and fall back
+    hand = results.multi_hand_landmarks[0]
+    hand.landmark[3].visibility = 0.5
+    assert np.array_equal(to_array(hand)[3], np.float32([hand.landmark[3].x, hand.landmark[3].y, hand.landmark[3].z]))
+finally:
+    landmarks._FAST_PATH = was
+
+print('Empty results give empty arrays')
+empty = LandmarkFrame(build_results())
+assert empty.num_hands == 0 and empty.hands.shape == (0, 21, 3) and empty.faces.shape[0] == 0 and empty.hand() is None
+print('Test done')
@@ -0,0 +1,52 @@
+from games.street_fighter.dataset import DatasetWriter
+from games.street_fighter.forest import load_forest
+from games.street_fighter.search_models import choose, export_best, run_search, session_folds
+import joblib
+import numpy as np
+import os
+import tempfile
+
+rng = np.random.default_rng(0)
+centers = rng.normal(0, 1, (3, 63))
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, 'data')
+    for session in range(3):
+        labels = np.repeat(rng.permutation(3), 40)
+        with DatasetWriter(path, session=session) as writer:
+            for label in labels:
+                writer.append(centers[label] + rng.normal(0, 0.3, 63), int(label), 0.0)
+
+    print('Folds never split a session; one session falls back to contiguous blocks')
+    groups = np.repeat([0, 1, 2], 10)
+    for train_idx, test_idx in session_folds(groups, 3):
+        assert not set(groups[train_idx]) & set(groups[test_idx])
+    for train_idx, test_idx in session_folds(np.zeros(30), 3):
+        assert np.all(np.diff(test_idx) == 1) and len(test_idx) == 10
+
+    print('Candidates are scored in parallel with accuracy, latency and size')
+    specs = [{'family': 'forest', 'n_estimators': 5, 'max_depth': 4},
+             {'family': 'hist_gbt', 'max_iter': 10, 'max_depth': 3}]
+    results = run_search(path, specs, windows=(3, 5), folds=3, workers=2)
+    assert [(r['spec']['family'], r['window']) for r in results] == [
+        ('forest', 3), ('hist_gbt', 3), ('forest', 5), ('hist_gbt', 5)]
+    for r in results:
+        assert 'error' not in r and r['accuracy'] > 0.9, r
+        assert r['latency_ms'] > 0 and r['size_kb'] > 0
+
+    print('The best model within budget is exported for the game')
+    best = choose(results, budget_ms=1e9)
+    assert best['accuracy'] == max(r['accuracy'] for r in results)
+    fastest = choose(results, budget_ms=0)
+    assert fastest['latency_ms'] == min(r['latency_ms'] for r in results)
+    forest_result = results[2]
+    model_path = os.path.join(tmp, 'model.pkl')
+    model = export_best(forest_result, path, model_path)
+    assert joblib.load(model_path).n_features_in_ == 5 * 63
+    flat = load_forest(os.path.join(tmp, 'model.npz'), model_path)
+    X = rng.normal(0, 1, (20, 5 * 63)).astype(np.float32)
+    assert np.array_equal(flat.predict(X), model.predict(X))
+    export_best(results[1], path, model_path)
+    assert not os.path.exists(os.path.join(tmp, 'model.npz')), 'stale forest export is removed'
+
+print('Test done')
@@ -0,0 +1,122 @@
+from engine import CameraService, FramePacer, FramePipeline, UploadSource, SyntheticSource
+import os
+import sys
+import time
+
+
+class FakeMonitor:
+    """CPU 读数由测试控制，每次读取都算一次新采样"""
+
+    def __init__(self, value=0.0):
+        self.value = value
+        self.samples = 0
+
+    def utilization(self):
+        self.samples += 1
+        return self.value
+
+
+print('Frames above the target rate are dropped, not slept on')
+pacer = FramePacer(20, monitor=FakeMonitor())
+accepted = [pacer.due(now=i / 30) for i in range(90)]  # 3 秒 30FPS 的摄像头
+print('accepted', sum(accepted), 'of', len(accepted))
+assert 58 <= sum(accepted) <= 62
+same_rate = FramePacer(30, monitor=FakeMonitor())
+assert all(same_rate.due(now=i / 30 + (0.004 if i % 2 else 0)) for i in range(60)), 'jitter must not drop frames'
+
+print('tick() returns real frame time, clamped after stalls')
+pacer = FramePacer(30, max_dt=0.25, monitor=FakeMonitor())
+assert abs(pacer.tick(now=10.0) - 1 / 30) < 1e-9
+assert abs(pacer.tick(now=10.05) - 0.05) < 1e-9
+assert pacer.tick(now=12.0) == 0.25
+
+print('Inference is decimated while the CPU is saturated')
+monitor = FakeMonitor(0.99)
+pacer = FramePacer(30, monitor=monitor, max_decimation=3)
+pacer.last_results = 'r'
+runs = [pacer.should_infer() for _ in range(30)]
+print('decimation', pacer.decimation, 'inferred', sum(runs), 'of', len(runs))
+assert pacer.decimation == 3 and sum(runs) <= 12
+monitor.value = 0.1
+for _ in range(10):
+    pacer.should_infer()
+assert pacer.decimation == 1
+
+
+class MonolithicGame:
+    target_fps = 10
+
+    def __init__(self):
+        self.calls = 0
+
+    def process(self, frame):
+        self.calls += 1
+        return frame
+
+
+def run(source, game, seconds):
+    pipe = FramePipeline(source, lambda: game, encode=lambda frame, game: b'x').start()
+    start = time.time()
+    while time.time() - start < seconds:
+        pipe.get(timeout=0.2)
+    stats = pipe.stats()
+    pipe.stop()
+    return stats
+
+
+print('Pipeline holds a game to its target fps')
+game = MonolithicGame()
+game.pacer = FramePacer(game.target_fps, monitor=FakeMonitor())
+service = CameraService('synthetic:64x48@60')
+sub = service.subscribe()
+stats = run(sub, game, 1.0)
+sub.close()
+print('process() calls in 1s:', game.calls, stats['pacing'])
+assert 6 <= game.calls <= 14 and stats['pacing']['paced'] > 20
+
+print('Client-paced uploads are never dropped by the pacer')
+game = MonolithicGame()
+game.pacer = FramePacer(game.target_fps, monitor=FakeMonitor())
+upload = UploadSource()
+pipe = FramePipeline(upload, lambda: game, encode=lambda frame, game: b'x').start()
+frame = SyntheticSource(width=64, height=48, fps=None).read()[1]
+for _ in range(5):
+    upload.push(frame)
+    assert pipe.get(timeout=2.0) == b'x'
+pipe.stop()
+assert game.calls == 5 and game.pacer.paced == 0
+print('Street Fighter runs, jumps and cools down at the same speed at any frame rate')
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'games', 'street_fighter', 'src'))
+import pygame
+from fighter import Fighter
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+
+class Silent:
+    def play(self):
+        pass
+
+
+def fighter(x=200):
+    return Fighter(1, x, 430, False, [10, 1, [0, 0]], pygame.Surface((10, 70)), [1] * 7, Silent())
+
+
+for fps in (20, 30, 45, 60):
+    step = 30 / fps  # StreetFighterAdapter: pacer.tick() * FPS
+    runner, jumper, target = fighter(), fighter(), fighter(1000)
+    jumper.attack_cooldown = 20  # 基准帧，2/3 秒
+    heights, cooled = [], None
+    for i in range(fps):
+        runner.move(1280, 720, target, False, 'RIGHT', step)
+        jumper.move(1280, 720, target, False, 'JUMP' if i == 0 else None, step)
+        heights.append(jumper.rect.y)
+        if cooled is None and jumper.attack_cooldown == 0:
+            cooled = (i + 1) / fps
+    assert runner.rect.x == 200 + 10 * 30, (fps, runner.rect.x)
+    assert min(heights) == 220 and not jumper.jump, (fps, min(heights))
+    assert abs(cooled - 2 / 3) < 1.5 / fps, (fps, cooled)
+pygame.quit()
+
+print('Test done')
@@ -0,0 +1,62 @@
+from engine import FramePipeline, CameraService, split_stages
+import time
+
+STAGE_DELAY = 0.03
+
+
+class SplitGame:
+    """fake adapter with separate detect / update_and_draw (like BaseGame)"""
+    def detect(self, frame):
+        time.sleep(STAGE_DELAY)
+        return {'seen': True}
+
+    def update_and_draw(self, frame, results):
+        assert results['seen']
+        time.sleep(STAGE_DELAY)
+        return frame
+
+
+class MonolithicGame:
+    """fake adapter that only has process(frame) (like DrawGuessAdapter)"""
+    def __init__(self):
+        self.calls = 0
+
+    def process(self, frame):
+        self.calls += 1
+        return frame
+
+
+def slow_encode(frame, game=None):
+    time.sleep(STAGE_DELAY)
+    return b'jpg'
+
+
+def run(game, seconds=1.5):
+    service = CameraService('synthetic:160x120@0')
+    sub = service.subscribe()
+    pipe = FramePipeline(sub, lambda: game, encode=slow_encode).start()
+    out = 0
+    start = time.time()
+    while time.time() - start < seconds:
+        if pipe.get(timeout=1.0) is not None:
+            out += 1
+    stats = pipe.stats()
+    pipe.stop()
+    sub.close()
+    return out / seconds, stats
+
+
+print('Split stages:', [s is not None for s in split_stages(SplitGame())])
+print('Monolithic stages:', [s is not None for s in split_stages(MonolithicGame())])
+
+fps, stats = run(SplitGame())
+serial_fps = 1.0 / (3 * STAGE_DELAY)
+print(f'Pipelined fps: {fps:.1f} (serial would be ~{serial_fps:.1f})', stats)
+# throughput should follow the slowest stage, not the sum of all stages
+assert fps > serial_fps * 1.6, 'stages are not overlapping'
+
+game = MonolithicGame()
+fps, stats = run(game, seconds=0.5)
+print(f'Monolithic adapter through shim: {fps:.1f} fps, process() calls: {game.calls}')
+assert game.calls > 0
+print('Test done')
@@ -0,0 +1,68 @@
+from engine import GamePreloader, process_memory_mb
+import time
+
+
+class SlowGame:
+    closed = 0
+
+    def __init__(self, name):
+        time.sleep(0.2)  # stands in for imports, model and asset loading
+        self.name = name
+
+    def close(self):
+        SlowGame.closed += 1
+
+
+def factory(name):
+    return SlowGame(name) if name != 'missing' else None
+
+
+print('Memory reading:', process_memory_mb())
+preloader = GamePreloader(factory, max_ready=2, memory_limit_mb=0)
+
+print('Miss builds nothing, preload builds in the background')
+assert preloader.take('maze') is None
+t = time.perf_counter()
+assert preloader.preload('maze') and not preloader.preload('maze')
+assert time.perf_counter() - t < 0.1, 'preload must not block the caller'
+assert preloader.wait('maze')
+
+print('Take is instant and replenishes')
+t = time.perf_counter()
+game = preloader.take('maze')
+assert game is not None and game.name == 'maze' and time.perf_counter() - t < 0.05
+assert preloader.wait('maze')
+
+print('max_ready evicts the least recently requested game')
+for name in ('fruit', 'pacman'):
+    preloader.preload(name)
+    preloader.wait(name)
+stats = preloader.stats()
+print('Stats:', stats)
+assert stats['ready'] == ['fruit', 'pacman'] and SlowGame.closed == 1
+
+print('Unknown games are not kept')
+preloader.preload('missing')
+assert not preloader.wait('missing')
+
+print('Memory limit skips preloading')
+tight = GamePreloader(factory, memory_limit_mb=1)
+tight.preload('maze')
+assert not tight.wait('maze') and tight.stats()['skipped'] == 1
+
+print('A preloaded draw_guess still shows the countdown when taken later')
+import numpy as np
+from games.draw_guess_adapter import DrawGuessAdapter
+draw = GamePreloader(lambda name: DrawGuessAdapter())
+draw.preload('draw_guess')
+assert draw.wait('draw_guess')
+time.sleep(3.2)  # longer than the 3 s selection countdown
+game = draw.take('draw_guess', replenish=False)
+game.process(np.zeros((480, 640, 3), dtype=np.uint8))
+assert game.state == 'SELECTING', game.state
+game.close()
+
+preloader.shutdown()
+tight.shutdown()
+draw.shutdown()
+print('Test done')
@@ -0,0 +1,95 @@
+from games.roi_tracker import RoiDetector, use_roi
+from games.tracking import crop_detectors, use_tracking, unwrap_detector
+from engine.remote import build_results
+import numpy as np
+import os
+
+
+class MarkerHands:
+    """finds white squares in whatever image it gets, like Hands finds hands"""
+
+    def __init__(self):
+        self.sizes = []
+
+    def process(self, image):
+        self.sizes.append(image.shape[:2])
+        h, w = image.shape[:2]
+        mask = (image == 255).all(axis=-1)
+        hands = []
+        # one hand per connected column band is enough for this test
+        cols = np.flatnonzero(mask.any(axis=0))
+        if len(cols):
+            groups = np.split(cols, np.flatnonzero(np.diff(cols) > 1) + 1)
+            for group in groups:
+                rows = np.flatnonzero(mask[:, group].any(axis=1))
+                x0, x1, y0, y1 = group[0], group[-1] + 1, rows[0], rows[-1] + 1
+                t = np.linspace(0, 1, 21)
+                points = np.stack([(x0 + t * (x1 - x0)) / w, (y0 + t * (y1 - y0)) / h, t * (x1 - x0) / w], axis=1)
+                hands.append((points, 'Right', 0.9))
+        return build_results(hands)
+
+
+def scene(*boxes, w=1280, h=720):
+    frame = np.full((h, w, 3), 40, dtype=np.uint8)
+    for x, y, size in boxes:
+        frame[y:y + size, x:x + size] = 255
+    return frame
+
+
+def tip(results, i=0):
+    lm = results.multi_hand_landmarks[i].landmark[20]
+    return lm.x, lm.y, lm.z
+
+
+print('Crops around the last hand and maps landmarks back to the full frame')
+full = MarkerHands()
+roi = RoiDetector(MarkerHands(), MarkerHands())
+for step in range(10):
+    frame = scene((300 + step * 12, 200 + step * 5, 80))
+    expected = full.process(frame)
+    got = roi.process(frame)
+    assert np.allclose(tip(got), tip(expected), atol=1e-6), (step, tip(got), tip(expected))
+print(roi.stats())
+assert roi.full_searches == 1 and roi.roi_hits == 9
+assert max(h * w for h, w in roi.crop_detector.sizes) < 0.2 * 1280 * 720
+
+print('Falls back to a full-frame search when the hand leaves the crop')
+got = roi.process(scene((1000, 500, 80)))
+assert roi.roi_misses == 1 and roi.full_searches == 2
+assert np.allclose(tip(got), tip(full.process(scene((1000, 500, 80)))))
+assert roi.process(scene()).multi_hand_landmarks is None
+assert roi._box is None
+
+print('The tracking detector only sees full frames, cleared after crops went elsewhere')
+# 视频模式的 Hands 把跟踪框带到下一次输入：裁剪图和整幅画面不能交给同一个检测器
+assert all(size in ((720, 1280), (64, 64)) for size in roi.detector.sizes), roi.detector.sizes
+assert roi.detector.sizes[1] == (64, 64), 'blank frame before the first full search after crops'
+assert RoiDetector(MarkerHands())._crop_rect(1280, 720) is None, 'no crop detector, no crops'
+
+print('Two-hand games search the full frame periodically for a second hand')
+roi = RoiDetector(MarkerHands(), MarkerHands(), max_hands=2, full_every=5)
+for step in range(12):
+    boxes = [(200, 200, 80)] + ([(900, 300, 80)] if step >= 3 else [])
+    got = roi.process(scene(*boxes))
+assert len(got.multi_hand_landmarks) == 2
+assert roi.full_searches == 2, roi.stats()
+
+print('Composes with the landmark tracker and unwraps back to the detector')
+
+
+class FruitNinjaGame:
+    def __init__(self):
+        self.hands = MarkerHands()
+
+
+game = FruitNinjaGame()
+real = game.hands
+os.environ.pop('GESTURE_HAND_ROI', None)
+assert use_roi(game) is None, 'off by default'
+os.environ['GESTURE_HAND_ROI'] = '1'
+crop = MarkerHands()
+roi = use_roi(game, crop_detector=crop)
+tracker = use_tracking(game)
+assert game.hands is tracker and tracker.detector is roi and unwrap_detector(game.hands) is real
+assert crop_detectors(game.hands) == [crop]
+print('Test done')
@@ -0,0 +1,119 @@
+from engine import SessionManager, FramePipeline, SyntheticSource
+import threading
+import time
+import numpy as np
+
+
+class FakeGame:
+    def __init__(self, name):
+        self.name = name
+        self.closed = False
+
+    def process(self, frame):
+        # burn a little CPU so the session has something to account for
+        np.sqrt(np.arange(20000, dtype=np.float64)).sum()
+        return frame
+
+    def close(self):
+        self.closed = True
+
+
+def factory(name):
+    return FakeGame(name) if name != 'missing' else None
+
+
+print('Independent games per session')
+manager = SessionManager(factory, max_sessions=2, idle_timeout=0.5)
+a = manager.start_game('a', 'maze')
+b = manager.start_game('b', 'pacman')
+assert a.game is not b.game and a.game.name == 'maze' and b.game.name == 'pacman'
+assert manager.start_game('a', 'missing') is None and a.game.name == 'maze'
+
+print('Switching game releases the old one')
+old = a.game
+manager.start_game('a', 'fruit')
+assert old.closed and a.game.name == 'fruit'
+
+print('LRU cap evicts least recently used session')
+manager.get('b')
+c = manager.start_game('c', 'parkour')
+ids = [s['id'] for s in manager.stats()['sessions']]
+print('Sessions:', ids)
+assert ids == ['b', 'c'] and a.closed and a.game is None
+
+print('Idle sessions are evicted')
+time.sleep(0.6)
+assert manager.evict_idle() == 2 and b.closed and c.closed
+
+print('Uploaded frames drive a per-session pipeline')
+manager = SessionManager(factory, max_sessions=4, idle_timeout=0)
+sess = manager.start_game('u', 'maze')
+pipeline = FramePipeline(sess.upload, lambda: sess.game, encode=lambda f, g=None: b'x',
+                         cpu_meter=sess).start()
+src = SyntheticSource(width=160, height=120, fps=None)
+for i in range(5):
+    sess.upload.push(src.read()[1])
+    assert pipeline.get(timeout=2.0) == b'x'
+pipeline.stop()
+stats = manager.stats()['sessions'][0]
+print('Session stats:', stats)
+assert stats['frames'] == 5 and sess.cpu_seconds > 0
+
+print('A game switched out mid-frame is released only after its frames are rendered')
+
+
+class Hands:
+    def process(self, frame):
+        return frame.mean()
+
+
+class DetectorGame:
+    """close() drops the detector like release_detectors does"""
+
+    def __init__(self, name, gate=None):
+        self.name = name
+        self.gate = gate
+        self.hands = Hands()
+        self.closed = False
+        self.entered = threading.Event()
+
+    def detect(self, frame):
+        self.entered.set()
+        if self.gate is not None:
+            self.gate.wait(2.0)
+        return self.hands.process(frame)
+
+    def update_and_draw(self, frame, results):
+        self.hands.process(frame)
+        return frame
+
+    def close(self):
+        self.closed = True
+        self.hands = None
+
+
+gate = threading.Event()
+manager = SessionManager(lambda name: DetectorGame(name, gate if name == 'slow' else None), idle_timeout=0)
+sess = manager.start_game('s', 'slow')
+pipeline = FramePipeline(sess.upload, lambda: sess.game, encode=lambda f, g=None: b'x',
+                         cpu_meter=sess, game_owner=sess).start()
+old = sess.game
+sess.upload.push(src.read()[1])
+assert old.entered.wait(2.0)
+manager.start_game('s', 'fast')  # old is still inside detect()
+assert not old.closed
+gate.set()
+assert pipeline.get(timeout=2.0) == b'x', 'in-flight frame rendered with the old detector'
+assert not old.closed
+sess.upload.push(src.read()[1])
+assert pipeline.get(timeout=2.0) == b'x'
+assert old.closed, 'released once the pipeline renders the new game'
+newer = sess.game
+manager.start_game('s', 'other')
+assert not newer.closed
+pipeline.stop()
+assert newer.closed and not sess.game.closed, 'stopping the pipeline releases what it left behind'
+previous = sess.game
+manager.start_game('s', 'last')
+assert previous.closed, 'with no pipeline attached the old game is released right away'
+print('Test done')
@@ -0,0 +1,49 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+from games.surface_bridge import SurfaceBridge, surface_to_bgr
+import cv2
+import numpy as np
+import pygame
+
+pygame.init()
+
+
+def reference(surface):
+    return cv2.cvtColor(pygame.surfarray.array3d(surface).transpose([1, 0, 2]), cv2.COLOR_RGB2BGR)
+
+
+def paint(surface):
+    surface.fill((10, 20, 30))
+    pygame.draw.circle(surface, (255, 0, 0), (40, 30), 20)
+    pygame.draw.rect(surface, (0, 200, 100), (5, 50, 70, 10))
+    return surface
+
+
+cases = {
+    'default 32-bit': pygame.Surface((601, 401)),
+    'per-pixel alpha': pygame.Surface((120, 80), pygame.SRCALPHA),
+    '24-bit': pygame.Surface((121, 81), 0, 24),
+    '16-bit fallback': pygame.Surface((120, 80), 0, 16),
+    'display': pygame.display.set_mode((320, 240)),
+}
+for name, surface in cases.items():
+    paint(surface)
+    expected = reference(surface)
+    got = surface_to_bgr(surface)
+    print(f'{name:<16} bytes/px {surface.get_bytesize()} match {np.array_equal(got, expected)}')
+    assert np.array_equal(got, expected)
+    assert not surface.get_locked(), 'surface must be drawable again after conversion'
+
+print('Writes straight into a canvas slice')
+surface = paint(pygame.Surface((200, 100)))
+canvas = np.zeros((100, 300, 3), dtype=np.uint8)
+out = surface_to_bgr(surface, canvas[:, :200])
+assert np.shares_memory(out, canvas) and np.array_equal(canvas[:, :200], reference(surface))
+assert not canvas[:, 200:].any()
+
+print('Bridge reuses its buffer')
+bridge = SurfaceBridge()
+a = bridge.convert(surface)
+b = bridge.convert(surface)
+assert a is b and np.array_equal(a, reference(surface))
+print('Test done')
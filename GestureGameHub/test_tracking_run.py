@@ -0,0 +1,95 @@
+from games.tracking import LandmarkTracker, use_tracking, unwrap_detector, tracking_profile
+from games.detector_pool import detector_pool, release_detectors
+from engine.remote import build_results
+import numpy as np
+
+base = np.random.default_rng(0).random((21, 3)) * 0.2 + 0.3
+clock = {'t': 0.0}
+
+
+def hand_at(t):
+    """hand sliding right at 0.5 screen widths per second"""
+    points = base.copy()
+    points[:, 0] += 0.5 * t
+    return points
+
+
+class FakeHands:
+    def __init__(self):
+        self.calls = 0
+        self.visible = True
+        self.closed = False
+
+    def process(self, image):
+        self.calls += 1
+        if not self.visible:
+            return build_results()
+        return build_results([(hand_at(clock['t']), 'Right', 0.9)])
+
+    def close(self):
+        self.closed = True
+
+
+still = np.full((48, 64, 3), 90, dtype=np.uint8)
+
+print('Detects every Nth frame and predicts in between')
+fake = FakeHands()
+tracker = LandmarkTracker(fake, interval=3)
+errors = []
+for i in range(30):
+    clock['t'] = i / 30
+    res = tracker.process(still, now=clock['t'])
+    tip = res.multi_hand_landmarks[0].landmark[8]
+    errors.append(abs(tip.x - hand_at(clock['t'])[8, 0]))
+    assert res.multi_handedness[0].classification[0].label == 'Right'
+assert fake.calls == 10, fake.calls
+# 匀速运动：速度估计出来以后预测没有误差，直接沿用上次结果则每帧差 1/60 屏宽
+assert max(errors[6:]) < 1e-6, max(errors[6:])
+stats = tracker.stats()
+print(stats)
+assert stats['inference_ratio'] < 0.4 and stats['prediction_error'] < stats['hold_error']
+
+print('Large frame changes trigger detection')
+fake = FakeHands()
+tracker = LandmarkTracker(fake, interval=5, motion=0.1)
+for i in range(10):
+    frame = still if i < 6 else np.full_like(still, 250)
+    tracker.process(frame, now=i / 30)
+assert tracker.motion_triggered == 1 and fake.calls == 3, (tracker.motion_triggered, fake.calls)
+
+print('Stale tracks and empty results are not predicted')
+fake = FakeHands()
+tracker = LandmarkTracker(fake, interval=10, max_age=0.1)
+tracker.process(still, now=0.0)
+tracker.process(still, now=0.5)
+assert fake.calls == 2
+fake.visible = False
+tracker.process(still, now=0.7)
+res = tracker.process(still, now=0.72)
+assert fake.calls == 3 and res.multi_hand_landmarks is None
+
+
+print('Games opt in through TRACKING_PROFILES and return the real detector to the pool')
+
+
+class FruitNinjaGame:
+    def __init__(self):
+        self.hands = detector_pool.lease('hands', max_num_hands=1)
+
+
+game = FruitNinjaGame()
+real = game.hands
+assert tracking_profile(game)['interval'] > 1
+tracker = use_tracking(game)
+assert game.hands is tracker and game.tracker is tracker and unwrap_detector(tracker) is real
+idle_before = sum(detector_pool.stats()['idle'].values())
+release_detectors(game, 'hands')
+assert sum(detector_pool.stats()['idle'].values()) == idle_before + 1
+
+
+class Unlisted:
+    hands = FakeHands()
+
+
+assert use_tracking(Unlisted()) is None
+print('Test done')
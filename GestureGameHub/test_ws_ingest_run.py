@@ -0,0 +1,108 @@
+from engine import SessionManager, SocketSession, SyntheticSource
+import json
+import queue
+import threading
+import time
+import cv2
+
+
+class FakeSocket:
+    """in-memory stand-in for a flask-sock connection"""
+
+    def __init__(self):
+        self.incoming = queue.Queue()
+        self.sent = []
+        self.closed = False
+
+    def receive(self, timeout=None):
+        if self.closed:
+            raise ConnectionError('closed')
+        try:
+            return self.incoming.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def send(self, data):
+        self.sent.append(data)
+
+
+class SlowGame:
+    def __init__(self):
+        self.calls = 0
+
+    def process(self, frame):
+        self.calls += 1
+        time.sleep(0.05)
+        return frame
+
+
+slow = SlowGame()
+manager = SessionManager(lambda name: slow, idle_timeout=0)
+sess = manager.start_game('ws', 'slow')
+ws = FakeSocket()
+server = SocketSession(ws, sess)
+t = threading.Thread(target=server.serve, kwargs={'receive_timeout': 0.1}, daemon=True)
+t.start()
+
+print('Client floods frames without waiting for credits')
+src = SyntheticSource(width=160, height=120, fps=None)
+for i in range(40):
+    ws.incoming.put(cv2.imencode('.jpg', src.read()[1])[1].tobytes())
+ws.incoming.put(b'not a jpeg')
+time.sleep(1.0)
+ws.incoming.put(json.dumps({'type': 'stats'}))
+time.sleep(0.3)
+ws.closed = True
+t.join(timeout=5.0)
+
+texts = [json.loads(m) for m in ws.sent if isinstance(m, str)]
+frames = [m for m in ws.sent if isinstance(m, bytes)]
+stats = texts[-1]
+print('Hello:', texts[0])
+print('Stats:', {k: stats[k] for k in ('received', 'rejected', 'dropped', 'sent')})
+assert texts[0]['type'] == 'hello' and texts[0]['credits'] == 2
+assert stats['received'] == 40 and stats['rejected'] == 1
+# the slow game only saw a few frames; the rest were overwritten (and credited back) or skipped
+print('Frames processed by the game:', slow.calls)
+assert 0 < slow.calls <= 25 and stats['dropped'] > 0
+assert sum(1 for m in texts if m['type'] == 'credit') == stats['dropped']
+assert frames and frames[0][:2] == b'\xff\xd8', 'results are plain JPEG without multipart headers'
+assert not t.is_alive()
+
+
+class OverlapSocket(FakeSocket):
+    """fails if two threads are inside send() at once (simple-websocket is not thread-safe)"""
+
+    def __init__(self):
+        super().__init__()
+        self.busy = threading.Lock()
+        self.overlaps = 0
+
+    def send(self, data):
+        if not self.busy.acquire(blocking=False):
+            self.overlaps += 1
+            return
+        try:
+            time.sleep(0.002)
+            super().send(data)
+        finally:
+            self.busy.release()
+
+
+print('Result frames and text replies never overlap in send()')
+fast = SlowGame()
+fast.process = lambda frame: frame
+sess = SessionManager(lambda name: fast, idle_timeout=0).start_game('ws2', 'fast')
+ws = OverlapSocket()
+t = threading.Thread(target=SocketSession(ws, sess).serve, kwargs={'receive_timeout': 0.05}, daemon=True)
+t.start()
+jpeg = cv2.imencode('.jpg', src.read()[1])[1].tobytes()
+for i in range(100):
+    ws.incoming.put(jpeg)
+    ws.incoming.put(json.dumps({'type': 'stats'}))
+time.sleep(1.5)
+ws.closed = True
+t.join(timeout=5.0)
+print('Sent:', len(ws.sent), 'overlaps:', ws.overlaps)
+assert ws.overlaps == 0 and any(isinstance(m, bytes) for m in ws.sent)
+print('Test done')